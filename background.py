@@ -7,14 +7,16 @@ class UnderwaterBackground:
         # Define gradient colors from darkest (bottom) to lightest (top)
         self.num_layers = 50  # More layers = smoother gradient
         
-    def draw(self):
-        """Draw gradient background using multiple horizontal rectangles."""
+    def draw(self, depth=100.0):
+        """Draw gradient background using multiple horizontal rectangles.
+        depth must stay inside the far plane; the quads scale with it so they
+        still cover the whole view."""
         glPushMatrix()
         glLoadIdentity()
         
         # Position far behind the scene
-        z_position = -100
-        size = 150  # Large size to cover entire view
+        z_position = -depth
+        size = depth * 1.5  # Large size to cover entire view
         
         # Y range for gradient
         y_min = -size
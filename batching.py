@@ -0,0 +1,135 @@
+from OpenGL.GL import *
+import numpy as np
+
+# Cube faces in the order +x, -x, +y, -y, +z, -z
+FACE_NORMALS = np.array([(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)], dtype=np.int32)
+
+
+def _face_corners():
+    """(6, 4, 3) corners of each face of a unit cube centred on the origin,
+    counter-clockwise seen from outside."""
+    corners = np.zeros((6, 4, 3), dtype=np.float32)
+    for f, n in enumerate(FACE_NORMALS):
+        # Two tangents with u x v = n
+        u = np.roll(n, 1)
+        v = np.cross(n, u)
+        for k, (a, b) in enumerate(((-1, -1), (1, -1), (1, 1), (-1, 1))):
+            corners[f, k] = 0.5 * (n + a * u + b * v)
+    return corners
+
+
+FACE_CORNERS = _face_corners()
+# Hexagon corner directions for camera-facing bubble discs
+_HEX = np.array([(np.cos(a), np.sin(a)) for a in np.arange(6) * (np.pi / 3.0)], dtype=np.float32)
+# Two convex quads covering the hexagon
+_HEX_QUADS = np.array([0, 1, 2, 3, 3, 4, 5, 0])
+
+
+def exposed_faces(xyz, solid):
+    """
+    (n, 6) mask of the faces of blocks xyz (int block coordinates) that are
+    not covered by a solid neighbour. solid is a bool grid indexed [x, y, z];
+    faces on the edge of the grid count as exposed.
+    """
+    n = len(xyz)
+    faces = np.ones((n, 6), dtype=bool)
+    if not n:
+        return faces
+    shape = np.array(solid.shape)
+    for f, normal in enumerate(FACE_NORMALS):
+        q = xyz + normal
+        inside = ((q >= 0) & (q < shape)).all(axis=1)
+        q = q[inside]
+        faces[inside, f] = ~solid[q[:, 0], q[:, 1], q[:, 2]]
+    return faces
+
+
+def cube_quads(centers, colors, sizes=None, faces=None, eye=None):
+    """
+    World-space quads for a set of boxes.
+
+    Args:
+        centers: (n, 3) box centres
+        colors: (n, 3) box colours
+        sizes: (n, 3) box extents, unit cubes when None
+        faces: optional (n, 6) mask of faces that may be seen (see exposed_faces)
+        eye: when given, faces turned away from it are dropped as well
+
+    Returns:
+        ((k * 4, 3) vertices, (k * 4, 3) colours) for the k faces kept.
+        There is no depth test, so with eye the faces are ordered back to
+        front by the distance of their centres, and the nearest is drawn
+        last; without it they keep the order of the boxes. Colours are
+        rounded to 8 bits per channel, the precision of the framebuffer,
+        so faces next to each other in that order share more glColor3f calls.
+    """
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    n = len(centers)
+    if not n:
+        return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.float32)
+    half = 0.5 if sizes is None else np.asarray(sizes, dtype=np.float32).reshape(n, 1, 3) * 0.5
+    keep = np.ones((n, 6), dtype=bool) if faces is None else faces.copy()
+    if eye is not None:
+        # Face planes: centre + normal * half extent
+        to_eye = np.asarray(eye, dtype=np.float32) - (centers[:, None, :] + FACE_NORMALS * half)
+        keep &= (to_eye * FACE_NORMALS).sum(axis=2) > 0.0
+    box, face = np.nonzero(keep)
+    if eye is not None:
+        # Painter's order: farthest face centre first
+        far = (to_eye[box, face] ** 2).sum(axis=1)
+        order = np.argsort(-far, kind="stable")
+        box, face = box[order], face[order]
+    rgb = np.rint(np.asarray(colors, dtype=np.float32).reshape(n, 3)[box] * 255.0) / 255.0
+    scale = 1.0 if sizes is None else np.asarray(sizes, dtype=np.float32).reshape(n, 3)[box, None, :]
+    verts = centers[box, None, :] + FACE_CORNERS[face] * scale
+    return verts.reshape(-1, 3), np.repeat(rgb, 4, axis=0)
+
+
+def sphere_quads(centers, radii, eye):
+    """
+    Camera-facing hexagons (two quads each) standing in for small spheres.
+    Without lighting a sphere is a flat disc on screen, so this matches
+    glutSolidSphere(r, 6, 6) for bubbles. Returns (k * 8, 3) vertices.
+    """
+    centers = np.asarray(centers, dtype=np.float32).reshape(-1, 3)
+    if not len(centers):
+        return np.zeros((0, 3), dtype=np.float32)
+    view = centers - np.asarray(eye, dtype=np.float32)
+    view /= np.maximum(np.linalg.norm(view, axis=1, keepdims=True), 1e-6)
+    # Right vector from the world up, or from x when looking straight up/down
+    up = np.where(np.abs(view[:, 1:2]) > 0.99, (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)).astype(np.float32)
+    right = np.cross(view, up)
+    right /= np.linalg.norm(right, axis=1, keepdims=True)
+    top = np.cross(right, view)
+    r = np.asarray(radii, dtype=np.float32).reshape(-1, 1, 1)
+    ring = (_HEX[:, 0, None] * right[:, None, :] + _HEX[:, 1, None] * top[:, None, :]) * r
+    verts = centers[:, None, :] + ring[:, _HEX_QUADS]
+    return verts.reshape(-1, 3)
+
+
+def draw_quads(verts, colors):
+    """
+    Submit quads in a single glBegin/glEnd. colors is one (r, g, b) for all
+    of them or (k * 4, 3), one per vertex; glColor3f is only called when
+    the colour changes. Returns the number of GL calls made.
+    """
+    n = len(verts)
+    if not n:
+        return 0
+    calls = n + 2
+    glBegin(GL_QUADS)
+    if np.ndim(colors) == 1:
+        glColor3f(*colors)
+        calls += 1
+        for x, y, z in verts.tolist():
+            glVertex3f(x, y, z)
+    else:
+        current = None
+        for (x, y, z), c in zip(verts.tolist(), map(tuple, colors.tolist())):
+            if c != current:
+                current = c
+                glColor3f(*c)
+                calls += 1
+            glVertex3f(x, y, z)
+    glEnd()
+    return calls
@@ -0,0 +1,49 @@
+"""
+Benchmark for swept diver collision (collision.sweep_aabb).
+
+Run from the project directory:
+    python benchmarks/bench_collision.py [moves]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from collision import sweep_aabb, diver_box
+from map_manager import MapManager
+
+
+def main():
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(1)
+    world = MapManager()
+    starts = []
+    while len(starts) < 256:
+        p = [random.uniform(1, config.MAP_SIZE - 1), random.uniform(1.5, 6.0),
+             random.uniform(1, config.MAP_SIZE - 1)]
+        lo, hi = diver_box(p)
+        if not any((x, y, z) in world.blocks
+                   for x in range(int(lo[0]), int(hi[0]) + 1)
+                   for y in range(int(lo[1]), int(hi[1]) + 1)
+                   for z in range(int(lo[2]), int(hi[2]) + 1)):
+            starts.append(p)
+
+    for label, reach in (("walk step (0.3)", 0.3), ("fast step (2.0)", 2.0), ("lag spike (8.0)", 8.0)):
+        deltas = [[random.uniform(-reach, reach), random.uniform(-reach, reach) * 0.3,
+                   random.uniform(-reach, reach)] for _ in range(moves)]
+        blocked = 0
+        t0 = time.perf_counter()
+        for i, d in enumerate(deltas):
+            lo, hi = diver_box(starts[i & 255])
+            _, hit = sweep_aabb(world.blocks, lo, hi, d)
+            blocked += any(hit)
+        elapsed = time.perf_counter() - t0
+        print(f"{label:18s} {elapsed / moves * 1e6:7.2f} us/move  "
+              f"{moves / elapsed:10.0f} moves/s  blocked {blocked / moves:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark for batched geometry (batching.py): GL calls and CPU time per
+rendered frame with USE_BATCHED_GEOMETRY off and on, counted by the
+headless null GL backend.
+
+Run from the project directory:
+    python benchmarks/bench_draw_calls.py [frames]
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from headless import NullGL, run
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    gl = NullGL()
+    gl.install()
+    for batched in (False, True):
+        config.USE_BATCHED_GEOMETRY = batched
+        # Swimming forward while turning, so the views and culling vary
+        result = run(frames, 1, b"wj", render=True, gl=gl)
+        frame_ms = np.array(result["frame_ms"])
+        counts = result["gl_counts"]
+        per_frame = {name: n / frames for name, n in counts.items()}
+        label = "batched" if batched else "per-cube"
+        print(f"{label:9s} {result['gl_calls'] / frames:8.0f} GL calls/frame  {frame_ms.mean():6.2f} ms/frame  "
+              f"p95 {np.percentile(frame_ms, 95):6.2f} ms")
+        matrix = sum(per_frame.get(name, 0) for name in
+                     ("glPushMatrix", "glPopMatrix", "glTranslatef", "glRotatef", "glScalef"))
+        cubes = per_frame.get("glutSolidCube", 0)
+        vertices = per_frame.get("glVertex3f", 0)
+        # glutSolidCube sends its 24 corners inside GLUT, out of sight of the counter
+        print(f"          matrix ops {matrix:6.0f}  cubes {cubes:5.0f}  glVertex3f {vertices:6.0f}  "
+              f"3D vertices incl. cubes {vertices + 24 * cubes:6.0f}  colours {per_frame.get('glColor3f', 0):5.0f}")
+
+
+if __name__ == "__main__":
+    main()
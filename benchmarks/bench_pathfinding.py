@@ -0,0 +1,63 @@
+"""
+Benchmark for hierarchical water pathfinding (navigation.Navigator).
+
+Run from the project directory:
+    python benchmarks/bench_pathfinding.py [queries]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from map_manager import MapManager
+from navigation import Navigator
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(1)
+    world = MapManager()
+
+    t0 = time.perf_counter()
+    nodes = Navigator(world.voxel_grid, world.seaweeds).node_count()
+    print(f"build            {(time.perf_counter() - t0) * 1000.0:8.1f} ms  {nodes} nodes")
+    nav = world.navigation
+
+    size = config.MAP_SIZE
+    pairs = [((random.uniform(0, size), random.uniform(2.0, config.MAX_HEIGHT), random.uniform(0, size)),
+              (random.uniform(0, size), random.uniform(2.0, config.MAX_HEIGHT), random.uniform(0, size)))
+             for _ in range(queries)]
+
+    config.NAV_PATH_CACHE = queries
+    for label in ("cold (uncached)", "cached"):
+        times = []
+        found = 0
+        for start, goal in pairs:
+            t0 = time.perf_counter()
+            path = nav.find_path(start, goal)
+            times.append(time.perf_counter() - t0)
+            found += path is not None
+        times = np.array(times) * 1e6
+        print(f"{label:16s} {times.mean():8.1f} us/query  p95 {np.percentile(times, 95):7.1f} us  "
+              f"{queries / times.sum() * 1e6:9.0f} queries/s  found {found / queries:5.1%}")
+
+    # One block edit in the middle of the map drops the paths through its
+    # cluster; the rest stay cached
+    mid = size // 2
+    y = int(world.top_grid[mid, mid])
+    world.add_block(mid, y, mid, 11)
+    t0 = time.perf_counter()
+    for start, goal in pairs:
+        nav.find_path(start, goal)
+    print(f"after an edit    {(time.perf_counter() - t0) / queries * 1e6:8.1f} us/query  "
+          f"{nav.rebuilds} clusters rebuilt")
+    world.remove_block(mid, y, mid)
+
+
+if __name__ == "__main__":
+    main()
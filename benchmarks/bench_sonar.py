@@ -0,0 +1,48 @@
+"""
+Benchmark for the batched voxel raycaster behind the sonar (sonar.raycast_voxels).
+
+Run from the project directory:
+    python benchmarks/bench_sonar.py
+"""
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from map_manager import MapManager
+from sonar import Sonar, raycast_voxels
+
+
+def main():
+    random.seed(1)
+    world = MapManager()
+    eye = world.get_spawn_position()
+    rng = np.random.default_rng(1)
+    for rays in (500, 1000, 2000, 4000):
+        yaw = rng.uniform(-math.pi, math.pi, rays)
+        pitch = rng.uniform(-0.6, 0.2, rays)
+        dirs = np.stack([np.cos(yaw) * np.cos(pitch), np.sin(pitch), np.sin(yaw) * np.cos(pitch)], axis=1)
+        origins = np.broadcast_to(np.asarray(eye), dirs.shape)
+        runs = 10
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            dist, block, _ = raycast_voxels(world.voxel_grid, origins, dirs, config.SONAR_RANGE)
+        ms = (time.perf_counter() - t0) / runs * 1000.0
+        print(f"{rays:5d} rays  {ms:7.2f} ms/cast  hits {np.isfinite(dist).mean():5.1%}")
+
+    sonar = Sonar()
+    t0 = time.perf_counter()
+    for _ in range(10):
+        sonar.scan(world, eye, 0.0, 0.0)
+    print(f"Sonar.scan ({config.SONAR_RAYS * config.SONAR_ROWS} rays) "
+          f"{(time.perf_counter() - t0) / 10 * 1000.0:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
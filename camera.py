@@ -3,6 +3,7 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
 import config
+from collision import sweep_aabb, diver_box
 
 class Camera:
     def __init__(self):
@@ -10,7 +11,7 @@ class Camera:
         self.yaw = 45.0
         self.pitch = 0.0
         self.look_dir = [0, 0, 0]
-        self.speed = 0.3
+        self.speed = config.SWIM_SPEED
         self.visible = True
 
     def update_vectors(self):
@@ -21,43 +22,68 @@ class Camera:
         self.look_dir[2] = math.sin(rad_yaw) * math.cos(rad_pitch)
 
     def try_move(self, new_pos, world):
-        """Enforces map boundaries, max height, and non-passable blocks."""
-        # Horizontal and Vertical Boundary checks
-        if not (0 <= new_pos[0] <= config.MAP_SIZE and 
-                0 <= new_pos[2] <= config.MAP_SIZE and
-                config.MIN_HEIGHT <= new_pos[1] <= config.MAX_HEIGHT):
-            return
-
-        # Collision check with blocks
-        if not world.is_occupied(new_pos[0], new_pos[1], new_pos[2]):
-            self.pos = new_pos
-
-    def move(self, key, world):
+        """Sweeps the diver box towards new_pos, sliding along non-passable
+        blocks, then enforces map boundaries and max height."""
+        delta = [new_pos[i] - self.pos[i] for i in range(3)]
+        lo, hi = diver_box(self.pos)
+        moved, _ = sweep_aabb(world.blocks, lo, hi, delta)
+        self.pos = [
+            max(0.0, min(config.MAP_SIZE, self.pos[0] + moved[0])),
+            max(config.MIN_HEIGHT, min(config.MAX_HEIGHT, self.pos[1] + moved[1])),
+            max(0.0, min(config.MAP_SIZE, self.pos[2] + moved[2])),
+        ]
+
+    def swim(self, keys, world, dt):
+        """Move for dt seconds with the held movement keys, at SWIM_SPEED
+        blocks per second, pushed along by the water current."""
         rad = math.radians(self.yaw)
+        step = self.speed * dt
         new_pos = list(self.pos)
         
-        if key == b'w':
-            new_pos[0] += math.cos(rad) * self.speed
-            new_pos[2] += math.sin(rad) * self.speed
-        if key == b's':
-            new_pos[0] -= math.cos(rad) * self.speed
-            new_pos[2] -= math.sin(rad) * self.speed
-        if key == b'a':
-            new_pos[0] += math.sin(rad) * self.speed
-            new_pos[2] -= math.cos(rad) * self.speed
-        if key == b'd':
-            new_pos[0] -= math.sin(rad) * self.speed
-            new_pos[2] += math.cos(rad) * self.speed
+        if b'w' in keys:
+            new_pos[0] += math.cos(rad) * step
+            new_pos[2] += math.sin(rad) * step
+        if b's' in keys:
+            new_pos[0] -= math.cos(rad) * step
+            new_pos[2] -= math.sin(rad) * step
+        if b'a' in keys:
+            new_pos[0] += math.sin(rad) * step
+            new_pos[2] -= math.cos(rad) * step
+        if b'd' in keys:
+            new_pos[0] -= math.sin(rad) * step
+            new_pos[2] += math.cos(rad) * step
             
-        if key == b'q': new_pos[1] += self.speed # Ascend
-        if key == b'e': new_pos[1] -= self.speed # Descend
+        if b'q' in keys: new_pos[1] += step # Ascend
+        if b'e' in keys: new_pos[1] -= step # Descend
+
+        # The water current pushes the diver while swimming
+        flow = world.current_at(self.pos)
+        new_pos[0] += flow[0] * config.CURRENT_DIVER_GAIN * dt
+        new_pos[1] += flow[1] * config.CURRENT_DIVER_GAIN * dt
+        new_pos[2] += flow[2] * config.CURRENT_DIVER_GAIN * dt
 
         self.try_move(new_pos, world)
 
+    def look(self, keys, dt):
+        """Turn for dt seconds with the held IJKL keys at LOOK_SPEED degrees per second."""
+        turn = config.LOOK_SPEED * dt
+        if b'i' in keys: self.pitch += turn
+        if b'k' in keys: self.pitch -= turn
+        if b'j' in keys: self.yaw -= turn
+        if b'l' in keys: self.yaw += turn
+        self.pitch = max(-89.0, min(89.0, self.pitch))
+
     def apply_view(self):
         self.update_vectors()
-        gluLookAt(self.pos[0], self.pos[1], self.pos[2],
-                  self.pos[0] + self.look_dir[0], 
-                  self.pos[1] + self.look_dir[1], 
-                  self.pos[2] + self.look_dir[2],
-                  0, 1, 0)
+        look_at(self.pos, self.yaw, self.pitch)
+
+
+def look_at(pos, yaw, pitch):
+    """Load a view looking from pos along yaw/pitch (degrees)."""
+    rad_yaw = math.radians(yaw)
+    rad_pitch = math.radians(pitch)
+    gluLookAt(pos[0], pos[1], pos[2],
+              pos[0] + math.cos(rad_yaw) * math.cos(rad_pitch),
+              pos[1] + math.sin(rad_pitch),
+              pos[2] + math.sin(rad_yaw) * math.cos(rad_pitch),
+              0, 1, 0)
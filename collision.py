@@ -0,0 +1,89 @@
+import math
+import config
+
+# Gap kept between a resolved box face and the voxel it stopped against
+SKIN = 1e-4
+
+
+def _axis_range(lo, hi):
+    """Integer voxel indices overlapped by the open interval (lo, hi)."""
+    return range(int(math.floor(lo + SKIN)), int(math.ceil(hi - SKIN)))
+
+
+def _layer_blocked(blocks, axis, layer, lo, hi):
+    a, b = [i for i in (0, 1, 2) if i != axis]
+    key = [0, 0, 0]
+    key[axis] = layer
+    for ia in _axis_range(lo[a], hi[a]):
+        key[a] = ia
+        for ib in _axis_range(lo[b], hi[b]):
+            key[b] = ib
+            if tuple(key) in blocks:
+                return True
+    return False
+
+
+def sweep_axis(blocks, lo, hi, axis, d):
+    """
+    Move the box [lo, hi] along one axis by d, stepping through every voxel
+    layer its leading face crosses so thin walls cannot be skipped.
+
+    Returns:
+        float: distance actually travelled (same sign as d, smaller if blocked)
+    """
+    if d > 0.0:
+        lead = hi[axis]
+        first = int(math.ceil(lead - SKIN))
+        last = int(math.ceil(lead + d - SKIN)) - 1
+        for layer in range(first, last + 1):
+            if _layer_blocked(blocks, axis, layer, lo, hi):
+                return max(0.0, layer - lead - SKIN)
+        return d
+    if d < 0.0:
+        lead = lo[axis]
+        first = int(math.floor(lead + SKIN)) - 1
+        last = int(math.floor(lead + d + SKIN))
+        for layer in range(first, last - 1, -1):
+            if _layer_blocked(blocks, axis, layer, lo, hi):
+                return min(0.0, layer + 1 - lead + SKIN)
+        return d
+    return 0.0
+
+
+def sweep_aabb(blocks, lo, hi, delta, order=(1, 0, 2)):
+    """
+    Swept AABB movement against a voxel set with per-axis resolution.
+    Each axis is resolved separately, so a blocked axis loses only its own
+    component and the box slides along walls.
+
+    Args:
+        blocks: container of (x, y, z) integer voxel keys that are solid
+        lo, hi: box corners (3-sequences), not modified
+        delta: requested movement (dx, dy, dz)
+        order: axis resolution order (vertical first avoids catching on ledges)
+
+    Returns:
+        (moved, blocked): list of applied per-axis movement and a tuple of
+        booleans telling which axes were stopped by a voxel
+    """
+    lo = list(lo)
+    hi = list(hi)
+    moved = [0.0, 0.0, 0.0]
+    blocked = [False, False, False]
+    for axis in order:
+        d = delta[axis]
+        if d == 0.0:
+            continue
+        step = sweep_axis(blocks, lo, hi, axis, d)
+        moved[axis] = step
+        blocked[axis] = step != d
+        lo[axis] += step
+        hi[axis] += step
+    return moved, tuple(blocked)
+
+
+def diver_box(pos):
+    """Collision box around the camera eye position."""
+    w = config.DIVER_HALF_WIDTH
+    return ([pos[0] - w, pos[1] - config.DIVER_EYE_HEIGHT, pos[2] - w],
+            [pos[0] + w, pos[1] + config.DIVER_HEAD_ROOM, pos[2] + w])
@@ -17,6 +17,11 @@ MAP_SIZE = 80
 MAX_HEIGHT = 15  # Maximum Y the player can reach
 MIN_HEIGHT = 0.5 # Minimum Y to stay above the floor
 
+# Diver collision box around the camera eye
+DIVER_HALF_WIDTH = 0.2
+DIVER_EYE_HEIGHT = 0.4  # Box extends this far below the eye
+DIVER_HEAD_ROOM = 0.15  # and this far above it
+
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 
@@ -31,9 +36,53 @@ CORAL_REEF_MAX_SIZE = 30
 
 SEAWEED_SEG_LEN = 1.8
 SEAWEED_SWAY_AMP = 0.25
+# Seaweed LOD tiers as fractions of DRAW_RADIUS: full leaves inside NEAR,
+# reduced leaves inside MID, camera-facing crossed quads beyond
+SEAWEED_LOD_NEAR = 0.3
+SEAWEED_LOD_MID = 0.6
+SEAWEED_HASH_CELL = 2.0  # Spatial hash cell size for seaweed pass-through queries
 
 CAVE_DARKEN = 0.5
 
+BUBBLE_SPAWN_RATE = 0.6  # Bubbles per second
+BUBBLE_MAX = 256  # Pool capacity; spawns beyond it are dropped
+BUBBLE_SPAWN_ON_SEABED = True  # Spawn on top of the highest block instead of y=0.2
+BUBBLE_SPHERE_DIST = 6.0  # Closer bubbles are spheres, farther ones are points
+BUBBLE_POINT_SCALE = 600.0  # Point size in pixels = radius * scale / distance
+
+MARINE_SNOW_DENSITY = 5000  # Ambient particles around the diver (0 disables)
+MARINE_SNOW_RANGE = 12.0  # Half-size of the wrap-around particle box
+MARINE_SNOW_POINT_SIZE = 2.0
+MARINE_SNOW_BUDGET_MS = 4.0  # Per-frame update + draw budget; excess particles are skipped
+SEDIMENT_MAX = 600
+SEDIMENT_STIR_HEIGHT = 1.5  # Diver height above the seabed that stirs up sediment
+SEDIMENT_PER_BLOCK = 40  # Sediment particles per block travelled near the seabed
+
+CURRENT_CELL = 8  # Spacing in blocks between current grid nodes
+CURRENT_STRENGTH = 0.6  # Peak current speed in blocks per second
+CURRENT_PULSE_SPEED = 0.15  # Speed of the slow global surge
+CURRENT_BUBBLE_GAIN = 1.0
+CURRENT_FISH_GAIN = 0.8
+CURRENT_FISH_LEASH = 0.5  # How strongly fish swim back against accumulated drift
+CURRENT_DIVER_GAIN = 4.5  # Blocks of drift per second per unit of current while swimming
+SHOW_CURRENT_OVERLAY = False  # Current arrows on the minimap (toggle with C)
+
+SONAR_ON = False  # Sonar sweep display next to the minimap (toggle with N)
+SONAR_RAYS = 240  # Bearings across the fan
+SONAR_ROWS = 3  # Elevation rows per bearing; the nearest echo wins
+SONAR_FOV = 120.0  # Fan width in degrees
+SONAR_TILT = 25.0  # Lowest row angle below the view pitch, in degrees
+SONAR_RANGE = 40.0
+
+PIP_ENABLED = False  # Picture-in-picture feed of the other view (toggle with V)
+PIP_WIDTH = 320
+PIP_HEIGHT = 180
+PIP_MARGIN = 20
+
+PHOTO_MAX_DISTANCE = 30.0  # Fish farther than this do not count in photos
+PHOTO_IDEAL_FILL = 0.25  # Frame-height fraction at which a fish earns full size score
+PHOTO_SPECIES_BONUS = 50.0  # Extra score per additional species in one photo
+
 PHONG_ON = False
 PHONG_LIGHT_DIR = (0.6, 0.8, 0.2)
 PHONG_AMB = 0.3
@@ -46,5 +95,100 @@ MINIMAP_MARGIN = 10
 USE_DYNAMIC_MINIMAP = True
 USE_VIEW_CULLING = True
 DRAW_RADIUS = 50
-USE_MULTITHREADING = False
+USE_MULTITHREADING = False  # Run the simulation ticks on a background thread
 GPU_BACKFACE_CULL = True
+# Terrain boxes, coral rods and near bubbles as world-space quads built in
+# NumPy and drawn in one glBegin/glEnd, skipping faces that point away from
+# the eye or lie against another block (batching.py)
+USE_BATCHED_GEOMETRY = True
+
+# Visible-set reuse: terrain is bucketed into CHUNK_SIZE x CHUNK_SIZE columns,
+# and culling is only redone once a view moves or turns past these thresholds.
+CHUNK_SIZE = 8
+VIS_MOVE_THRESHOLD = 1.0  # blocks
+VIS_ANGLE_THRESHOLD = 10.0  # degrees
+SHOW_PROFILER = False
+
+# Terrain LOD: chunks whose centre is beyond TERRAIN_LOD_NEAR draw 2x2 merged
+# columns, beyond TERRAIN_LOD_FAR 4x4 (CHUNK_SIZE must be a multiple of 4).
+# A chunk only switches level once it is HYSTERESIS blocks past a threshold.
+TERRAIN_LOD_ON = True
+TERRAIN_LOD_NEAR = 30.0
+TERRAIN_LOD_FAR = 55.0
+TERRAIN_LOD_HYSTERESIS = 4.0
+
+# Horizon occlusion: chunks hidden behind nearer terrain (seen from every
+# view) are skipped along with their fish and seaweed. While anything is
+# hidden the visible set is refreshed every OCCLUSION_MARGIN blocks of
+# movement instead of VIS_MOVE_THRESHOLD.
+OCCLUSION_CULLING = True
+OCCLUSION_MARGIN = 0.3
+HORIZON_BINS = 360
+
+# Water fog: colours fade toward BG_COLOR between FOG_START and FOG_END
+# (blocks from the eye). With fog on, the draw distance and far plane stop
+# at FOG_END. FOG_STEPS quantizes the blend so fogged colours are shared.
+FOG_ON = True
+FOG_START = 15.0
+FOG_END = 45.0
+FOG_STEPS = 16
+
+# Fish per species. Large populations can swim in a separate process
+# (FISH_PROCESS) that shares positions through shared memory; with tens of
+# thousands of fish also lower FISH_LOD_FAR so most are drawn as points.
+FISH_PER_SPECIES = 35
+FISH_PROCESS = False
+
+# Time-sliced entity updates: fish within FISH_NEAR_UPDATE blocks of the diver
+# move every tick, farther fish every FISH_FAR_UPDATE_EVERY ticks in slices of
+# FISH_UPDATE_SLICE; bubbles and marine snow step every tick. Work beyond
+# ENTITY_UPDATE_BUDGET_MS per tick waits for the next one (near fish never do).
+ENTITY_UPDATE_BUDGET_MS = 4.0
+FISH_NEAR_UPDATE = 25.0
+FISH_FAR_UPDATE_EVERY = 4
+FISH_UPDATE_SLICE = 4096
+
+# Fish simulation LOD per terrain chunk of a fish's home: full per-fish motion
+# within view distance + FISH_TIER_FULL_MARGIN of the diver, only shoal
+# centroids (stepped every FISH_SHOAL_UPDATE_EVERY ticks) for the next
+# FISH_TIER_SHOAL_BAND blocks, and no motion at all beyond.
+FISH_TIER_FULL_MARGIN = 25.0
+FISH_TIER_SHOAL_BAND = 25.0
+FISH_TIER_HYSTERESIS = 4.0
+FISH_SHOAL_UPDATE_EVERY = 2
+
+# Water pathfinding (navigation.py): the voxel grid is split into
+# NAV_CLUSTER_SIZE square columns for the hierarchical search, and the last
+# NAV_PATH_CACHE paths are kept until a block edit touches them.
+NAV_CLUSTER_SIZE = 8
+NAV_PATH_CACHE = 512
+
+# Fish past this fraction of the view distance are drawn as coloured points
+FISH_LOD_FAR = 1.0
+FISH_POINT_SCALE = 1500.0
+# Minimap cell colours/positions are rebuilt every N frames
+MINIMAP_REFRESH_FRAMES = 1
+
+# Adaptive quality: trades draw distance, LOD distances, particle caps and
+# minimap refresh for frame time. The dead band of +-QUALITY_HYSTERESIS around
+# the target keeps it from oscillating; one knob moves one step at most every
+# QUALITY_ADJUST_FRAMES frames.
+AUTO_QUALITY = False
+QUALITY_TARGET_FPS = 30
+QUALITY_HYSTERESIS = 0.15
+QUALITY_ADJUST_FRAMES = 20
+
+# Frame pacing: TARGET_FPS caps rendering (0 = uncapped), the settings menu
+# and death screen refresh at STATIC_FPS, and the idle callback sleeps at
+# most IDLE_SLEEP_SLICE seconds at a time so input stays responsive.
+TARGET_FPS = 60
+STATIC_FPS = 4
+IDLE_SLEEP_SLICE = 0.005
+MAX_FRAME_DT = 0.25  # longest step particles and fish take after a pause
+
+# Fixed-rate simulation: input, diver, fish, particles, oxygen and health step
+# at SIM_HZ; rendering interpolates between the last two ticks. Speeds are
+# per second so they no longer depend on the OS key-repeat rate.
+SIM_HZ = 30
+SWIM_SPEED = 9.0  # blocks per second
+LOOK_SPEED = 90.0  # degrees per second
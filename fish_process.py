@@ -0,0 +1,148 @@
+import atexit
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import config
+
+# Slots in use at once: the previous and latest adopted generations, the
+# older pair a frame may still be reading while a tick publishes, and the
+# one being written
+SLOTS = 4
+
+# Header fields, one float64 each
+H_GENERATION = 0  # last generation the child finished
+H_REQUEST_T = 1  # time and step of the generation asked for next
+H_REQUEST_DT = 2
+H_STOP = 3
+H_SLOT_GEN = 4  # generation held by each slot, SLOTS entries
+HEADER_LEN = H_SLOT_GEN + SLOTS
+
+
+class FishProcess:
+    """
+    Runs the fish swim pattern for every school in a child process.
+
+    Positions and headings live in one `SharedMemory` block with SLOTS copies
+    of the (N, 3) positions and (N,) headings of all schools, plus a small
+    header. Generation g is written to slot g % SLOTS and announced by bumping
+    the generation counter last. The child only computes a generation when
+    asked, and `step` only asks again once it has adopted the previous one,
+    so no generation a snapshot can still refer to shares a slot with the one
+    being written: reads are zero-copy and tear-free. If the child falls behind, ticks keep the last generation
+    instead of waiting, so the main process's frame time stays flat.
+    """
+
+    def __init__(self, schools, currents):
+        self.schools = list(schools)
+        self.offsets = []
+        n = 0
+        for school in self.schools:
+            self.offsets.append(n)
+            n += len(school)
+        self.count = n
+        floats = HEADER_LEN * 2 + SLOTS * n * 4  # header as float64, rest float32
+        self.shm = shared_memory.SharedMemory(create=True, size=max(4, floats) * 4)
+        self.header, self.pos, self.angle = _views(self.shm, n)
+        self.header[:] = 0.0
+        for slot in range(SLOTS):
+            self.header[H_SLOT_GEN + slot] = -1.0
+        # Generation 0 is the schools' current state
+        self.pos[0] = np.concatenate([s.pos for s in self.schools]) if n else 0.0
+        self.angle[0] = np.concatenate([s.angle for s in self.schools]) if n else 0.0
+        self.header[H_SLOT_GEN] = 0.0
+        self.adopted = -1
+        self.pending = False
+        ctx = _context()
+        self.wake = ctx.Event()
+        self.process = ctx.Process(
+            target=_run, name="fish", daemon=True,
+            args=(self.shm, n, self.schools, currents, self.wake))
+        self.process.start()
+        self._adopt(0)
+        atexit.register(self.close)
+
+    def step(self, t, dt):
+        """Called once per simulation tick ending at time t: adopt the newest
+        finished generation and ask for the one after this tick."""
+        generation = int(self.header[H_GENERATION])
+        if generation > self.adopted:
+            self._adopt(generation)
+            self.pending = False
+        if not self.pending:
+            # Asked for one tick ahead so the result lands at its own tick
+            self.header[H_REQUEST_T] = t + dt
+            self.header[H_REQUEST_DT] = dt
+            self.pending = True
+            self.wake.set()
+
+    def _adopt(self, generation):
+        slot = generation % SLOTS
+        if int(self.header[H_SLOT_GEN + slot]) != generation:
+            return
+        for school, off in zip(self.schools, self.offsets):
+            pos = self.pos[slot, off:off + len(school)]
+            angle = self.angle[slot, off:off + len(school)]
+            pos.flags.writeable = False
+            angle.flags.writeable = False
+            school.attach(pos, angle)
+        self.adopted = generation
+
+    def close(self):
+        if self.process is None:
+            return
+        self.header[H_STOP] = 1.0
+        self.wake.set()
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        # Schools keep private copies once the block is gone
+        for school in self.schools:
+            school.attach(np.array(school.pos), np.array(school.angle), shared=False)
+        del self.header, self.pos, self.angle
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _context():
+    # Fork when the platform has it: spawning would re-run main.py's
+    # world generation in the child just to reach _run
+    methods = mp.get_all_start_methods()
+    return mp.get_context("fork" if "fork" in methods else "spawn")
+
+
+def _views(shm, n):
+    header = np.ndarray((HEADER_LEN,), dtype=np.float64, buffer=shm.buf)
+    start = HEADER_LEN * 8
+    pos = np.ndarray((SLOTS, n, 3), dtype=np.float32, buffer=shm.buf, offset=start)
+    angle = np.ndarray((SLOTS, n), dtype=np.float32, buffer=shm.buf, offset=start + SLOTS * n * 12)
+    return header, pos, angle
+
+
+def _run(shm, n, schools, currents, wake):
+    """Child process: compute a generation whenever woken, until stopped.
+    shm is inherited when forked and reattached by name when spawned."""
+    header, pos, angle = _views(shm, n)
+    for school in schools:
+        school.attach(np.array(school.pos), np.array(school.angle), shared=False)
+    try:
+        while True:
+            wake.wait()
+            wake.clear()
+            if header[H_STOP]:
+                break
+            generation = int(header[H_GENERATION]) + 1
+            slot = generation % SLOTS
+            t = header[H_REQUEST_T]
+            dt = header[H_REQUEST_DT]
+            off = 0
+            for school in schools:
+                school.update(t, dt, currents)
+                pos[slot, off:off + len(school)] = school.pos
+                angle[slot, off:off + len(school)] = school.angle
+                off += len(school)
+            header[H_SLOT_GEN + slot] = generation
+            header[H_GENERATION] = generation
+    finally:
+        del header, pos, angle
+        shm.close()
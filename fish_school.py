@@ -0,0 +1,212 @@
+import numpy as np
+import config
+from render_commands import POINTS
+from water_fog import fog_factors, apply_fog
+
+
+class FishSchool:
+    """
+    Vectorized motion for all fish of one species.
+
+    The fish objects keep their appearance (size, colours) and draw code;
+    positions and headings live in NumPy arrays and are written back to an
+    object only right before it is drawn (see `sync`).
+
+    `pos`/`angle` are simulation state. Frames read `draw_pos`/`draw_angle`,
+    which the render thread fills from tick snapshots (see `blend`), so a
+    simulation step never changes what is half drawn.
+    """
+
+    def __init__(self, fish):
+        self.fish = list(fish)
+        n = len(self.fish)
+        self.base = np.array([(f.base_x, f.base_y, f.base_z) for f in self.fish],
+                             dtype=np.float32).reshape(n, 3)
+        self.wander = np.array([f.wander_radius for f in self.fish], dtype=np.float32)
+        self.phase = np.array([f.phase for f in self.fish], dtype=np.float32)
+        self.speed = np.array([f.speed for f in self.fish], dtype=np.float32)
+        self.vertical_speed = np.array([f.vertical_speed for f in self.fish], dtype=np.float32)
+        self.size = np.array([f.size for f in self.fish], dtype=np.float32)
+        self.color = np.array([f.body_color for f in self.fish], dtype=np.float32).reshape(n, 3)
+        cls = type(self.fish[0]) if self.fish else None
+        self.species = cls.__name__ if cls is not None else ""
+        self.swim_amp = getattr(cls, "SWIM_AMP", 2.0)
+        self.bob_amp = getattr(cls, "BOB_AMP", 1.5)
+        self.pos = self.base.copy()
+        self.angle = np.zeros(n, dtype=np.float32)
+        self.drift = np.zeros((n, 3), dtype=np.float32)
+        self.stepped = np.zeros(n, dtype=np.float64)  # time each fish last moved
+        # Simulation tier (see FishTiers) and the shoal each fish belongs to:
+        # fish sharing a terrain chunk of their home position
+        self.tier = np.zeros(n, dtype=np.int8)
+        size = config.CHUNK_SIZE
+        grid = -(-config.MAP_SIZE // size)
+        cells = (np.clip(self.base[:, 0].astype(np.int64) // size, 0, grid - 1) * grid
+                 + np.clip(self.base[:, 2].astype(np.int64) // size, 0, grid - 1))
+        self.shoal_cells, self.shoal = np.unique(cells, return_inverse=True)
+        self.shoal = self.shoal.reshape(n)
+        counts = np.maximum(np.bincount(self.shoal, minlength=len(self.shoal_cells)), 1)
+        self.shoal_speed = np.bincount(self.shoal, self.speed, len(self.shoal_cells)) / counts
+        self.shoal_phase = self.phase[np.unique(self.shoal, return_index=True)[1]] if n else self.phase
+        self.shoal_wander = np.bincount(self.shoal, self.wander, len(self.shoal_cells)) / counts
+        self.shoal_vspeed = np.bincount(self.shoal, self.vertical_speed, len(self.shoal_cells)) / counts
+        self.shoal_offset, self.shoal_heading = self._shoal_motion(0.0)
+        self.draw_pos = self.pos.copy()
+        self.draw_angle = self.angle.copy()
+        self.shared = False  # pos/angle are read-only FishProcess views
+
+    def __len__(self):
+        return len(self.fish)
+
+    def __iter__(self):
+        return iter(self.fish)
+
+    def update(self, t, dt=0.0, currents=None, idx=None):
+        """Same swim pattern as the per-fish `update(t)`, for the whole school
+        at once. With idx only those fish move, each by its own time since
+        it last moved, so fish can be stepped at different rates."""
+        sel = slice(None) if idx is None else idx
+        if idx is not None:
+            dt = np.minimum(t - self.stepped[idx], config.MAX_FRAME_DT)[:, None]
+        prev_x = self.pos[sel, 0].copy()
+        prev_z = self.pos[sel, 2].copy()
+        pos = self._swim(t, sel)
+        drift = self.drift[sel]
+        if currents is not None and np.any(dt > 0.0):
+            # Drift is pulled back towards zero so schools sway with the
+            # current instead of being carried off their territory
+            flow = currents.sample(pos, t)
+            drift += (flow * config.CURRENT_FISH_GAIN - drift * config.CURRENT_FISH_LEASH) * dt
+            self.drift[sel] = drift
+        pos += drift
+        self.pos[sel] = pos
+        self.stepped[sel] = t
+        dx = pos[:, 0] - prev_x
+        dz = pos[:, 2] - prev_z
+        moving = (np.abs(dx) > 0.001) | (np.abs(dz) > 0.001)
+        angle = self.angle[sel]
+        angle[moving] = np.arctan2(dz[moving], dx[moving])
+        self.angle[sel] = angle
+
+    def _swim(self, t, sel):
+        """Per-fish swim positions at time t, without drift."""
+        speed = self.speed[sel]
+        phase = self.phase[sel]
+        wander = self.wander[sel]
+        base = self.base[sel]
+        slow = t * speed * 0.3 + phase
+        fast = t * speed + phase
+        pos = np.empty_like(base)
+        pos[:, 0] = base[:, 0] + np.cos(slow) * wander + np.sin(fast) * self.swim_amp
+        pos[:, 2] = (base[:, 2] + np.sin(slow) * wander
+                     + np.cos(t * speed * 0.7 + phase) * self.swim_amp)
+        pos[:, 1] = base[:, 1] + np.sin(t * self.vertical_speed[sel] + phase) * self.bob_amp
+        return pos
+
+    def _shoal_motion(self, t):
+        """Offset from home and heading shared by every fish of each shoal:
+        the wander circle and bob of one averaged fish."""
+        slow = t * self.shoal_speed * 0.3 + self.shoal_phase
+        offset = np.empty((len(self.shoal_cells), 3), dtype=np.float32)
+        offset[:, 0] = np.cos(slow) * self.shoal_wander
+        offset[:, 1] = np.sin(t * self.shoal_vspeed + self.shoal_phase) * self.bob_amp
+        offset[:, 2] = np.sin(slow) * self.shoal_wander
+        # Direction of travel round the circle
+        heading = np.arctan2(np.cos(slow), -np.sin(slow))
+        return offset, heading
+
+    def update_shoals(self, t):
+        """Coarse step: only the shoal centroids move. Member positions are
+        worked out from them when a fish changes tier (see set_tier)."""
+        self.shoal_offset, self.shoal_heading = self._shoal_motion(t)
+
+    def _shoal_positions(self, t, idx):
+        """Where shoal-tier fish idx are at time t: home plus the shoal's
+        offset, plus any drift left from entering the tier, fading at the
+        current leash rate."""
+        offset, _ = self._shoal_motion(t)
+        fade = np.maximum(0.0, 1.0 - config.CURRENT_FISH_LEASH * (t - self.stepped[idx]))[:, None]
+        return self.base[idx] + offset[self.shoal[idx]] + self.drift[idx] * fade
+
+    def set_tier(self, idx, tier, t):
+        """Move fish idx to simulation tier (0 per-fish, 1 shoal, 2 not
+        stepped) at time t. The gap between where a fish is and where its new
+        motion puts it becomes drift, which fades, so nothing jumps."""
+        if not len(idx):
+            return
+        old = self.pos[idx]
+        on_shoal = np.flatnonzero(self.tier[idx] == 1)
+        if len(on_shoal):
+            old[on_shoal] = self._shoal_positions(t, idx[on_shoal])
+        if tier == 2:
+            self.pos[idx] = old
+            self.tier[idx] = tier
+            return
+        if tier == 0:
+            model = self._swim(t, idx)
+        else:
+            offset, heading = self._shoal_motion(t)
+            model = self.base[idx] + offset[self.shoal[idx]]
+            self.angle[idx] = heading[self.shoal[idx]]
+        drift = old - model
+        # Fish waking from the statistical tier start on their own path
+        drift[self.tier[idx] == 2] = 0.0
+        self.drift[idx] = drift
+        self.pos[idx] = model + drift
+        self.stepped[idx] = t
+        self.tier[idx] = tier
+
+    def distance_sq_xz(self, px, pz):
+        dx = self.pos[:, 0] - px
+        dz = self.pos[:, 2] - pz
+        return dx * dx + dz * dz
+
+    def snapshot(self):
+        """Copies of the motion state, for interpolating between ticks.
+        Shared state is returned as is: its slot is not rewritten while a
+        snapshot can still refer to it (see FishProcess)."""
+        if self.shared:
+            return self.pos, self.angle
+        return self.pos.copy(), self.angle.copy()
+
+    def attach(self, pos, angle, shared=True):
+        """Take pos/angle as the school's motion state."""
+        self.pos = pos
+        self.angle = angle
+        self.shared = shared
+
+    def blend(self, prev, curr, alpha):
+        """Set the drawn state alpha of the way from snapshot prev to curr.
+        Headings turn the short way round."""
+        np.add(prev[0], (curr[0] - prev[0]) * alpha, out=self.draw_pos)
+        turn = (curr[1] - prev[1] + np.pi) % (2.0 * np.pi) - np.pi
+        np.add(prev[1], turn * alpha, out=self.draw_angle)
+
+    def show_current(self):
+        self.draw_pos[:] = self.pos
+        self.draw_angle[:] = self.angle
+
+    def in_range_mask(self, px, pz, radius):
+        dx = self.draw_pos[:, 0].astype(np.int64) - px
+        dz = self.draw_pos[:, 2].astype(np.int64) - pz
+        return dx * dx + dz * dz <= radius * radius
+
+    def draw_points(self, idx, eye, out):
+        """Append fish idx to RenderList out as body-coloured points sized
+        by distance and faded into the water like the terrain behind them,
+        one points command per pixel size."""
+        pos = self.draw_pos[idx]
+        dist = np.sqrt(((pos - np.asarray(eye, dtype=np.float32)) ** 2).sum(axis=1))
+        sizes = np.clip(np.rint(self.size[idx] * config.FISH_POINT_SCALE / np.maximum(dist, 1e-3)),
+                        1, 8).astype(np.int32)
+        color = apply_fog(self.color[idx], fog_factors(dist))
+        for size in np.unique(sizes).tolist():
+            sel = sizes == size
+            out.vertices(POINTS, pos[sel].tolist(), color[sel].tolist(), width=float(size))
+
+    def sync(self, i):
+        """Copy array state into fish object i so its draw(out) sees it."""
+        f = self.fish[i]
+        f.x, f.y, f.z = self.draw_pos[i].tolist()
+        f.angle = float(self.draw_angle[i])
+        return f
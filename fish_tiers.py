@@ -0,0 +1,76 @@
+import numpy as np
+import config
+from water_fog import view_distance
+
+FULL = 0  # per-fish swim pattern and currents
+SHOAL = 1  # moves with its shoal's centroid
+STATISTICAL = 2  # not simulated or drawn; holds its last position
+
+
+class FishTiers:
+    """
+    Simulation LOD for fish, decided per terrain chunk of a fish's home.
+
+    Chunks whose centre is within view distance + FISH_TIER_FULL_MARGIN of
+    the diver simulate every fish; the next FISH_TIER_SHOAL_BAND blocks move
+    whole shoals (one per species and chunk) as a unit; beyond that fish
+    are not stepped at all. The margin covers how far a fish
+    wanders from home, so tier changes happen out of sight, and
+    FISH_TIER_HYSTERESIS keeps chunks on a boundary from flipping back and
+    forth. Promotion and demotion only depend on the diver's position, so
+    the same spot always gives the same tiers.
+    """
+
+    def __init__(self, schools):
+        self.schools = list(schools)
+        size = config.CHUNK_SIZE
+        self.grid = -(-config.MAP_SIZE // size)
+        centers = (np.arange(self.grid) + 0.5) * size
+        self.center_x = np.repeat(centers, self.grid)
+        self.center_z = np.tile(centers, self.grid)
+        # Start with nothing simulated; the first update promotes what is near
+        self.chunk_tier = np.full(self.grid * self.grid, STATISTICAL, dtype=np.int8)
+        for school in self.schools:
+            school.set_tier(np.arange(len(school)), STATISTICAL, 0.0)
+        self._anchor = None
+
+    def update(self, eye, t):
+        """Re-tier chunks after the diver has moved a block or the view
+        distance changed; returns the number of fish that changed tier."""
+        full = view_distance() + config.FISH_TIER_FULL_MARGIN
+        bounds = np.array([full, full + config.FISH_TIER_SHOAL_BAND])
+        anchor = (eye[0], eye[2], full)
+        if (self._anchor is not None and bounds[0] == self._anchor[2]
+                and abs(eye[0] - self._anchor[0]) < 1.0 and abs(eye[2] - self._anchor[1]) < 1.0):
+            return 0
+        first = self._anchor is None
+        self._anchor = anchor
+        dist = np.hypot(self.center_x - eye[0], self.center_z - eye[2])
+        if first:
+            tiers = np.searchsorted(bounds, dist).astype(np.int8)
+        else:
+            # A chunk only moves to a nearer tier once it is h inside the
+            # boundary, and to a farther one once it is h beyond it
+            h = config.FISH_TIER_HYSTERESIS
+            low = np.searchsorted(bounds, dist - h)
+            high = np.searchsorted(bounds, dist + h)
+            tiers = np.clip(self.chunk_tier, low, high).astype(np.int8)
+        changed = np.flatnonzero(tiers != self.chunk_tier)
+        self.chunk_tier = tiers
+        moved = 0
+        if len(changed):
+            for school in self.schools:
+                cell_tier = tiers[school.shoal_cells][school.shoal]
+                for tier in (FULL, SHOAL, STATISTICAL):
+                    idx = np.flatnonzero((cell_tier == tier) & (school.tier != tier))
+                    school.set_tier(idx, tier, t)
+                    moved += len(idx)
+        return moved
+
+    def counts(self):
+        """Fish per tier across all schools."""
+        out = [0, 0, 0]
+        for school in self.schools:
+            for tier, n in enumerate(np.bincount(school.tier, minlength=3).tolist()):
+                out[tier] += n
+        return out
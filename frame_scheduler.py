@@ -0,0 +1,46 @@
+import time
+import config
+
+
+class FrameScheduler:
+    """
+    Paces the GLUT idle loop. Frames are released at TARGET_FPS (0 = no cap)
+    and the idle callback sleeps in short slices in between instead of
+    spinning. Redisplay requests from input handlers are coalesced into the
+    next frame. On static screens (menu, death screen) frames drop to
+    STATIC_FPS, but a pending request is drawn straight away.
+    """
+
+    def __init__(self):
+        self.next_frame = time.perf_counter()
+        self.dirty = True
+        self.frames = 0
+
+    def request_redisplay(self):
+        self.dirty = True
+
+    def frame_due(self, static=False):
+        """Called from the idle callback: True when a frame should be drawn now,
+        otherwise sleeps for at most IDLE_SLEEP_SLICE and returns False."""
+        now = time.perf_counter()
+        if static and self.dirty:
+            self._schedule(now, config.STATIC_FPS)
+            return True
+        fps = config.STATIC_FPS if static else config.TARGET_FPS
+        wait = self.next_frame - now
+        if fps > 0 and wait > 0:
+            time.sleep(min(wait, config.IDLE_SLEEP_SLICE))
+            return False
+        self._schedule(now, fps)
+        return True
+
+    def _schedule(self, now, fps):
+        interval = 1.0 / fps if fps > 0 else 0.0
+        # Keep a steady cadence, but never try to catch up on missed frames
+        self.next_frame = max(self.next_frame + interval, now)
+        if self.next_frame > now + interval:
+            self.next_frame = now + interval
+
+    def frame_drawn(self):
+        self.dirty = False
+        self.frames += 1
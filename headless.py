@@ -0,0 +1,208 @@
+"""
+Headless simulation: world generation plus a number of fixed-rate ticks with
+no window, GPU or PyOpenGL. Every GL, GLU and GLUT call goes to a null
+backend that only counts calls.
+
+Run from the project directory:
+    python headless.py --ticks 600 --seed 1 [--keys wj] [--render]
+"""
+import argparse
+import collections
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+import types
+
+import numpy as np
+
+import config
+
+GL_MODULES = ("OpenGL", "OpenGL.GL", "OpenGL.GLU", "OpenGL.GLUT")
+_GL_NAME = re.compile(r"\b(?:GLUT_|GL_|glut|glu|gl)[A-Za-z0-9_]*")
+
+
+class NullGL:
+    """
+    Stand-in for PyOpenGL. `install` puts fake OpenGL modules in sys.modules,
+    so it has to run before any module that draws is imported. Functions do
+    nothing and return 0, constants are distinct powers of two (so or-ed
+    flags such as GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT never equal
+    another constant), and `counts` records calls by name.
+    """
+
+    def __init__(self, root=None):
+        self.counts = collections.Counter()
+        self.names = _gl_names(root or os.path.dirname(os.path.abspath(__file__)))
+        self._constants = {}
+
+    def install(self):
+        for name in GL_MODULES:
+            sys.modules[name] = self._module(name)
+
+    def calls(self):
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts.clear()
+
+    def _module(self, name):
+        null = self
+        module = types.ModuleType(name)
+
+        def lookup(attr):
+            if attr.startswith("__"):
+                raise AttributeError(attr)
+            return null._value(attr)
+
+        module.__getattr__ = lookup
+        module.__all__ = sorted(self.names)
+        for attr in self.names:
+            setattr(module, attr, self._value(attr))
+        return module
+
+    def _value(self, attr):
+        if attr.startswith(("GL_", "GLUT_")):
+            return self._constants.setdefault(attr, 1 << len(self._constants))
+        counts = self.counts
+
+        def call(*args, **kwargs):
+            counts[attr] += 1
+            return 0
+
+        call.__name__ = attr
+        return call
+
+
+def _gl_names(root):
+    """GL names the project's own modules use, for `from OpenGL.GL import *`."""
+    names = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                with open(os.path.join(dirpath, filename)) as f:
+                    names.update(_GL_NAME.findall(f.read()))
+    return names
+
+
+def seed_all(seed):
+    """Seed the stdlib and NumPy global generators. The particle pools draw
+    their own NumPy generators from `random`, so they follow as well."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def state_digest(world, cam, oxygen, health):
+    """Short hash of the simulated state. Runs with the same seed and keys
+    match unless the entity update budget deferred different work."""
+    h = hashlib.sha1()
+    for school in world.fish_schools:
+        h.update(np.ascontiguousarray(school.pos).tobytes())
+    h.update(np.asarray(cam.pos, dtype=np.float64).tobytes())
+    h.update(np.asarray([cam.yaw, cam.pitch, oxygen.level, health.level], dtype=np.float64).tobytes())
+    return h.hexdigest()[:12]
+
+
+def run(ticks, seed, keys=b"", render=False, gl=None):
+    """
+    Generate the world and run `ticks` simulation ticks of 1/SIM_HZ seconds
+    with the given keys held. With `render`, a frame of the world, minimap
+    and bars is drawn into the null backend after every tick.
+
+    Returns:
+        dict of timings, GL call counts and the final state digest
+    """
+    if gl is None:
+        gl = NullGL()
+        gl.install()
+    # Imported here, after the null backend is in place
+    from camera import Camera
+    from health_system import HealthSystem
+    from hud import HudLayer
+    from map_manager import MapManager
+    from oxygen_system import OxygenSystem
+    from simulation import Simulation
+    from visibility import Viewpoint
+
+    seed_all(seed)
+    t0 = time.perf_counter()
+    world = MapManager()
+    cam = Camera()
+    cam.pos = world.get_spawn_position()
+    oxygen = OxygenSystem()
+    health = HealthSystem()
+    hud = HudLayer()
+    gen_s = time.perf_counter() - t0
+    # Simulated time starts at zero so runs do not depend on the clock
+    sim = Simulation(world, cam, oxygen, health, start_time=0.0)
+    for key in keys:
+        sim.press(bytes([key]))
+
+    step = 1.0 / config.SIM_HZ
+    gl.reset()
+    tick_ms = []
+    frame_ms = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        # Every tick is stamped due at 0 and shown one step later, so each
+        # frame draws exactly the tick before it
+        sim.tick(step, 0.0)
+        tick_ms.append((time.perf_counter() - t0) * 1000.0)
+        if render:
+            t0 = time.perf_counter()
+            sim.present(step)
+            view = Viewpoint(*sim.view_pose())
+            visible = world.build_visible_set([view], sim.render_time())
+            visible.bubbles, visible.snow = sim.particles()
+            view.apply()
+            world.render(visible, view)
+            world.draw_minimap(view)
+            hud.begin(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+            oxygen.render(hud)
+            health.render(hud)
+            hud.submit()
+            frame_ms.append((time.perf_counter() - t0) * 1000.0)
+
+    return {
+        "world_gen_s": gen_s,
+        "tick_ms": tick_ms,
+        "frame_ms": frame_ms,
+        "gl_calls": gl.calls(),
+        "gl_counts": dict(gl.counts),
+        "digest": state_digest(world, cam, oxygen, health),
+        "fish": sum(len(school) for school in world.fish_schools),
+        "oxygen": oxygen.level,
+        "health": health.level,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation without a window.")
+    parser.add_argument("--ticks", type=int, default=600, help="simulation ticks to run")
+    parser.add_argument("--seed", type=int, default=1, help="seed for world generation and particles")
+    parser.add_argument("--keys", default="", help="keys held for the whole run, e.g. wj")
+    parser.add_argument("--render", action="store_true", help="also draw a frame after every tick")
+    args = parser.parse_args(argv)
+
+    result = run(args.ticks, args.seed, args.keys.encode(), args.render)
+    ticks = np.array(result["tick_ms"])
+    print(f"world generation {result['world_gen_s']:.2f} s, {result['fish']} fish")
+    if len(ticks):
+        print(f"{len(ticks)} ticks  {ticks.mean():.2f} ms/tick  p95 {np.percentile(ticks, 95):.2f} ms  "
+              f"{1000.0 / ticks.mean():.0f} ticks/s")
+    if result["frame_ms"]:
+        frames = np.array(result["frame_ms"])
+        print(f"{len(frames)} frames  {frames.mean():.2f} ms/frame  "
+              f"{result['gl_calls'] / len(frames):.0f} GL calls/frame")
+        top = sorted(result["gl_counts"].items(), key=lambda kv: -kv[1])[:8]
+        print("  " + ", ".join(f"{name} {n / len(frames):.0f}" for name, n in top))
+    else:
+        print(f"GL calls {result['gl_calls']}")
+    print(f"oxygen {result['oxygen']:.1f}  health {result['health']:.1f}  state {result['digest']}")
+
+
+if __name__ == "__main__":
+    main()
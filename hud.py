@@ -0,0 +1,112 @@
+from render_commands import RenderList, GLExecutor, QUADS, LINES
+
+# Bar look shared by the oxygen and health bars
+BAR_SHADOW = (0.0, 0.0, 0.0)
+BAR_BACK_BOTTOM = (0.08, 0.12, 0.18)
+BAR_BACK_TOP = (0.12, 0.16, 0.22)
+BAR_BORDER = (0.85, 0.92, 1.0)
+BAR_BORDER_WIDTH = 4.0
+BAR_SHINE = (1.0, 1.0, 1.0)
+
+
+class HudLayer:
+    """
+    Screen-space overlay of one frame: the oxygen and health bars, the
+    camera-mode frame and the settings menu record into it between `begin`
+    and `submit`, and it goes to GL as one RenderList under a single
+    orthographic projection.
+
+    Filled shapes keep their order and share one glBegin/glEnd, then all
+    lines, then all text; that only differs from drawing each widget in
+    turn where widgets overlap, and the ones recorded together do not.
+    Geometry that never moves is built once (`static`), and bar fills are
+    only rebuilt when their width changes by a whole pixel.
+    """
+
+    def __init__(self):
+        self.executor = GLExecutor()
+        self.size = None
+        self.fill_rebuilds = 0
+        self._shapes = []  # (kind, verts, colors) filled quads/triangles in draw order
+        self._lines = []  # (verts, color, width)
+        self._texts = []  # (x, y, text, color, font)
+        self._static = {}  # key -> vertex list built on first use
+        self._fills = {}  # bar origin -> (pixel width, fill verts, shine verts)
+
+    def begin(self, width, height):
+        """Start recording a frame for a window of the given size."""
+        self.size = (width, height)
+        self._shapes.clear()
+        self._lines.clear()
+        self._texts.clear()
+
+    def shape(self, kind, verts, colors):
+        """Filled QUADS or TRIANGLES; colors is one (r, g, b) or one per vertex."""
+        self._shapes.append((kind, verts, colors))
+
+    def lines(self, verts, color, width=1.0):
+        """Line segments, two vertices each."""
+        self._lines.append((verts, color, width))
+
+    def text(self, x, y, text, color, font):
+        self._texts.append((x, y, text, color, font))
+
+    def static(self, key, build):
+        """Vertices from build(), made once per key and reused after."""
+        verts = self._static.get(key)
+        if verts is None:
+            verts = self._static[key] = build()
+        return verts
+
+    def bar(self, x, y, width, height, fraction, color_bottom, color_top):
+        """
+        A bar with drop shadow, dark gradient background, a fill of
+        fraction (0..1) of its width in a bottom-to-top gradient with a
+        shine band, and a border.
+        """
+        frame = self.static(("bar", x, y, width, height), lambda: _bar_frame(x, y, width, height))
+        shadow, back, border = frame
+        self.shape(QUADS, shadow, BAR_SHADOW)
+        self.shape(QUADS, back, [BAR_BACK_BOTTOM] * 2 + [BAR_BACK_TOP] * 2)
+        pixels = int(round(width * max(0.0, min(1.0, fraction))))
+        if pixels > 0:
+            cached = self._fills.get((x, y))
+            if cached is None or cached[0] != pixels:
+                cached = self._fills[(x, y)] = (pixels,) + _bar_fill(x, y, pixels, height)
+                self.fill_rebuilds += 1
+            _, fill, shine = cached
+            self.shape(QUADS, fill, [color_bottom] * 2 + [color_top] * 2)
+            self.shape(QUADS, shine, BAR_SHINE)
+        self.lines(border, BAR_BORDER, BAR_BORDER_WIDTH)
+
+    def submit(self):
+        """Draw everything recorded since `begin` and return the GL call count."""
+        out = RenderList(ortho=self.size)
+        for kind, verts, colors in self._shapes:
+            out.vertices(kind, verts, colors)
+        for verts, color, width in self._lines:
+            out.vertices(LINES, verts, color, width)
+        for x, y, text, color, font in self._texts:
+            out.text(x, y, text, color, font)
+        self.executor.submit(out)
+        return self.executor.calls
+
+
+def rect(x0, y0, x1, y1):
+    """Corners of an axis-aligned rectangle as one quad."""
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+
+def outline(x0, y0, x1, y1):
+    """The four edges of a rectangle as line segments."""
+    return [(x0, y0), (x1, y0), (x1, y0), (x1, y1), (x1, y1), (x0, y1), (x0, y1), (x0, y0)]
+
+
+def _bar_frame(x, y, width, height):
+    shadow = rect(x + 4, y - 4, x + width + 4, y + height - 4)
+    return shadow, rect(x, y, x + width, y + height), outline(x, y, x + width, y + height)
+
+
+def _bar_fill(x, y, pixels, height):
+    shine_y = y + height * 0.65
+    return rect(x, y, x + pixels, y + height), rect(x, shine_y, x + pixels, y + height)
@@ -12,6 +12,16 @@ from health_system import HealthSystem
 from first_person_view import FirstPersonView
 from background import UnderwaterBackground
 from settings_menu import SettingsMenu
+from sonar import Sonar
+from photo_mode import PhotoLog
+from visibility import Viewpoint
+from profiler import FrameProfiler
+from water_fog import far_plane
+from quality_controller import AdaptiveQualityController
+from frame_scheduler import FrameScheduler
+from simulation import Simulation
+from hud import HudLayer, rect
+from render_commands import QUADS, TRIANGLES
 
 cam = Camera()
 world = MapManager()
@@ -24,223 +34,289 @@ health = HealthSystem()
 # First Person View
 first_person = FirstPersonView()
 
-# Background and Settings
+# Background, adaptive quality and Settings
 background = UnderwaterBackground()
-settings_menu = SettingsMenu(background)
+quality = AdaptiveQualityController()
+quality.set_enabled(config.AUTO_QUALITY)
+settings_menu = SettingsMenu(background, quality)
 
-# Timing for systems update
-last_update_time = time.time()
-is_moving = False
+# Sonar scanner
+sonar = Sonar()
+
+# Photos taken in camera view mode
+photo_log = PhotoLog()
+
+# Per-frame timings, shown with F
+profiler = FrameProfiler()
+
+# Frame cap and idle sleeping; input handlers request redisplays through it
+scheduler = FrameScheduler()
+
+# Fixed-rate simulation of input, diver, fish and vitals; frames interpolate
+simulation = Simulation(world, cam, oxygen, health)
+
+# Screen-space bars, menu and camera frame, drawn as one batch per frame
+hud = HudLayer()
 
 # Camera view mode - toggles between normal view and camera view
 camera_view_mode = False
+# Inset of the camera overlay's corner marks from the window edges
+CAMERA_FRAME_OFFSET = 30
+
+def _camera_frame(width, height):
+    """Corner quads and REC dot triangles of the camera overlay; they only
+    depend on the window size."""
+    # Camera frame as 4 L-shaped corners - moved inwards
+    frame_thickness = 8
+    frame_length = 60
+    frame_offset = CAMERA_FRAME_OFFSET
+    left, right = frame_offset, width - frame_offset
+    bottom, top = frame_offset, height - frame_offset
+    corners = (
+        # Top-left corner L
+        rect(left, top - frame_length, left + frame_thickness, top)
+        + rect(left, top - frame_thickness, left + frame_length, top)
+        # Top-right corner L
+        + rect(right - frame_thickness, top - frame_length, right, top)
+        + rect(right - frame_length, top - frame_thickness, right, top)
+        # Bottom-left corner L
+        + rect(left, bottom, left + frame_thickness, bottom + frame_length)
+        + rect(left, bottom, left + frame_length, bottom + frame_thickness)
+        # Bottom-right corner L
+        + rect(right - frame_thickness, bottom, right, bottom + frame_length)
+        + rect(right - frame_length, bottom, right, bottom + frame_thickness)
+    )
+    
+    # Recording indicator: circle as a filled polygon
+    dot_radius = 25
+    dot_center_x, dot_center_y = camera_rec_dot(width, height)
+    dot = []
+    for i in range(32):
+        angle1 = (i / 32.0) * 2 * math.pi
+        angle2 = ((i + 1) / 32.0) * 2 * math.pi
+        dot.append((dot_center_x, dot_center_y))
+        dot.append((dot_center_x + dot_radius * math.cos(angle1), dot_center_y + dot_radius * math.sin(angle1)))
+        dot.append((dot_center_x + dot_radius * math.cos(angle2), dot_center_y + dot_radius * math.sin(angle2)))
+    return corners, dot
 
-def draw_camera_overlay():
-    """Draw camera recording overlay when in camera view mode."""
-    # Set up 2D orthographic projection for overlay
+def camera_rec_dot(width, height):
+    """Centre of the red recording dot, near the top-right corner."""
+    overlay_x = width - 120
+    overlay_y = height - 50
+    return overlay_x + 40, overlay_y - 15
+
+def draw_camera_overlay(hud):
+    """Record the camera recording overlay when in camera view mode."""
+    w, h = config.WINDOW_WIDTH, config.WINDOW_HEIGHT
+    corners, dot = hud.static(("camera frame", w, h), lambda: _camera_frame(w, h))
+    hud.shape(QUADS, corners, (0.1, 0.1, 0.1))  # Dark gray/black
+    hud.shape(TRIANGLES, dot, (1.0, 0.0, 0.0))  # Red
+    
+    # "REC" text inside the circle
+    dot_center_x, dot_center_y = camera_rec_dot(w, h)
+    hud.text(dot_center_x - 15, dot_center_y - 5, "REC", (1.0, 1.0, 1.0), GLUT_BITMAP_9_BY_15)
+    
+    # Photo log readout along the bottom edge
+    if photo_log.photos:
+        info = f"Photos: {len(photo_log.photos)}  Last: {photo_log.summary(photo_log.photos[-1])}"
+    else:
+        info = "Press P to take a photo"
+    hud.text(CAMERA_FRAME_OFFSET + 20, CAMERA_FRAME_OFFSET + 20, info, (1.0, 1.0, 1.0), GLUT_BITMAP_9_BY_15)
+
+def camera_model_pose(eye_pos, eye_yaw, eye_pitch):
+    """Position, yaw and pitch of the hand-held camera model for a diver pose."""
+    # Offset to camera model position (camera is on left of hand)
+    offset_x = -0.3
+    offset_y = -0.2
+    offset_z = -0.5
+    
+    # Apply offset in camera's local space
+    rad_yaw = math.radians(eye_yaw)
+    pos = [eye_pos[0] + offset_x * math.cos(rad_yaw) - offset_z * math.sin(rad_yaw),
+           eye_pos[1] + offset_y,
+           eye_pos[2] + offset_x * math.sin(rad_yaw) + offset_z * math.cos(rad_yaw)]
+    
+    # Rotation adjustment to match camera model angle
+    return pos, eye_yaw + 15, eye_pitch - 8
+
+def take_photo():
+    """Snap a photo through the camera model and log the fish in frame."""
+    # From the pose of the frame on screen, which the drawn fish match;
+    # the live camera may be a tick ahead or mid-update on the sim thread
+    pos, yaw, pitch = camera_model_pose(*simulation.view_pose())
+    photo = photo_log.snap(world, pos, yaw, pitch)
+    print(f"Photo {len(photo_log.photos)}: {photo_log.summary(photo)} "
+          f"(total {int(photo_log.total_score())})")
+
+def restart_simulation():
+    """Reset all game systems to initial state."""
+    global cam
+    
+    # Held so a simulation thread cannot tick half-reset state
+    with simulation.lock:
+        # Reset camera to spawn position
+        cam.pos = world.get_spawn_position()
+        cam.yaw = 0.0
+        cam.pitch = 0.0
+        
+        # Reset oxygen system
+        oxygen.level = 100.0
+        oxygen.is_depleting = False
+        
+        # Reset health system
+        health.reset()
+        
+        # Reset held keys, timer and interpolation history
+        simulation.reset()
+
+def draw_picture_in_picture(visible, view):
+    """Draw the secondary view into a small viewport in the bottom-left corner."""
+    x, y = config.PIP_MARGIN, config.PIP_MARGIN
+    w, h = config.PIP_WIDTH, config.PIP_HEIGHT
+    glViewport(x, y, w, h)
+    glLoadIdentity()
+    background.draw(background_depth())
+    view.apply()
+    world.render(visible, view, secondary=True)
+    glViewport(0, 0, config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+    
+    # Frame around the feed
     glMatrixMode(GL_PROJECTION)
     glPushMatrix()
     glLoadIdentity()
     glOrtho(0, config.WINDOW_WIDTH, 0, config.WINDOW_HEIGHT, -1, 1)
-    
     glMatrixMode(GL_MODELVIEW)
     glPushMatrix()
     glLoadIdentity()
-    
-    # Draw camera frame as 4 L-shaped corners - moved inwards
-    frame_thickness = 8
-    frame_length = 60
-    frame_offset = 30
-    
-    glColor3f(0.1, 0.1, 0.1)  # Dark gray/black
-    
-    # Top-left corner L
-    glBegin(GL_QUADS)
-    glVertex2f(frame_offset, config.WINDOW_HEIGHT - frame_length - frame_offset)
-    glVertex2f(frame_offset + frame_thickness, config.WINDOW_HEIGHT - frame_length - frame_offset)
-    glVertex2f(frame_offset + frame_thickness, config.WINDOW_HEIGHT - frame_offset)
-    glVertex2f(frame_offset, config.WINDOW_HEIGHT - frame_offset)
-    glEnd()
-    glBegin(GL_QUADS)
-    glVertex2f(frame_offset, config.WINDOW_HEIGHT - frame_offset - frame_thickness)
-    glVertex2f(frame_offset + frame_length, config.WINDOW_HEIGHT - frame_offset - frame_thickness)
-    glVertex2f(frame_offset + frame_length, config.WINDOW_HEIGHT - frame_offset)
-    glVertex2f(frame_offset, config.WINDOW_HEIGHT - frame_offset)
-    glEnd()
-    
-    # Top-right corner L
-    glBegin(GL_QUADS)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_thickness, config.WINDOW_HEIGHT - frame_length - frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, config.WINDOW_HEIGHT - frame_length - frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, config.WINDOW_HEIGHT - frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_thickness, config.WINDOW_HEIGHT - frame_offset)
-    glEnd()
-    glBegin(GL_QUADS)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_length, config.WINDOW_HEIGHT - frame_offset - frame_thickness)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, config.WINDOW_HEIGHT - frame_offset - frame_thickness)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, config.WINDOW_HEIGHT - frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_length, config.WINDOW_HEIGHT - frame_offset)
-    glEnd()
-    
-    # Bottom-left corner L
-    glBegin(GL_QUADS)
-    glVertex2f(frame_offset, frame_offset)
-    glVertex2f(frame_offset + frame_thickness, frame_offset)
-    glVertex2f(frame_offset + frame_thickness, frame_offset + frame_length)
-    glVertex2f(frame_offset, frame_offset + frame_length)
-    glEnd()
-    glBegin(GL_QUADS)
-    glVertex2f(frame_offset, frame_offset)
-    glVertex2f(frame_offset + frame_length, frame_offset)
-    glVertex2f(frame_offset + frame_length, frame_offset + frame_thickness)
-    glVertex2f(frame_offset, frame_offset + frame_thickness)
-    glEnd()
-    
-    # Bottom-right corner L
-    glBegin(GL_QUADS)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_thickness, frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, frame_offset + frame_length)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_thickness, frame_offset + frame_length)
-    glEnd()
-    glBegin(GL_QUADS)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_length, frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, frame_offset)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset, frame_offset + frame_thickness)
-    glVertex2f(config.WINDOW_WIDTH - frame_offset - frame_length, frame_offset + frame_thickness)
-    glEnd()
-    
-    # Draw recording indicator (red circle with REC text)
-    overlay_x = config.WINDOW_WIDTH - 120
-    overlay_y = config.WINDOW_HEIGHT - 50
-    
-    glColor3f(1.0, 0.0, 0.0)  # Red
-    dot_radius = 25
-    dot_center_x = overlay_x + 40
-    dot_center_y = overlay_y - 15
-    
-    # Draw circle as filled polygon
-    glBegin(GL_TRIANGLES)
-    for i in range(32):
-        angle1 = (i / 32.0) * 2 * math.pi
-        angle2 = ((i + 1) / 32.0) * 2 * math.pi
-        glVertex2f(dot_center_x, dot_center_y)
-        glVertex2f(dot_center_x + dot_radius * math.cos(angle1), dot_center_y + dot_radius * math.sin(angle1))
-        glVertex2f(dot_center_x + dot_radius * math.cos(angle2), dot_center_y + dot_radius * math.sin(angle2))
+    glColor3f(0.85, 0.92, 1.0)
+    glLineWidth(2.0)
+    glBegin(GL_LINE_LOOP)
+    glVertex2f(x, y)
+    glVertex2f(x + w, y)
+    glVertex2f(x + w, y + h)
+    glVertex2f(x, y + h)
     glEnd()
-    
-    # Draw "REC" text inside the circle
-    glColor3f(1.0, 1.0, 1.0)  # White
-    text = "REC"
-    text_x = dot_center_x - 15
-    text_y = dot_center_y - 5
-    glRasterPos2f(text_x, text_y)
-    for char in text:
-        glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
-    
-    # Restore matrices
     glPopMatrix()
     glMatrixMode(GL_PROJECTION)
     glPopMatrix()
     glMatrixMode(GL_MODELVIEW)
 
-def restart_simulation():
-    """Reset all game systems to initial state."""
-    global is_moving, last_update_time, cam
-    
-    # Reset movement state
-    is_moving = False
-    
-    # Reset camera to spawn position
-    cam.pos = world.get_spawn_position()
-    cam.yaw = 0.0
-    cam.pitch = 0.0
-    
-    # Reset oxygen system
-    oxygen.level = 100.0
-    oxygen.is_depleting = False
-    
-    # Reset health system
-    health.reset()
-    
-    # Reset timer
-    last_update_time = time.time()
+def apply_projection():
+    """Perspective with the far plane pulled in to the current view distance."""
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(45.0, config.WINDOW_WIDTH/config.WINDOW_HEIGHT, 0.1, far_plane())
+    glMatrixMode(GL_MODELVIEW)
+
+def background_depth():
+    return min(100.0, far_plane() * 0.9)
 
 def display():
-    global camera_view_mode
-    
+    frame_start = time.perf_counter()
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    
+    # Catch the simulation up to now (or, with the simulation thread, just
+    # pick up its latest ticks); the frame shows the state between the last two
+    profiler.begin("update")
+    simulation.advance(frame_start)
+    profiler.end("update")
+    
+    # The menu covers the whole window, so skip the scene behind it
+    if settings_menu.is_open:
+        hud.begin(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+        settings_menu.draw(hud)
+        hud.submit()
+        scheduler.frame_drawn()
+        glutSwapBuffers()
+        return
+    
+    apply_projection()
     glLoadIdentity()
     
     # Draw gradient background
-    background.draw()
+    background.draw(background_depth())
     
+    # Camera view mode shows the view from the camera model's perspective;
+    # the picture-in-picture feed shows whichever view is not on screen
+    eye_pose = simulation.view_pose()
+    eye_view = Viewpoint(*eye_pose)
     if camera_view_mode:
-        # Camera view mode - show view from camera model's perspective
-        cam_pos_backup = list(cam.pos)
-        cam_yaw_backup = cam.yaw
-        cam_pitch_backup = cam.pitch
-        
-        # Offset to camera model position (camera is on left of hand)
-        offset_x = -0.3
-        offset_y = -0.2
-        offset_z = -0.5
-        
-        # Apply offset in camera's local space
-        rad_yaw = math.radians(cam.yaw)
-        cam.pos[0] += offset_x * math.cos(rad_yaw) - offset_z * math.sin(rad_yaw)
-        cam.pos[1] += offset_y
-        cam.pos[2] += offset_x * math.sin(rad_yaw) + offset_z * math.cos(rad_yaw)
-        
-        # Rotation adjustment to match camera model angle
-        cam.yaw += 15
-        cam.pitch -= 8
-        
-        cam.apply_view()
-        
-        # Restore camera state
-        cam.pos = cam_pos_backup
-        cam.yaw = cam_yaw_backup
-        cam.pitch = cam_pitch_backup
+        main_view = Viewpoint(*camera_model_pose(*eye_pose))
+        pip_view = eye_view
     else:
-        # Normal view mode
-        cam.apply_view()
-    
-    world.draw(cam)
+        main_view = eye_view
+        pip_view = Viewpoint(*camera_model_pose(*eye_pose))
+    views = [main_view, pip_view] if config.PIP_ENABLED else [main_view]
+    
+    # Sonar pings once per drawn frame, from the pose the frame shows
+    if config.SONAR_ON and not health.is_dead:
+        sonar.scan(world, *eye_pose)
+    
+    # Cull/light once for every view drawn this frame
+    profiler.begin("visibility")
+    visible = world.build_visible_set(views, simulation.render_time())
+    visible.bubbles, visible.snow = simulation.particles()
+    profiler.end("visibility")
+    
+    main_view.apply()
+    profiler.begin("render")
+    world.render(visible, main_view)
+    profiler.end("render")
+    counts = visible.counts()
+    profiler.count("blocks", counts["blocks"])
+    profiler.count("lod boxes", counts["lod_boxes"])
+    profiler.count("fish", counts["fish"])
+    profiler.count("gl calls", world.executor.calls)
+    profiler.count("occl chunks", world.vis_cache.occluded_chunks)
+    profiler.count("occl blocks", world.vis_cache.occluded_blocks)
+    profiler.count("occl fish", visible.occluded_fish)
+    profiler.count("vis refresh", world.vis_cache.refreshes)
+    profiler.count("chunks redone", world.vis_cache.chunks_rebuilt)
+    profiler.count("upd deferred", world.updates.deferred)
+    if world.fish_tiers is not None:
+        profiler.count("fish f/s/x", "/".join(str(n) for n in world.fish_tiers.counts()))
     
     if not camera_view_mode:
-        world.draw_minimap(cam)
+        world.draw_minimap(eye_view)
+        if config.SONAR_ON:
+            sonar.draw(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
     
     # Draw first person camera (only in normal view)
     if not camera_view_mode:
         glLoadIdentity()
         first_person.draw()
     
-    # Draw oxygen and health bars (only in normal view)
-    if not camera_view_mode:
-        oxygen.render(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
-        health.render(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+    if config.PIP_ENABLED:
+        draw_picture_in_picture(visible, pip_view)
     
-    # Draw camera overlay if in camera view mode
-    if camera_view_mode:
-        draw_camera_overlay()
+    # Oxygen and health bars in normal view, the camera overlay in camera
+    # view; both go out in one HUD submit
+    hud.begin(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
+    if not camera_view_mode:
+        oxygen.render(hud)
+        health.render(hud)
+    else:
+        draw_camera_overlay(hud)
+    profiler.count("hud gl calls", hud.submit())
     
     # Draw death screen if player is dead
     if health.is_dead:
         health.draw_death_screen(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
     
-    # Draw settings menu if open
-    settings_menu.draw()
+    if config.SHOW_PROFILER:
+        profiler.draw(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
     
+    # Work time before the swap, so vsync waits do not count against quality
+    quality.update((time.perf_counter() - frame_start) * 1000.0)
+    profiler.frame()
+    scheduler.frame_drawn()
     glutSwapBuffers()
 
 def keyboard(key, x, y):
-    global is_moving
-    
     # Handle restart key when dead
     if health.is_dead and key == b'1':
         restart_simulation()
-        glutPostRedisplay()
+        scheduler.request_redisplay()
         return
     
     # Prevent all other actions when dead
@@ -249,30 +325,38 @@ def keyboard(key, x, y):
     
     # Check if settings menu handles the key
     if settings_menu.handle_key(key):
-        glutPostRedisplay()
+        scheduler.request_redisplay()
         return
     
     # Settings menu toggle
     if key == b'`' or key == b'~':
         settings_menu.toggle()
-        glutPostRedisplay()
+        scheduler.request_redisplay()
         return
     
-    # Movement keys - start oxygen depletion
-    if key in [b'w', b's', b'a', b'd', b'q', b'e']:
-        cam.move(key, world)
-        oxygen.start_depletion()
-        is_moving = True
+    # Current overlay on the minimap
+    if key == b'c':
+        config.SHOW_CURRENT_OVERLAY = not config.SHOW_CURRENT_OVERLAY
     
-    # IJKL Looking
-    sens = 3.0
-    if key == b'i': cam.pitch += sens
-    if key == b'k': cam.pitch -= sens
-    if key == b'j': cam.yaw -= sens
-    if key == b'l': cam.yaw += sens
+    # Take a photo through the camera model
+    if key == b'p' and camera_view_mode:
+        take_photo()
     
-    cam.pitch = max(-89.0, min(89.0, cam.pitch))
-    glutPostRedisplay()
+    # Sonar sweep display
+    if key == b'n':
+        config.SONAR_ON = not config.SONAR_ON
+    
+    # Picture-in-picture camera feed
+    if key == b'v':
+        config.PIP_ENABLED = not config.PIP_ENABLED
+    
+    # Frame timing readout
+    if key == b'f':
+        config.SHOW_PROFILER = not config.SHOW_PROFILER
+    
+    # WASDQE movement and IJKL looking act while held, once per simulation tick
+    simulation.press(key)
+    scheduler.request_redisplay()
 
 def mouse(button, state, x, y):
     """Handle mouse button clicks - right click toggles camera view."""
@@ -281,51 +365,33 @@ def mouse(button, state, x, y):
     if button == GLUT_RIGHT_BUTTON:
         if state == GLUT_DOWN:
             camera_view_mode = not camera_view_mode
-            glutPostRedisplay()
+            scheduler.request_redisplay()
 
 def keyboard_up(key, x, y):
-    """Handle key release to stop oxygen depletion."""
-    global is_moving
-    # Don't process key release when dead
-    if health.is_dead:
-        return
-    if key in [b'w', b's', b'a', b'd', b'q', b'e']:
-        is_moving = False
-        oxygen.stop_depletion()
+    """Handle key release; oxygen stops depleting once no movement key is held."""
+    simulation.release(key)
 
 def update():
-    """Update oxygen and health systems based on elapsed time."""
-    global last_update_time
+    """Idle callback: redraw once per scheduled frame. The simulation is
+    advanced and the sonar pinged by display()."""
     
-    # Don't update game state when dead
-    if health.is_dead:
-        glutPostRedisplay()
+    # The menu and death screen are static and redraw at a low rate
+    if not scheduler.frame_due(static=health.is_dead or settings_menu.is_open):
         return
     
-    current_time = time.time()
-    delta_time = current_time - last_update_time
-    last_update_time = current_time
-    
-    # Update oxygen (depletes when moving)
-    oxygen.update(delta_time)
-    
-    # Update health (depletes when oxygen is critical)
-    health.update(delta_time, oxygen.is_critical())
-    
-    # Check if player has died
-    health.is_depleted()
-    
     glutPostRedisplay()
+
 def main():
     glutInit(sys.argv)
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
     glutInitWindowSize(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
     glutCreateWindow(b"Underwater Simulator")
     
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    gluPerspective(45.0, config.WINDOW_WIDTH/config.WINDOW_HEIGHT, 0.1, 150.0)
-    glMatrixMode(GL_MODELVIEW)
+    apply_projection()
+    
+    # Simulation ticks on a worker thread; display() only reads its snapshots
+    if config.USE_MULTITHREADING:
+        simulation.start_thread()
     
     glutDisplayFunc(display)
     glutKeyboardFunc(keyboard)
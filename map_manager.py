@@ -6,10 +6,25 @@ import config
 import math
 import random
 import time
+import numpy as np
 from orangered_fish import OrangeRedFish
 from blueblack_fish import BlueBlackFish
 from pink_fish import PinkFish
 from yellowgray_fish import YellowGrayFish
+from spatial_hash import SpatialHash
+from particles import BubblePool, MarineSnow
+from currents import CurrentField
+from fish_school import FishSchool
+from fish_process import FishProcess
+from update_scheduler import UpdateScheduler
+from fish_tiers import FishTiers, FULL
+from navigation import Navigator
+from visibility import Viewpoint, VisibleSet, VisibilityCache
+from terrain_chunks import build_chunks, TerrainChunk
+from occlusion import hidden_chunks, solid_heights, column_windows
+from water_fog import view_distance, fog_factors, apply_fog, fog_color
+from render_commands import RenderList, GLExecutor, CUBE, QUADS
+from batching import exposed_faces, cube_quads
 
 class Seaweed:
     def __init__(self, x, z, base_y, color=None):
@@ -31,67 +46,78 @@ class Seaweed:
         self.width = 0.15
         self.seg_len = config.SEAWEED_SEG_LEN
 
-    def draw(self, t, cam):
+    def draw(self, out, t, lod=0, fog=0.0):
+        """Append the stalk segments and leaf clusters to RenderList out."""
+        # lod 0 draws the full leaf clusters, lod 1 a sparse single ring
+        stalk = fog_color(self.color, fog)
+        leaf = fog_color(self.leaf_color(), fog)
+        if lod == 0:
+            num_layers, leaves_per_layer = 3, 8
+        else:
+            num_layers, leaves_per_layer = 1, 4
+        scale = (self.width, self.seg_len, self.width)
         sway = math.sin(t + self.phase) * self.amp
-        glPushMatrix()
-        glTranslatef(self.x + sway, self.base_y + self.seg_len * 0.5, self.z)
-        glColor3f(*self.color)
-        glScalef(self.width, self.seg_len, self.width)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, (self.x + sway, self.base_y + self.seg_len * 0.5, self.z), stalk, scale)
 
         # Draw 2D flat leaves (Cluster of leaves)
-        self._draw_leaves(self.x + sway, self.base_y + self.seg_len * 0.5, self.z, 0)
+        self._draw_leaves(out, self.x + sway, self.base_y + self.seg_len * 0.5, self.z, 0,
+                          num_layers, leaves_per_layer, leaf)
 
         sway_top = math.sin(t + self.phase + 0.8) * (self.amp * 1.3)
-        glPushMatrix()
-        glTranslatef(self.x + sway_top, self.base_y + self.seg_len * 1.5, self.z)
-        glColor3f(*self.color)
-        glScalef(self.width, self.seg_len, self.width)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, (self.x + sway_top, self.base_y + self.seg_len * 1.5, self.z), stalk, scale)
 
         # Draw leaves for top segment
-        self._draw_leaves(self.x + sway_top, self.base_y + self.seg_len * 1.5, self.z, 1)
+        self._draw_leaves(out, self.x + sway_top, self.base_y + self.seg_len * 1.5, self.z, 1,
+                          num_layers, leaves_per_layer, leaf)
 
-        if self._contains(cam.pos, sway, sway_top):
-            cam.visible = False
+    def leaf_color(self):
+        # Leaves are slightly lighter and greener than the stalk
+        return (self.color[0] * 0.9, self.color[1] * 1.1, self.color[2] * 0.9)
 
-    def _draw_leaves(self, x, y, z, level):
-        # Draw many 2D flat leaves (rectangles) radially around the weed
-        glPushMatrix()
-        glTranslatef(x, y, z)
-        glColor3f(self.color[0]*0.9, self.color[1]*1.1, self.color[2]*0.9) # Slightly different color
-        
-        # Draw multiple layers of leaves to make it dense
-        # 3 layers vertically, more leaves around per layer for better radial distribution
-        num_layers = 3
-        leaves_per_layer = 8  # Increased from 4 to 8 for better radial coverage
-        
-        for l in range(num_layers):
-            layer_y = (l - 1) * 0.2 # Spread vertically around the center
-            
-            for i in range(leaves_per_layer):
-                glPushMatrix()
-                # Rotate around Y axis to distribute leaves radially
-                angle = i * (360.0 / leaves_per_layer) + (l * 15.0) # Offset layers rotation
-                glRotatef(angle, 0, 1, 0)
-                glTranslatef(0, layer_y, 0)
-                
-                # Draw leaf as a long rectangle extending outward radially
-                glBegin(GL_QUADS)
-                # Leaf shape - longer and thinner rectangles
-                leaf_len = 0.35 + (level * 0.1)
-                leaf_w = 0.08
-                
-                # Draw leaf extending outward from the center
-                glVertex3f(0.02, -leaf_w/2, 0)
-                glVertex3f(leaf_len, -leaf_w/2, 0)
-                glVertex3f(leaf_len, leaf_w/2, 0)
-                glVertex3f(0.02, leaf_w/2, 0)
-                glEnd()
-                glPopMatrix()
-        glPopMatrix()
+    @staticmethod
+    def draw_billboards(weeds, t, yaw, out, fogs=None):
+        """Append distant seaweed to RenderList out as two crossed quads
+        turned towards the camera, all in one quads command. fogs holds one
+        fog weight per weed."""
+        rad = math.radians(yaw)
+        # Quads sit at +-45 degrees to the view direction so both stay visible
+        axes = []
+        for off in (math.pi * 0.25, -math.pi * 0.25):
+            axes.append((math.cos(rad + off), math.sin(rad + off)))
+        if fogs is None:
+            fogs = [0.0] * len(weeds)
+        verts = []
+        colors = []
+        for sw, fog in zip(weeds, fogs):
+            sway = math.sin(t + sw.phase) * sw.amp
+            sway_top = math.sin(t + sw.phase + 0.8) * (sw.amp * 1.3)
+            y0 = sw.base_y
+            y1 = sw.base_y + sw.seg_len * 2.0
+            half = 0.35
+            colors.extend([fog_color(sw.leaf_color(), fog)] * 8)
+            for ax, az in axes:
+                verts.append((sw.x + sway - ax * half, y0, sw.z - az * half))
+                verts.append((sw.x + sway + ax * half, y0, sw.z + az * half))
+                verts.append((sw.x + sway_top + ax * half, y1, sw.z + az * half))
+                verts.append((sw.x + sway_top - ax * half, y1, sw.z - az * half))
+        out.vertices(QUADS, verts, colors)
+
+    def _draw_leaves(self, out, x, y, z, level, num_layers=3, leaves_per_layer=8, color=None):
+        # Many 2D flat leaves (rectangles) radially around the weed, as one
+        # quads command placed at the stalk
+        shape = _leaf_shape(level, num_layers, leaves_per_layer)
+        out.vertices(QUADS, shape, color or self.leaf_color(), origin=(x, y, z))
+
+    def footprint(self):
+        """XZ rectangle covering the stalk at any point of its sway."""
+        reach = self.width * 0.5 + self.amp * 1.3
+        half = self.width * 0.5
+        return (self.x - reach, self.z - half, self.x + reach, self.z + half)
+
+    def contains_at(self, pos, t):
+        sway = math.sin(t + self.phase) * self.amp
+        sway_top = math.sin(t + self.phase + 0.8) * (self.amp * 1.3)
+        return self._contains(pos, sway, sway_top)
 
     def _contains(self, pos, sway, sway_top):
         px, py, pz = pos
@@ -112,24 +138,117 @@ class Seaweed:
         in_top = (x0t <= px <= x1t) and (y0t <= py <= y1t) and (z0 <= pz <= z1)
         return in_bottom or in_top
 
+
+_LEAF_SHAPES = {}
+
+
+def _leaf_shape(level, num_layers, leaves_per_layer):
+    """Corners of a leaf cluster around the origin as a list of (x, y, z),
+    built once per shape. Each leaf is a long thin rectangle turned about Y."""
+    key = (level, num_layers, leaves_per_layer)
+    shape = _LEAF_SHAPES.get(key)
+    if shape is None:
+        leaf_len = 0.35 + (level * 0.1)
+        leaf_w = 0.08
+        corners = [(0.02, -leaf_w / 2), (leaf_len, -leaf_w / 2), (leaf_len, leaf_w / 2), (0.02, leaf_w / 2)]
+        verts = []
+        for l in range(num_layers):
+            layer_y = (l - (num_layers - 1) * 0.5) * 0.2  # Spread vertically around the center
+            for i in range(leaves_per_layer):
+                # Offset layers rotation so they fill each other's gaps
+                angle = math.radians(i * (360.0 / leaves_per_layer) + (l * 15.0))
+                c, s = math.cos(angle), math.sin(angle)
+                for px, py in corners:
+                    verts.append((px * c, layer_y + py, -px * s))
+        shape = _LEAF_SHAPES[key] = verts
+    return shape
+
+
 class MapManager:
     def __init__(self):
         self.blocks = {}
-        self.bubbles = []
+        self.bubbles = BubblePool(config.BUBBLE_MAX)
+        self.marine_snow = MarineSnow()
         self.last_time = time.time()
         self._noise_perm = self._build_perm()
+        self._perm_array = np.array(self._noise_perm, dtype=np.int64)
         self.height_map = {}
+        self.top_grid = None  # (MAP_SIZE, MAP_SIZE) array, y just above the highest block
+        self.voxel_grid = None  # (MAP_SIZE, MAX_HEIGHT + 1, MAP_SIZE) block ids, 0 for water
+        self.solid_grid = None  # (MAP_SIZE, MAP_SIZE) height of the gap-free run from the floor
+        self._occluder_windows = None  # built from solid_grid on first use
+        self._top_colors = None  # (MAP_SIZE, MAP_SIZE, 3) minimap colours, built on first use
+        self._minimap_cells = None
+        self._minimap_frame = 0
         self.seaweeds = []
+        self.seaweed_index = SpatialHash(config.SEAWEED_HASH_CELL)
         self.coral_rects = []
         self.coral_reefs = []
         self.orangered_fish_school = []
         self.blueblack_school = []
         self.pink_fish_school = []
         self.yellowgray_fish_school = []
+        self.fish_schools = []
+        self.chunks = None  # (cx, cz) -> TerrainChunk, built after generation
+        self.navigation = None  # Navigator over the water, built after generation
+        self.vis_cache = VisibilityCache()
+        self.executor = GLExecutor()
+        self.last_commands = None  # RenderList of the last render()
         self.generate_world()
+        self.currents = CurrentField(self._perlin2d)
+        # Started last, once the schools and currents it copies exist
+        self.fish_process = FishProcess(self.fish_schools, self.currents) if config.FISH_PROCESS else None
+        # Simulation LOD; the fish process always runs every fish in full
+        self.fish_tiers = FishTiers(self.fish_schools) if self.fish_process is None else None
+        self.updates = UpdateScheduler()
+        self._eye = [0.0, 0.0, 0.0]
+        self._register_updates()
 
     def add_block(self, x, y, z, block_id):
-        self.blocks[(int(x), int(y), int(z))] = block_id
+        key = (int(x), int(y), int(z))
+        is_new = key not in self.blocks
+        self.blocks[key] = block_id
+        if self.voxel_grid is not None and self._in_grid(x, y, z):
+            self.voxel_grid[key] = block_id
+        if self.solid_grid is not None and self._in_grid(x, y, z):
+            self._update_solid_column(key[0], key[2])
+        if self.chunks is not None:
+            self._chunk_edited(key, added=is_new)
+        if self.navigation is not None:
+            self.navigation.block_changed(*key, solid=True)
+
+    def remove_block(self, x, y, z):
+        key = (int(x), int(y), int(z))
+        if self.blocks.pop(key, None) is None:
+            return
+        if self.voxel_grid is not None and self._in_grid(x, y, z):
+            self.voxel_grid[key] = 0
+        if self.solid_grid is not None and self._in_grid(x, y, z):
+            self._update_solid_column(key[0], key[2])
+        if self.chunks is not None:
+            self._chunk_edited(key, removed=True)
+        if self.navigation is not None:
+            self.navigation.block_changed(*key, solid=False)
+
+    def _chunk_edited(self, key, added=False, removed=False):
+        """Relight the chunk holding an edited block and drop its cached entry."""
+        size = config.CHUNK_SIZE
+        ck = (key[0] // size, key[2] // size)
+        chunk = self.chunks.get(ck)
+        if chunk is None:
+            chunk = self.chunks[ck] = TerrainChunk(ck[0], ck[1], size)
+        if added:
+            chunk.keys.append(key)
+        elif removed:
+            chunk.keys.remove(key)
+        chunk.rebuild(self)
+        self.vis_cache.invalidate(ck)
+        self._top_colors = None
+        self._minimap_cells = None
+
+    def _in_grid(self, x, y, z):
+        sx, sy, sz = self.voxel_grid.shape
+        return 0 <= x < sx and 0 <= y < sy and 0 <= z < sz
 
     def generate_world(self):
         scale = 0.12
@@ -215,7 +334,7 @@ class MapManager:
                 if count >= patch_min:
                     pass
         
-        num_orangered_fish = 35
+        num_orangered_fish = config.FISH_PER_SPECIES
         for i in range(num_orangered_fish):
             fish_x = random.randint(10, config.MAP_SIZE - 10)
             fish_z = random.randint(10, config.MAP_SIZE - 10)
@@ -223,7 +342,7 @@ class MapManager:
             self.orangered_fish_school.append(OrangeRedFish(fish_x, fish_z, fish_y))
         print(f"Spawned {num_orangered_fish} orange red fish across the ocean")
         
-        num_blueblack_fish = 35
+        num_blueblack_fish = config.FISH_PER_SPECIES
         for i in range(num_blueblack_fish):
             fish_x = random.randint(10, config.MAP_SIZE - 10)
             fish_z = random.randint(10, config.MAP_SIZE - 10)
@@ -231,7 +350,7 @@ class MapManager:
             self.blueblack_school.append(BlueBlackFish(fish_x, fish_z, fish_y))
         print(f"Spawned {num_blueblack_fish} blue black fish across the ocean")
         
-        num_pink_fish = 35
+        num_pink_fish = config.FISH_PER_SPECIES
         for i in range(num_pink_fish):
             fish_x = random.randint(10, config.MAP_SIZE - 10)
             fish_z = random.randint(10, config.MAP_SIZE - 10)
@@ -239,92 +358,406 @@ class MapManager:
             self.pink_fish_school.append(PinkFish(fish_x, fish_z, fish_y))
         print(f"Spawned {num_pink_fish} pink fish across the ocean")
         
-        num_yellowgray_fish = 35
+        num_yellowgray_fish = config.FISH_PER_SPECIES
         for i in range(num_yellowgray_fish):
             fish_x = random.randint(10, config.MAP_SIZE - 10)
             fish_z = random.randint(10, config.MAP_SIZE - 10)
             fish_y = self.height_map.get((fish_x, fish_z), 1) + random.uniform(3.0, 5.5)
             self.yellowgray_fish_school.append(YellowGrayFish(fish_x, fish_z, fish_y))
         print(f"Spawned {num_yellowgray_fish} yellow gray fish across the ocean")
+
+        self.orangered_fish_school = FishSchool(self.orangered_fish_school)
+        self.blueblack_school = FishSchool(self.blueblack_school)
+        self.pink_fish_school = FishSchool(self.pink_fish_school)
+        self.yellowgray_fish_school = FishSchool(self.yellowgray_fish_school)
+        self.fish_schools = [self.orangered_fish_school, self.blueblack_school,
+                             self.pink_fish_school, self.yellowgray_fish_school]
         
         self._generate_caves()
+        self._build_seaweed_index()
+        self._build_top_grid()
+        self._build_voxel_grid()
+        self.chunks = build_chunks(self, config.CHUNK_SIZE)
+        self.navigation = Navigator(self.voxel_grid, self.seaweeds)
 
     def is_occupied(self, x, y, z):
         return (int(x), int(y), int(z)) in self.blocks
 
-    def draw(self, cam):
+    def current_at(self, pos, t=None):
+        """Water current velocity (blocks per second) at pos."""
+        return self.currents.sample_point(pos[0], pos[1], pos[2], t)
+
+    def is_in_seaweed(self, pos, t=None):
+        """True when pos is inside a seaweed stalk at time t, by default the
+        last simulation step, so the sway matches the pose the simulation
+        moved the plants to. Only the plants registered in the spatial hash
+        cell of pos are tested."""
+        if t is None:
+            t = self.last_time
+        for sw in self.seaweed_index.query_point(pos[0], pos[2]):
+            if sw.contains_at(pos, t):
+                return True
+        return False
+
+    def update(self, cam):
+        """Advance fish, bubbles and ambient particles by the time since the last call."""
         now = time.time()
-        dt = now - self.last_time
-        self.last_time = now
-        t = now
-        cam.visible = True
-        if config.USE_VIEW_CULLING:
-            px = int(cam.pos[0]); pz = int(cam.pos[2])
-            r = config.DRAW_RADIUS; r2 = r * r
-            def in_range(x, z):
-                dx = x - px; dz = z - pz
-                return dx*dx + dz*dz <= r2
-        else:
-            def in_range(x, z): return True
-        for (x, y, z), b_id in self.blocks.items():
-            if not in_range(x, z): 
-                continue
-            color, _ = config.BLOCK_TYPES[b_id]
-            lx = self._lighting_factor(x, y, z)
-            cx = self._caustics(x, z, t) if y <= 1 else 1.0
-            if config.PHONG_ON and y == self.height_map.get((x, z), y):
-                pf = self._phong_factor(x, y, z, cam)
-                lx *= pf
-            r = max(0.0, min(1.0, color[0] * lx * cx))
-            g = max(0.0, min(1.0, color[1] * lx * cx))
-            b = max(0.0, min(1.0, color[2] * lx * cx))
-            glPushMatrix()
-            glTranslatef(x + 0.5, y + 0.5, z + 0.5)
-            glColor3f(r, g, b)
-            glutSolidCube(1.0)
-            glPopMatrix()
-        for cx, cy, cz, w, h, col in self.coral_rects:
-            if not in_range(int(cx), int(cz)):
-                continue
-            glPushMatrix()
-            glTranslatef(cx, cy + h * 0.5, cz)
-            glColor3f(*col)
-            glScalef(w, h, w)
-            glutSolidCube(1.0)
-            glPopMatrix()
-        for sw in self.seaweeds:
-            if not in_range(int(sw.x), int(sw.z)):
+        # Clamped so a pause (menu open, window dragged) does not jump particles
+        self.tick(cam, now, min(now - self.last_time, config.MAX_FRAME_DT))
+        for school in self.fish_schools:
+            school.show_current()
+
+    def tick(self, cam, t, dt):
+        """One simulation step of dt seconds ending at time t."""
+        self.last_time = t
+        cam.visible = not self.is_in_seaweed(cam.pos, t)
+        self._eye = cam.pos
+        if self.fish_process is not None:
+            self.fish_process.step(t, dt)
+        if self.fish_tiers is not None:
+            self.fish_tiers.update(cam.pos, t)
+        self.updates.run(t, dt)
+
+    def _register_updates(self):
+        """
+        Entity update groups stepped by tick() under ENTITY_UPDATE_BUDGET_MS.
+        Seaweed has none: its sway is a function of time evaluated when it is
+        drawn, so plants out of view cost nothing.
+        """
+        if self.fish_process is None:
+            self.updates.add("near fish", 0, 1, lambda: [self._update_near_fish])
+            self.updates.add("far fish", 2, lambda: config.FISH_FAR_UPDATE_EVERY, self._far_fish_jobs)
+            self.updates.add("shoals", 2, lambda: config.FISH_SHOAL_UPDATE_EVERY, self._shoal_jobs)
+        self.updates.add("bubbles", 1, 1, lambda: [lambda t, dt: self._update_bubbles(dt, t)])
+        self.updates.add("marine snow", 1, 1, lambda: [self._update_marine_snow])
+
+    def _near_fish_mask(self, school):
+        r = config.FISH_NEAR_UPDATE
+        return school.distance_sq_xz(self._eye[0], self._eye[2]) <= r * r
+
+    def _update_near_fish(self, t, dt):
+        for school in self.fish_schools:
+            idx = np.flatnonzero(self._near_fish_mask(school) & (school.tier == FULL))
+            if len(idx):
+                school.update(t, currents=self.currents, idx=idx)
+
+    def _far_fish_jobs(self):
+        jobs = []
+        n = config.FISH_UPDATE_SLICE
+        for school in self.fish_schools:
+            far = np.flatnonzero(~self._near_fish_mask(school) & (school.tier == FULL))
+            for i in range(0, len(far), n):
+                jobs.append(lambda t, dt, school=school, idx=far[i:i + n]:
+                            self._update_far_slice(school, idx, t))
+        return jobs
+
+    def _update_far_slice(self, school, idx, t):
+        # A job can wait ticks under the budget while FishTiers demotes some
+        # of its fish; stepping those would undo the drift set_tier gave them
+        idx = idx[school.tier[idx] == FULL]
+        if len(idx):
+            school.update(t, currents=self.currents, idx=idx)
+
+    def _shoal_jobs(self):
+        return [lambda t, dt, school=school: school.update_shoals(t) for school in self.fish_schools]
+
+    def _update_marine_snow(self, t, dt):
+        self.marine_snow.update(dt, t, self._eye, self.top_grid)
+
+    def build_visible_set(self, viewpoints, t=None):
+        """
+        Cull, light and pick LOD once for all viewpoints drawn this frame.
+        The range test uses a circle around the first viewpoint grown by the
+        distance to the others, so it covers the union of their ranges.
+        Terrain culling is cached in vis_cache and only redone once a view
+        moves or turns past the VIS_* thresholds; fish are culled every frame.
+        t is the time the frame shows, by default the last simulation step.
+        """
+        if t is None:
+            t = self.last_time
+        primary = viewpoints[0]
+        vis = VisibleSet(viewpoints, t)
+        pad = max([primary.distance_xz(v) for v in viewpoints[1:]] + [0.0])
+        # Grown by the move threshold so a reused set still covers the view
+        radius = view_distance() + pad + config.VIS_MOVE_THRESHOLD
+        cache = self.vis_cache
+        signature = (config.DRAW_RADIUS, config.USE_VIEW_CULLING, config.PHONG_ON,
+                     config.SEAWEED_LOD_NEAR, config.SEAWEED_LOD_MID, len(viewpoints),
+                     config.TERRAIN_LOD_ON, config.TERRAIN_LOD_NEAR, config.TERRAIN_LOD_FAR,
+                     config.OCCLUSION_CULLING, config.OCCLUSION_MARGIN,
+                     config.FOG_ON, config.FOG_START, config.FOG_END, config.FOG_STEPS)
+        if not cache.is_valid(viewpoints, signature):
+            self._refresh_visibility(viewpoints, radius, signature)
+            move_limit = config.VIS_MOVE_THRESHOLD
+            if cache.occluded_chunks:
+                move_limit = min(move_limit, config.OCCLUSION_MARGIN)
+            cache.mark(viewpoints, signature, move_limit)
+        vis.block_xyz = cache.xyz
+        vis.block_rgb = self._apply_caustics(cache, t)
+        vis.block_faces = cache.faces
+        vis.lod_boxes = cache.lod_boxes
+        vis.coral_rects = cache.coral_rects
+        vis.seaweeds = cache.seaweeds
+        vis.far_weeds = cache.far_weeds
+        vis.far_weed_fog = cache.far_weed_fog
+        px = primary.pos[0]; pz = primary.pos[2]
+        size = config.CHUNK_SIZE
+        ceiling = cache.hidden_ceiling
+        vis.occluded_fish = 0
+        fish_lod = view_distance() * config.FISH_LOD_FAR
+        for school in self.fish_schools:
+            if config.USE_VIEW_CULLING:
+                mask = school.in_range_mask(px, pz, radius)
+            else:
+                mask = np.ones(len(school), dtype=bool)
+            # Only full-tier fish have positions of their own to draw
+            mask &= school.tier == FULL
+            if cache.occluded_chunks:
+                pos = school.draw_pos
+                cx = np.clip(pos[:, 0].astype(np.int64) // size, 0, ceiling.shape[0] - 1)
+                cz = np.clip(pos[:, 2].astype(np.int64) // size, 0, ceiling.shape[1] - 1)
+                # Fish extend about a block above their origin
+                behind = pos[:, 1] + 1.0 < ceiling[cx, cz]
+                vis.occluded_fish += int(np.count_nonzero(mask & behind))
+                mask &= ~behind
+            # Fish past the LOD distance become coloured points
+            far = ~school.in_range_mask(px, pz, fish_lod)
+            vis.fish.append((school, np.flatnonzero(mask & ~far).tolist()))
+            far_idx = np.flatnonzero(mask & far)
+            if len(far_idx):
+                vis.far_fish.append((school, far_idx))
+        return vis
+
+    def _occluded_chunks(self, viewpoints, reach):
+        """Chunks hidden from every viewpoint, as {key: height hidden below}."""
+        if not config.OCCLUSION_CULLING:
+            return {}
+        if self._occluder_windows is None:
+            self._occluder_windows = column_windows(self.solid_grid)
+        margin = min(config.OCCLUSION_MARGIN, config.VIS_MOVE_THRESHOLD)
+        hidden = None
+        for view in viewpoints:
+            seen = hidden_chunks(self.chunks, self._occluder_windows, view.pos, margin, reach)
+            if hidden is None:
+                hidden = seen
+            else:
+                hidden = {k: min(h, seen[k]) for k, h in hidden.items() if k in seen}
+            if not hidden:
+                break
+        return hidden
+
+    def _refresh_visibility(self, viewpoints, radius, signature):
+        """
+        Re-cull terrain chunk by chunk around primary. A chunk is classified as
+        fully inside, outside or straddling the range circle, plus which seaweed
+        LOD bands its footprint spans and its terrain LOD level; chunks whose
+        classification is unchanged and not straddling reuse their previous entry.
+        Chunks hidden behind nearer terrain from every view are dropped.
+        """
+        primary = viewpoints[0]
+        cache = self.vis_cache
+        if cache.signature is not None and cache.signature[2] != signature[2]:
+            # Phong is baked into chunk colours
+            for chunk in self.chunks.values():
+                chunk.rebuild(self)
+            cache.entries.clear()
+        px = primary.pos[0]; pz = primary.pos[2]
+        culling = config.USE_VIEW_CULLING
+        lod_near = view_distance() * config.SEAWEED_LOD_NEAR
+        lod_mid = view_distance() * config.SEAWEED_LOD_MID
+
+        def band(d):
+            return 0 if d <= lod_near else (1 if d <= lod_mid else 2)
+
+        hidden = self._occluded_chunks(viewpoints, radius if culling else np.inf)
+        size = config.CHUNK_SIZE
+        n = (config.MAP_SIZE + size - 1) // size
+        ceiling = np.full((n, n), -np.inf, dtype=np.float32)
+        occluded_blocks = 0
+
+        xyz_parts, base_parts, box_parts = [], [], []
+        corals, weeds, far_weeds = [], [], []
+        for key, chunk in self.chunks.items():
+            near, far = chunk.distance_range(px, pz)
+            if key in hidden:
+                status = 0
+                ceiling[key] = hidden[key]
+                occluded_blocks += len(chunk.xyz)
+            elif not culling or far <= radius:
+                status = 2
+            elif near > radius:
+                status = 0
+            else:
+                status = 1
+            state = (status, band(near), band(far), chunk.pick_lod(chunk.center_distance(px, pz)))
+            entry = cache.entries.get(key)
+            if entry is None or entry[0] != state or status == 1 or state[1] != state[2]:
+                entry = self._cull_chunk(chunk, state, px, pz, radius, lod_near, lod_mid)
+                cache.entries[key] = entry
+                cache.chunks_rebuilt += 1
+            _, idx, boxes, c_rects, c_weeds, c_far = entry
+            if status == 0:
                 continue
-            sw.draw(t, cam)
-        
-        for fish in self.orangered_fish_school:
-            fish.update(t)
-            if in_range(int(fish.x), int(fish.z)):
-                fish.draw()
-        
-        for fish in self.blueblack_school:
-            fish.update(t)
-            if in_range(int(fish.x), int(fish.z)):
-                fish.draw()
-        
-        for fish in self.pink_fish_school:
-            fish.update(t)
-            if in_range(int(fish.x), int(fish.z)):
-                fish.draw()
-        
-        for fish in self.yellowgray_fish_school:
-            fish.update(t)
-            if in_range(int(fish.x), int(fish.z)):
-                fish.draw()
-        
-        self._update_bubbles(dt)
-        self._draw_bubbles()
+            if boxes is not None:
+                box_parts.append(boxes)
+            elif idx is None:
+                xyz_parts.append(chunk.xyz)
+                base_parts.append(chunk.base_color)
+            elif len(idx):
+                xyz_parts.append(chunk.xyz[idx])
+                base_parts.append(chunk.base_color[idx])
+            corals.extend(c_rects)
+            weeds.extend(c_weeds)
+            far_weeds.extend(c_far)
+        if xyz_parts:
+            xyz = np.concatenate(xyz_parts)
+            base = np.concatenate(base_parts)
+        else:
+            xyz = np.zeros((0, 3), dtype=np.int32)
+            base = np.zeros((0, 3), dtype=np.float32)
+        # Fog is per block from the primary eye, fixed until the next refresh
+        eye = np.asarray(primary.pos, dtype=np.float32)
+        cache.xyz = xyz
+        cache.base = base
+        cache.fog = fog_factors(np.linalg.norm(xyz + 0.5 - eye, axis=1))
+        cache.lit = apply_fog(np.clip(base, 0.0, 1.0), cache.fog)
+        cache.caustic_idx = np.flatnonzero(xyz[:, 1] <= 1)
+        cache.faces = exposed_faces(xyz, self.voxel_grid != 0)
+        if box_parts:
+            centers, sizes, colors = (np.concatenate(part) for part in zip(*box_parts))
+            # Merged boxes take the fog of their top face
+            top = centers.copy()
+            top[:, 1] = sizes[:, 1]
+            colors = apply_fog(colors, fog_factors(np.linalg.norm(top - eye, axis=1)))
+            cache.lod_boxes = (centers, sizes, colors)
+        else:
+            cache.lod_boxes = (np.zeros((0, 3), dtype=np.float32),) * 3
+        if corals:
+            pos = np.array([(r[0], r[1], r[2]) for r in corals], dtype=np.float32)
+            fogs = fog_factors(np.linalg.norm(pos - eye, axis=1)).tolist()
+            corals = [r[:5] + (fog_color(r[5], f),) for r, f in zip(corals, fogs)]
+        weeds = [(sw, lod, f) for (sw, lod), f in zip(weeds, self._weed_fog([sw for sw, _ in weeds], eye))]
+        cache.far_weed_fog = self._weed_fog(far_weeds, eye)
+        cache.hidden_ceiling = ceiling
+        cache.occluded_chunks = len(hidden)
+        cache.occluded_blocks = occluded_blocks
+        cache.coral_rects = corals
+        cache.seaweeds = weeds
+        cache.far_weeds = far_weeds
+
+    def _cull_chunk(self, chunk, state, px, pz, radius, lod_near, lod_mid):
+        """
+        Visibility entry for one chunk: (state, block_idx, lod_boxes, coral_rects,
+        seaweeds, far_weeds). block_idx None means every block; chunks at a
+        terrain LOD level draw lod_boxes instead of blocks.
+        """
+        status, lod = state[0], state[3]
+        if status == 0:
+            return (state, None, None, [], [], [])
+        r2 = radius * radius
+        boxes = chunk.lod_boxes(lod) if lod else None
+        if status == 2:
+            idx = None
+            rects = list(chunk.coral_rects)
+            candidates = chunk.seaweeds
+        else:
+            dx = chunk.xyz[:, 0] - px
+            dz = chunk.xyz[:, 2] - pz
+            idx = np.flatnonzero(dx * dx + dz * dz <= r2)
+            if boxes is not None:
+                centers = boxes[0]
+                keep = (centers[:, 0] - px) ** 2 + (centers[:, 2] - pz) ** 2 <= r2
+                boxes = tuple(a[keep] for a in boxes)
+            rects = [r for r in chunk.coral_rects
+                     if (int(r[0]) - px) ** 2 + (int(r[2]) - pz) ** 2 <= r2]
+            candidates = [sw for sw in chunk.seaweeds
+                          if (int(sw.x) - px) ** 2 + (int(sw.z) - pz) ** 2 <= r2]
+        near2 = lod_near * lod_near
+        mid2 = lod_mid * lod_mid
+        weeds, far_weeds = [], []
+        for sw in candidates:
+            d2 = (sw.x - px) ** 2 + (sw.z - pz) ** 2
+            if d2 <= near2:
+                weeds.append((sw, 0))
+            elif d2 <= mid2:
+                weeds.append((sw, 1))
+            else:
+                far_weeds.append(sw)
+        return (state, idx, boxes, rects, weeds, far_weeds)
+
+    def _weed_fog(self, weeds, eye):
+        if not weeds:
+            return []
+        pos = np.array([(sw.x, sw.base_y + sw.seg_len, sw.z) for sw in weeds], dtype=np.float32)
+        return fog_factors(np.linalg.norm(pos - eye, axis=1)).tolist()
+
+    def _apply_caustics(self, cache, t):
+        """Per-frame block colours: cached lighting and fog with caustics on the lowest layers."""
+        idx = cache.caustic_idx
+        if not len(idx):
+            return cache.lit
+        rgb = cache.lit.copy()
+        x = cache.xyz[idx, 0].astype(np.float64)
+        z = cache.xyz[idx, 2].astype(np.float64)
+        lit = np.clip(cache.base[idx] * self._caustics_array(x, z, t)[:, None], 0.0, 1.0)
+        rgb[idx] = apply_fog(lit, cache.fog[idx])
+        return rgb
 
-    def draw_minimap(self, cam=None):
+    def render(self, vis, view, secondary=False):
+        """Draw a visible set as seen from view. Terrain, coral, seaweed and
+        fish are recorded into a RenderList (kept as `last_commands`) and
+        submitted through the executor; particles draw directly after it.
+        With USE_BATCHED_GEOMETRY, terrain boxes and coral rods are
+        pre-transformed quads instead of one glutSolidCube each.
+        Secondary views skip the ambient particle layer."""
+        t = vis.time
+        cmds = RenderList()
+        # Merged far terrain first so nearer detail is painted over it
+        centers, sizes, colors = vis.lod_boxes
+        boxes = [(centers, colors, sizes, None), (vis.block_xyz + 0.5, vis.block_rgb, None, vis.block_faces)]
+        if vis.coral_rects:
+            rects = np.array([(cx, cy, cz, w, h, *col) for cx, cy, cz, w, h, col in vis.coral_rects])
+            w, h = rects[:, 3], rects[:, 4]
+            pos = rects[:, :3].copy()
+            pos[:, 1] += h * 0.5  # Rods stand on cy
+            boxes.append((pos, rects[:, 5:], np.stack([w, h, w], axis=1), None))
+        for centers, colors, sizes, faces in boxes:
+            if config.USE_BATCHED_GEOMETRY:
+                # Only faces towards the eye and not against another block
+                verts, rgb = cube_quads(centers, colors, sizes, faces, view.pos)
+                cmds.vertices(QUADS, verts.tolist(), rgb.tolist())
+            else:
+                cmds.solids(CUBE, centers, colors, sizes)
+        # Leaves, billboards and fish are painted over the terrain
+        for sw, lod, fog in vis.seaweeds:
+            sw.draw(cmds, t, lod, fog)
+        if vis.far_weeds:
+            Seaweed.draw_billboards(vis.far_weeds, t, view.yaw, cmds, vis.far_weed_fog)
+        for school, idx in vis.far_fish:
+            school.draw_points(idx, view.pos, cmds)
+        eye = np.asarray(view.pos, dtype=np.float32)
+        for school, idx in vis.fish:
+            fogs = fog_factors(np.linalg.norm(school.draw_pos[idx] - eye, axis=1)).tolist()
+            for i, fog in zip(idx, fogs):
+                school.sync(i).draw(cmds, fog)
+        self.executor.submit(cmds)
+        self.last_commands = cmds
+        self.bubbles.draw(view.pos, vis.bubbles)
+        if not secondary:
+            self.marine_snow.draw(vis.snow)
+
+    def draw(self, cam):
+        self.update(cam)
+        view = Viewpoint.from_camera(cam)
+        self.render(self.build_visible_set([view]), view)
+
+    def draw_minimap(self, view=None):
+        """Minimap around view, the Viewpoint of the frame's interpolated
+        eye pose, with the player arrow at its position and heading."""
         cell = config.MINIMAP_CELL
-        if cam is not None and config.USE_DYNAMIC_MINIMAP:
-            px = max(0, min(config.MAP_SIZE - 1, int(cam.pos[0])))
-            pz = max(0, min(config.MAP_SIZE - 1, int(cam.pos[2])))
+        if view is not None and config.USE_DYNAMIC_MINIMAP:
+            px = max(0, min(config.MAP_SIZE - 1, int(view.pos[0])))
+            pz = max(0, min(config.MAP_SIZE - 1, int(view.pos[2])))
             half = config.MINIMAP_VIEW_SIZE // 2
             x_start = max(0, px - half)
             z_start = max(0, pz - half)
@@ -351,28 +784,30 @@ class MapManager:
         glMatrixMode(GL_MODELVIEW)
         glPushMatrix()
         glLoadIdentity()
+        # The cell list is rebuilt every MINIMAP_REFRESH_FRAMES frames and resubmitted in between
+        self._minimap_frame += 1
+        if self._minimap_cells is None or self._minimap_frame >= config.MINIMAP_REFRESH_FRAMES:
+            self._minimap_frame = 0
+            self._minimap_cells = self._minimap_cell_list(x_start, z_start, x_end, z_end,
+                                                          origin_x, origin_y, cell)
         glBegin(GL_QUADS)
-        for x in range(x_start, x_end):
-            for z in range(z_start, z_end):
-                top_id = self._top_block_id(x, z)
-                color = config.BLOCK_TYPES[top_id][0] if top_id in config.BLOCK_TYPES else (1.0, 1.0, 1.0)
-                glColor3f(*color)
-                x0 = origin_x + (x - x_start) * cell
-                y0 = origin_y + (z - z_start) * cell
-                x1 = x0 + cell
-                y1 = y0 + cell
-                glVertex2f(x0, y0)
-                glVertex2f(x1, y0)
-                glVertex2f(x1, y1)
-                glVertex2f(x0, y1)
+        for r, g, b, x0, y0, x1, y1 in self._minimap_cells:
+            glColor3f(r, g, b)
+            glVertex2f(x0, y0)
+            glVertex2f(x1, y0)
+            glVertex2f(x1, y1)
+            glVertex2f(x0, y1)
         glEnd()
-        if cam is not None:
-            px = max(0, min(config.MAP_SIZE - 1, int(cam.pos[0])))
-            pz = max(0, min(config.MAP_SIZE - 1, int(cam.pos[2])))
+        if config.SHOW_CURRENT_OVERLAY:
+            layer_y = view.pos[1] if view is not None else 2.0
+            self._draw_current_arrows(layer_y, x_start, z_start, x_end, z_end, origin_x, origin_y, cell)
+        if view is not None:
+            px = max(0, min(config.MAP_SIZE - 1, int(view.pos[0])))
+            pz = max(0, min(config.MAP_SIZE - 1, int(view.pos[2])))
             cx = origin_x + (px - x_start) * cell + cell * 0.5
             cy = origin_y + (pz - z_start) * cell + cell * 0.5
             r = cell * 0.45
-            ang = -math.radians(cam.yaw)
+            ang = -math.radians(view.yaw)
             tx = 0.0; ty = r
             lx = -r * 0.4; ly = -r * 0.5
             rx = r * 0.4; ry = -r * 0.5
@@ -393,6 +828,54 @@ class MapManager:
         glPopMatrix()
         glMatrixMode(GL_MODELVIEW)
 
+    def _minimap_cell_list(self, x_start, z_start, x_end, z_end, origin_x, origin_y, cell):
+        """(r, g, b, x0, y0, x1, y1) for each minimap cell in the window."""
+        if self._top_colors is None:
+            self._top_colors = self._build_top_colors()
+        colors = self._top_colors[x_start:x_end, z_start:z_end].reshape(-1, 3)
+        gx, gz = np.meshgrid(np.arange(x_end - x_start), np.arange(z_end - z_start), indexing="ij")
+        x0 = origin_x + gx.ravel() * cell
+        y0 = origin_y + gz.ravel() * cell
+        quads = np.column_stack([colors, x0, y0, x0 + cell, y0 + cell])
+        return quads.tolist()
+
+    def _build_top_colors(self):
+        colors = np.ones((config.MAP_SIZE, config.MAP_SIZE, 3), dtype=np.float32)
+        for x in range(config.MAP_SIZE):
+            for z in range(config.MAP_SIZE):
+                top_id = self._top_block_id(x, z)
+                if top_id in config.BLOCK_TYPES:
+                    colors[x, z] = config.BLOCK_TYPES[top_id][0]
+        return colors
+
+    def _draw_current_arrows(self, layer_y, x_start, z_start, x_end, z_end, origin_x, origin_y, cell):
+        step = max(2, int(config.CURRENT_CELL) // 2)
+        xs = np.arange(x_start + step * 0.5, x_end, step)
+        zs = np.arange(z_start + step * 0.5, z_end, step)
+        if len(xs) == 0 or len(zs) == 0:
+            return
+        gx, gz = np.meshgrid(xs, zs, indexing="ij")
+        pts = np.stack([gx.ravel(), np.full(gx.size, layer_y), gz.ravel()], axis=1)
+        flow = self.currents.sample(pts, time.time())
+        scale = cell * 4.0
+        glColor3f(0.1, 0.2, 0.6)
+        glBegin(GL_LINES)
+        for (wx, _, wz), (vx, _, vz) in zip(pts.tolist(), flow.tolist()):
+            x0 = origin_x + (wx - x_start) * cell
+            y0 = origin_y + (wz - z_start) * cell
+            x1 = x0 + vx * scale
+            y1 = y0 + vz * scale
+            glVertex2f(x0, y0)
+            glVertex2f(x1, y1)
+            # Arrow head: two short strokes back from the tip
+            hx = (x0 - x1) * 0.35
+            hy = (y0 - y1) * 0.35
+            glVertex2f(x1, y1)
+            glVertex2f(x1 + hx - hy * 0.6, y1 + hy + hx * 0.6)
+            glVertex2f(x1, y1)
+            glVertex2f(x1 + hx + hy * 0.6, y1 + hy - hx * 0.6)
+        glEnd()
+
     def get_spawn_position(self):
         for x in range(1, config.MAP_SIZE - 1):
             for z in range(1, config.MAP_SIZE - 1):
@@ -412,26 +895,30 @@ class MapManager:
                     if origin_x + dx < config.MAP_SIZE and origin_z + dz < config.MAP_SIZE:
                         self.add_block(origin_x + dx, y, origin_z + dz, b_id)
 
-    def _update_bubbles(self, dt):
-        spawn_rate = 0.6
-        if random.random() < spawn_rate * dt:
-            x = random.randint(0, config.MAP_SIZE - 1) + 0.5
-            z = random.randint(0, config.MAP_SIZE - 1) + 0.5
-            y = 0.2
-            speed = random.uniform(0.5, 1.2)
-            radius = random.uniform(0.05, 0.12)
-            self.bubbles.append([x, y, z, speed, radius])
-        for b in self.bubbles:
-            b[1] += b[3] * dt
-        self.bubbles = [b for b in self.bubbles if b[1] < config.MAX_HEIGHT]
-
-    def _draw_bubbles(self):
-        for x, y, z, _, r in self.bubbles:
-            glPushMatrix()
-            glTranslatef(x, y, z)
-            glColor3f(0.9, 0.95, 1.0)
-            glutSolidSphere(r, 12, 12)
-            glPopMatrix()
+    def _update_bubbles(self, dt, t):
+        if self.bubbles.capacity != config.BUBBLE_MAX:
+            self.bubbles = BubblePool(config.BUBBLE_MAX)
+        self.bubbles.emit(dt, self.top_grid)
+        self.bubbles.update(dt, config.MAX_HEIGHT, self.currents, t)
+
+    def _build_voxel_grid(self):
+        grid = np.zeros((config.MAP_SIZE, config.MAX_HEIGHT + 1, config.MAP_SIZE), dtype=np.uint8)
+        for (x, y, z), b_id in self.blocks.items():
+            if 0 <= x < config.MAP_SIZE and 0 <= y <= config.MAX_HEIGHT and 0 <= z < config.MAP_SIZE:
+                grid[x, y, z] = b_id
+        self.voxel_grid = grid
+        self.solid_grid = solid_heights(grid)
+
+    def _update_solid_column(self, x, z):
+        self.solid_grid[x, z] = solid_heights(self.voxel_grid[x:x + 1, :, z:z + 1])[0, 0]
+        self._occluder_windows = None
+
+    def _build_top_grid(self):
+        grid = np.ones((config.MAP_SIZE, config.MAP_SIZE), dtype=np.float32)
+        for (x, y, z) in self.blocks:
+            if 0 <= x < config.MAP_SIZE and 0 <= z < config.MAP_SIZE and y + 1 > grid[x, z]:
+                grid[x, z] = y + 1
+        self.top_grid = grid
 
     def _lighting_factor(self, x, y, z):
         base = config.LIGHT_AMBIENT + (y * config.LIGHT_DEPTH_DARKEN)
@@ -445,6 +932,11 @@ class MapManager:
         v = self._perlin2d(x * s + t * sp, z * s + t * sp)
         return 1.0 + config.CAUSTICS_INTENSITY * v
 
+    def _caustics_array(self, x, z, t):
+        s = config.CAUSTICS_SCALE
+        sp = config.CAUSTICS_SPEED
+        return 1.0 + config.CAUSTICS_INTENSITY * self._perlin2d_array(x * s + t * sp, z * s + t * sp)
+
     def _phong_factor(self, x, y, z, cam):
         hx0 = self.height_map.get((max(0, x - 1), z), y)
         hx1 = self.height_map.get((min(config.MAP_SIZE - 1, x + 1), z), y)
@@ -464,6 +956,11 @@ class MapManager:
         spec = config.PHONG_SPEC * (ndotl ** config.PHONG_SHININESS)
         return config.PHONG_AMB + diffuse + spec
 
+    def _build_seaweed_index(self):
+        self.seaweed_index.clear()
+        for sw in self.seaweeds:
+            self.seaweed_index.insert(sw, *sw.footprint())
+
     def _is_cave_shadow(self, x, y, z):
         for dy in range(1, 3):
             if self.is_occupied(x, y + dy, z):
@@ -536,3 +1033,28 @@ class MapManager:
         x2 = self._lerp(self._grad(self._noise_perm[ab], xf, yf - 1),
                         self._grad(self._noise_perm[bb], xf - 1, yf - 1), u)
         return self._lerp(x1, x2, v)
+
+    def _perlin2d_array(self, x, y):
+        """Vectorized _perlin2d over matching arrays of coordinates."""
+        perm = self._perm_array
+        fx = np.floor(x); fy = np.floor(y)
+        xi = fx.astype(np.int64) & 255
+        yi = fy.astype(np.int64) & 255
+        xf = x - fx
+        yf = y - fy
+        u = self._fade(xf)
+        v = self._fade(yf)
+        aa = perm[xi] + yi
+        ab = aa + 1
+        ba = perm[xi + 1] + yi
+        bb = ba + 1
+
+        def grad(h, gx, gy):
+            h = h & 3
+            a = np.where(h < 2, gx, gy)
+            b = np.where(h < 2, gy, gx)
+            return np.where(h & 1, -a, a) + np.where(h & 2, -b, b)
+
+        x1 = self._lerp(grad(perm[aa], xf, yf), grad(perm[ba], xf - 1, yf), u)
+        x2 = self._lerp(grad(perm[ab], xf, yf - 1), grad(perm[bb], xf - 1, yf - 1), u)
+        return self._lerp(x1, x2, v)
@@ -0,0 +1,364 @@
+import heapq
+import math
+from collections import OrderedDict
+import numpy as np
+import config
+
+# Border cells of one entrance are split into bands this many cells tall, so
+# a tall open border gets a crossing near each depth instead of one mid-water.
+# Four-cell bands double the graph (about 1400 nodes on the default map, not
+# 720) and make uncached queries about half again as slow
+ENTRANCE_BAND = 8
+
+_GOAL = ()  # search node standing for the goal cell
+_STEPS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+
+
+def distance_fields(open_cells, sources):
+    """
+    Breadth-first step counts over the open cells of one cluster, 6-connected.
+
+    Args:
+        open_cells: (sx, sy, sz) bool array of passable cells
+        sources: list of local (x, y, z) cells, one field each
+
+    Returns:
+        (len(sources), sx, sy, sz) int16 array, -1 where unreachable
+    """
+    dist = np.full((len(sources),) + open_cells.shape, -1, dtype=np.int16)
+    front = np.zeros(dist.shape, dtype=bool)
+    for i, (x, y, z) in enumerate(sources):
+        front[i, x, y, z] = True
+    reached = front.copy()
+    dist[front] = 0
+    step = 0
+    while True:
+        step += 1
+        nxt = np.zeros_like(front)
+        nxt[:, 1:] |= front[:, :-1]
+        nxt[:, :-1] |= front[:, 1:]
+        nxt[:, :, 1:] |= front[:, :, :-1]
+        nxt[:, :, :-1] |= front[:, :, 1:]
+        nxt[:, :, :, 1:] |= front[:, :, :, :-1]
+        nxt[:, :, :, :-1] |= front[:, :, :, 1:]
+        nxt &= open_cells
+        nxt &= ~reached
+        if not nxt.any():
+            return dist
+        reached |= nxt
+        dist[nxt] = step
+        front = nxt
+
+
+class Navigator:
+    """
+    Hierarchical (HPA*-style) pathfinding through the water of the voxel grid.
+
+    The navigable grid is every empty voxel, minus the cells seaweed stalks
+    stand in. It is cut into NAV_CLUSTER_SIZE square columns of full height.
+    Wherever two neighbouring clusters share open border cells, one entrance
+    per connected stretch (and per ENTRANCE_BAND of depth) becomes a pair of
+    graph nodes, and the nodes of one cluster are joined by their in-cluster
+    step counts. Each node keeps its distance field over its cluster, so a
+    query reads the cost from its start and goal to their cluster's nodes
+    straight from those fields, searches the small graph with A* and walks
+    the same fields for the cell-level path.
+
+    Paths are kept in an LRU cache of NAV_PATH_CACHE entries. A block edit
+    marks its cluster dirty; the next query rebuilds that cluster's borders
+    and links and drops the cached paths through it.
+    """
+
+    def __init__(self, voxel_grid, seaweeds=()):
+        self.open = voxel_grid == 0
+        self.size = config.NAV_CLUSTER_SIZE
+        for sw in seaweeds:
+            x, z = int(sw.x), int(sw.z)
+            if 0 <= x < self.open.shape[0] and 0 <= z < self.open.shape[2]:
+                y0 = max(0, int(sw.base_y))
+                y1 = int(math.ceil(sw.base_y + sw.seg_len * 2.0))
+                self.open[x, y0:y1, z] = False
+        self.nx = -(-self.open.shape[0] // self.size)
+        self.nz = -(-self.open.shape[2] // self.size)
+        self.borders = {}  # (cx, cz, axis) -> [(cell, cell across)], axis 0 = +x, 1 = +z
+        self.nodes = {}  # cluster -> its nodes
+        self.graph = {}  # node -> [(node, cost)]
+        self.fields = {}  # node -> distance field over its cluster
+        self.cache = OrderedDict()  # (start cell, goal cell) -> (path, clusters)
+        self.dirty = set()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        for cx in range(self.nx):
+            for cz in range(self.nz):
+                if cx + 1 < self.nx:
+                    self.borders[(cx, cz, 0)] = self._entrances((cx, cz, 0))
+                if cz + 1 < self.nz:
+                    self.borders[(cx, cz, 1)] = self._entrances((cx, cz, 1))
+        for cx in range(self.nx):
+            for cz in range(self.nz):
+                self._link((cx, cz))
+
+    def block_changed(self, x, y, z, solid):
+        """Called after a block edit at cell (x, y, z)."""
+        if not (0 <= x < self.open.shape[0] and 0 <= y < self.open.shape[1]
+                and 0 <= z < self.open.shape[2]):
+            return
+        self.open[x, y, z] = not solid
+        self.dirty.add((x // self.size, z // self.size))
+
+    def find_path(self, start, goal):
+        """
+        Water path between two world positions.
+
+        Returns:
+            list of (x, y, z) waypoints at cell centres from start to goal,
+            keeping only the cells where the direction changes, or None when
+            either end is buried or the goal cannot be reached
+        """
+        if self.dirty:
+            self._refresh()
+        a = self._snap(start)
+        b = self._snap(goal)
+        if a is None or b is None:
+            return None
+        key = (a, b)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        cells = self._search(a, b)
+        path = None
+        clusters = set()
+        if cells is not None:
+            clusters = {self._cluster(c) for c in cells}
+            path = [(x + 0.5, y + 0.5, z + 0.5) for x, y, z in _corners(cells)]
+        self.cache[key] = (path, clusters)
+        if len(self.cache) > config.NAV_PATH_CACHE:
+            self.cache.popitem(last=False)
+        return path
+
+    def node_count(self):
+        return len(self.graph)
+
+    def _refresh(self):
+        touched = set()
+        for c in self.dirty:
+            touched.add(c)
+            for n, changed in self._build_borders(c):
+                if changed:
+                    touched.add(n)
+        for c in touched:
+            self._link(c)
+        self.rebuilds += len(touched)
+        # Failed queries may succeed now; kept paths must avoid the edits
+        stale = [k for k, (path, clusters) in self.cache.items()
+                 if path is None or not clusters.isdisjoint(touched)]
+        for k in stale:
+            del self.cache[k]
+        self.dirty.clear()
+
+    def _cluster(self, cell):
+        return (cell[0] // self.size, cell[2] // self.size)
+
+    def _bounds(self, c):
+        s = self.size
+        return (c[0] * s, min((c[0] + 1) * s, self.open.shape[0]),
+                c[1] * s, min((c[1] + 1) * s, self.open.shape[2]))
+
+    def _build_borders(self, c):
+        """Recompute the entrances on the four sides of cluster c. Returns
+        (neighbour, entrances changed) per existing neighbour."""
+        cx, cz = c
+        out = []
+        for key, other in (((cx, cz, 0), (cx + 1, cz)), ((cx, cz, 1), (cx, cz + 1)),
+                           ((cx - 1, cz, 0), (cx - 1, cz)), ((cx, cz - 1, 1), (cx, cz - 1))):
+            if not (0 <= other[0] < self.nx and 0 <= other[1] < self.nz):
+                continue
+            entrances = self._entrances(key)
+            out.append((other, entrances != self.borders.get(key)))
+            self.borders[key] = entrances
+        return out
+
+    def _entrances(self, key):
+        cx, cz, axis = key
+        x0, x1, z0, z1 = self._bounds((cx, cz))
+        # Indexed (position along the border, y)
+        if axis == 0:
+            face = (self.open[x1 - 1, :, z0:z1] & self.open[x1, :, z0:z1]).T
+        else:
+            face = self.open[x0:x1, :, z1 - 1] & self.open[x0:x1, :, z1]
+        entrances = []
+        for cells in _components(face):
+            bands = {}
+            for u, y in cells:
+                bands.setdefault(y // ENTRANCE_BAND, []).append((u, y))
+            for band in bands.values():
+                mu = sum(u for u, _ in band) / len(band)
+                my = sum(y for _, y in band) / len(band)
+                u, y = min(band, key=lambda p: (p[0] - mu) ** 2 + (p[1] - my) ** 2)
+                if axis == 0:
+                    entrances.append(((x1 - 1, y, z0 + u), (x1, y, z0 + u)))
+                else:
+                    entrances.append(((x0 + u, y, z1 - 1), (x0 + u, y, z1)))
+        return entrances
+
+    def _link(self, c):
+        """Find the nodes of cluster c and join them by in-cluster distance."""
+        cx, cz = c
+        across = {}
+        for key, side in (((cx, cz, 0), 0), ((cx, cz, 1), 0), ((cx - 1, cz, 0), 1), ((cx, cz - 1, 1), 1)):
+            for pair in self.borders.get(key, ()):
+                across.setdefault(pair[side], []).append(pair[1 - side])
+        for node in self.nodes.get(c, ()):
+            self.graph.pop(node, None)
+            self.fields.pop(node, None)
+        nodes = list(across)
+        x0, x1, z0, z1 = self._bounds(c)
+        local = [(x - x0, y, z - z0) for x, y, z in nodes]
+        fields = distance_fields(self.open[x0:x1, :, z0:z1], local) if nodes else ()
+        for i, node in enumerate(nodes):
+            field = fields[i]
+            self.fields[node] = field
+            edges = [(other, 1) for other in across[node]]
+            for j, (lx, ly, lz) in enumerate(local):
+                d = int(field[lx, ly, lz])
+                if j != i and d > 0:
+                    edges.append((nodes[j], d))
+            self.graph[node] = edges
+        self.nodes[c] = nodes
+
+    def _snap(self, pos):
+        """Open cell holding pos, or the nearest open one in its column."""
+        sx, sy, sz = self.open.shape
+        x = min(max(int(math.floor(pos[0])), 0), sx - 1)
+        y = min(max(int(math.floor(pos[1])), 0), sy - 1)
+        z = min(max(int(math.floor(pos[2])), 0), sz - 1)
+        column = self.open[x, :, z]
+        if column[y]:
+            return (x, y, z)
+        free = np.flatnonzero(column)
+        if not len(free):
+            return None
+        return (x, int(free[np.argmin(np.abs(free - y))]), z)
+
+    def _search(self, a, b):
+        ca, cb = self._cluster(a), self._cluster(b)
+        if ca == cb:
+            x0, x1, z0, z1 = self._bounds(ca)
+            field = distance_fields(self.open[x0:x1, :, z0:z1], [(b[0] - x0, b[1], b[2] - z0)])[0]
+            if field[a[0] - x0, a[1], a[2] - z0] >= 0:
+                return self._walk(a, field, ca)
+        # The node fields already hold every cell's distance to each node,
+        # so the ends join the graph without a search of their own
+        from_start = self._costs(ca, a)
+        to_goal = self._costs(cb, b)
+        route = self._astar(from_start, to_goal, b)
+        if route is None:
+            return None
+        cells = self._walk(a, self.fields[route[0]], ca)
+        for prev, node in zip(route, route[1:]):
+            if self._cluster(prev) == self._cluster(node):
+                cells.extend(self._walk(prev, self.fields[node], self._cluster(node))[1:])
+            else:
+                cells.append(node)
+        cells.extend(self._walk(b, self.fields[route[-1]], cb)[-2::-1])
+        return cells
+
+    def _costs(self, c, cell):
+        x0, _, z0, _ = self._bounds(c)
+        local = (cell[0] - x0, cell[1], cell[2] - z0)
+        costs = {}
+        for node in self.nodes.get(c, ()):
+            d = int(self.fields[node][local])
+            if d >= 0:
+                costs[node] = d
+        return costs
+
+    def _astar(self, from_start, to_goal, goal):
+        gx, gy, gz = goal
+
+        def h(n):
+            return abs(n[0] - gx) + abs(n[1] - gy) + abs(n[2] - gz)
+
+        graph = self.graph
+        best = dict(from_start)
+        came = {}
+        heap = [(d + h(n), d, n) for n, d in from_start.items()]
+        heapq.heapify(heap)
+        done = set()
+        while heap:
+            _, g, node = heapq.heappop(heap)
+            if node == _GOAL:
+                break
+            if node in done:
+                continue
+            done.add(node)
+            edges = graph[node]
+            if node in to_goal:
+                edges = edges + [(_GOAL, to_goal[node])]
+            for nxt, cost in edges:
+                ng = g + cost
+                if ng < best.get(nxt, math.inf):
+                    best[nxt] = ng
+                    came[nxt] = node
+                    heapq.heappush(heap, (ng + (0 if nxt == _GOAL else h(nxt)), ng, nxt))
+        else:
+            return None
+        route = [came[_GOAL]]
+        while route[-1] in came:
+            route.append(came[route[-1]])
+        return route[::-1]
+
+    def _walk(self, cell, field, c):
+        """Cells from cell down the distance field to its source."""
+        x0, x1, z0, z1 = self._bounds(c)
+        sy = self.open.shape[1]
+        x, y, z = cell
+        cells = [cell]
+        d = int(field[x - x0, y, z - z0])
+        while d > 0:
+            for dx, dy, dz in _STEPS:
+                nx, ny, nz = x + dx, y + dy, z + dz
+                if (x0 <= nx < x1 and 0 <= ny < sy and z0 <= nz < z1
+                        and field[nx - x0, ny, nz - z0] == d - 1):
+                    x, y, z = nx, ny, nz
+                    break
+            d -= 1
+            cells.append((x, y, z))
+        return cells
+
+
+def _components(face):
+    """4-connected groups of True cells in a 2D array, as lists of (u, v)."""
+    seen = np.zeros_like(face)
+    groups = []
+    for u, v in zip(*np.nonzero(face)):
+        if seen[u, v]:
+            continue
+        seen[u, v] = True
+        stack = [(int(u), int(v))]
+        group = []
+        while stack:
+            p, q = stack.pop()
+            group.append((p, q))
+            for np_, nq in ((p + 1, q), (p - 1, q), (p, q + 1), (p, q - 1)):
+                if 0 <= np_ < face.shape[0] and 0 <= nq < face.shape[1] and face[np_, nq] and not seen[np_, nq]:
+                    seen[np_, nq] = True
+                    stack.append((np_, nq))
+        groups.append(group)
+    return groups
+
+
+def _corners(cells):
+    """Drop cells in the middle of straight runs."""
+    if len(cells) < 3:
+        return list(cells)
+    out = [cells[0]]
+    for prev, cur, nxt in zip(cells, cells[1:], cells[2:]):
+        if (cur[0] - prev[0], cur[1] - prev[1], cur[2] - prev[2]) != (nxt[0] - cur[0], nxt[1] - cur[1], nxt[2] - cur[2]):
+            out.append(cur)
+    out.append(cells[-1])
+    return out
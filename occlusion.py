@@ -0,0 +1,151 @@
+import math
+import numpy as np
+import config
+
+TWO_PI = 2.0 * math.pi
+OCCLUDER_WINDOWS = (1, 2)
+
+
+class HorizonBuffer:
+    """
+    Highest elevation slope (rise over XZ distance) seen so far from an eye,
+    binned by azimuth. Occluders only raise bins they cover completely and
+    targets must sit under every bin they touch, so the test is conservative.
+    """
+
+    def __init__(self, bins):
+        self.bins = bins
+        self.width = TWO_PI / bins
+        self.slope = np.full(bins, -np.inf)
+
+    def add_occluders(self, bin_idx, slopes):
+        np.maximum.at(self.slope, bin_idx, slopes)
+
+    def hides(self, lo, hi, slope):
+        first = int(math.floor(lo / self.width))
+        last = int(math.floor(hi / self.width))
+        idx = np.arange(first, last + 1) % self.bins
+        return bool(np.all(self.slope[idx] > slope))
+
+
+def solid_heights(voxel_grid):
+    """Per-column height of the run of blocks starting at the floor."""
+    empty = voxel_grid == 0
+    return np.where(empty.any(axis=1), empty.argmax(axis=1), voxel_grid.shape[1]).astype(np.float32)
+
+
+def _window_heights(solid, k):
+    """Minimum solid height over every k x k window of columns (stride 1),
+    indexed by the window's low corner."""
+    out = solid
+    for axis in (0, 1):
+        n = out.shape[axis] - k + 1
+        acc = np.take(out, range(0, n), axis=axis)
+        for i in range(1, k):
+            acc = np.minimum(acc, np.take(out, range(i, i + n), axis=axis))
+        out = acc
+    return out
+
+
+def column_windows(solid):
+    """
+    Occluder candidates: every k x k window of columns at stride 1 for k in
+    OCCLUDER_WINDOWS, as (center_x, center_z, half_size, height) arrays.
+    Windows overlap, so the edge between two neighbouring columns always
+    falls well inside some window.
+    """
+    parts = []
+    for k in OCCLUDER_WINDOWS:
+        h = _window_heights(solid, k)
+        xs, zs = np.nonzero(h > 0)
+        parts.append((xs + k * 0.5, zs + k * 0.5, np.full(len(xs), k * 0.5), h[xs, zs]))
+    return tuple(np.concatenate(a).astype(np.float64) for a in zip(*parts))
+
+
+def _column_occluders(windows, eye, margin, reach, width):
+    """
+    Horizon contributions of the column windows within reach, sorted by far
+    distance: (far, start, bins, slopes), where occluder i owns
+    bins[start[i]:start[i + 1]]. A window blocks every ray through its
+    inscribed circle below its lowest column.
+    """
+    ex, ey, ez = eye
+    cx, cz, r, height = windows
+    dx = cx - ex
+    dz = cz - ez
+    d = np.hypot(dx, dz)
+    near = d - r - margin
+    keep = (near > 0.5) & (near < reach)
+    dx, dz, d, r, near, height = dx[keep], dz[keep], d[keep], r[keep], near[keep], height[keep]
+    far = d + r + margin
+    # The eye may drift by margin, which turns every direction by up to pad
+    half = np.arcsin(r / d) - np.arctan2(margin, near)
+    center = np.arctan2(dz, dx)
+    first = np.ceil((center - half) / width).astype(np.int64)
+    last = np.floor((center + half) / width).astype(np.int64) - 1
+    n = np.maximum(last - first + 1, 0)
+    rise = height - ey
+    slope = np.where(rise > 0, rise / far, rise / near)
+    order = np.argsort(far, kind="stable")
+    far, first, n, slope = far[order], first[order], n[order], slope[order]
+    start = np.zeros(len(n) + 1, dtype=np.int64)
+    np.cumsum(n, out=start[1:])
+    owner = np.repeat(np.arange(len(n)), n)
+    bins = first[owner] + (np.arange(start[-1]) - start[owner])
+    return far, start, bins % int(round(TWO_PI / width)), slope[owner]
+
+
+def _azimuth_span(chunk, ex, ez):
+    """Angular interval (lo, hi) with lo < hi covered by the chunk's footprint,
+    or None when the eye is inside it."""
+    if chunk.x0 <= ex <= chunk.x1 and chunk.z0 <= ez <= chunk.z1:
+        return None
+    center = math.atan2((chunk.z0 + chunk.z1) * 0.5 - ez, (chunk.x0 + chunk.x1) * 0.5 - ex)
+    offsets = []
+    for cx in (chunk.x0, chunk.x1):
+        for cz in (chunk.z0, chunk.z1):
+            a = math.atan2(cz - ez, cx - ex) - center
+            offsets.append((a + math.pi) % TWO_PI - math.pi)
+    return center + min(offsets), center + max(offsets)
+
+
+def hidden_chunks(chunks, windows, eye, margin=0.0, reach=np.inf):
+    """
+    Chunks hidden from eye behind nearer terrain columns (windows from
+    column_windows). Only chunks starting within reach are tested. Returns
+    {key: ceiling}, where ceiling is the height below which everything in the
+    chunk is hidden. Chunks are tested nearest first, and a column only
+    enters the horizon once it is entirely closer than the chunk being tested.
+    margin grows the test as if the eye could move that far in any direction,
+    so the result stays valid while a cached visible set is reused.
+    """
+    ex, ey, ez = eye
+    ey += margin
+    buf = HorizonBuffer(config.HORIZON_BINS)
+    occ_far, occ_start, occ_bins, occ_slope = _column_occluders(windows, (ex, ey, ez), margin, reach, buf.width)
+    targets = []
+    for key, chunk in chunks.items():
+        near, far = chunk.distance_range(ex, ez)
+        near -= margin
+        far += margin
+        if near <= 0.5 or near > reach:
+            continue
+        span = _azimuth_span(chunk, ex, ez)
+        if span is not None:
+            targets.append((near, far, key, span))
+    targets.sort()
+    added = 0
+    hidden = {}
+    for near, far, key, (lo, hi) in targets:
+        upto = int(np.searchsorted(occ_far, near, side="right"))
+        if upto > added:
+            a, b = occ_start[added], occ_start[upto]
+            buf.add_occluders(occ_bins[a:b], occ_slope[a:b])
+            added = upto
+        top = chunks[key].top_height
+        pad = math.atan2(margin, near)
+        rise = top - ey
+        slope = rise / near if rise > 0 else rise / far
+        if buf.hides(lo - pad, hi + pad, slope):
+            hidden[key] = top
+    return hidden
@@ -0,0 +1,256 @@
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+import numpy as np
+import random
+import time
+import config
+from batching import draw_quads, sphere_quads
+
+
+class BubblePool:
+    """
+    Fixed-capacity bubble particle pool stored as NumPy arrays.
+    Dead slots are recycled by the next spawn, so no per-frame allocation.
+    """
+
+    COLOR = (0.9, 0.95, 1.0)
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.pos = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.speed = np.zeros(self.capacity, dtype=np.float32)
+        self.radius = np.zeros(self.capacity, dtype=np.float32)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self._spawn_accum = 0.0
+        # Seeded from `random` so a seeded run reproduces the same bubbles
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def clear(self):
+        self.alive[:] = False
+        self._spawn_accum = 0.0
+
+    def spawn(self, xs, ys, zs):
+        """Place bubbles at the given coordinates in free slots; extras beyond capacity are dropped."""
+        free = np.flatnonzero(~self.alive)[:len(xs)]
+        n = len(free)
+        if n == 0:
+            return 0
+        self.pos[free, 0] = xs[:n]
+        self.pos[free, 1] = ys[:n]
+        self.pos[free, 2] = zs[:n]
+        self.speed[free] = self.rng.uniform(0.5, 1.2, n)
+        self.radius[free] = self.rng.uniform(0.05, 0.12, n)
+        self.alive[free] = True
+        return n
+
+    def emit(self, dt, top_grid=None):
+        """Spawn BUBBLE_SPAWN_RATE bubbles per second at random map columns,
+        just above the highest solid block when top_grid is given."""
+        self._spawn_accum += config.BUBBLE_SPAWN_RATE * dt
+        n = int(self._spawn_accum)
+        if n <= 0:
+            return 0
+        self._spawn_accum -= n
+        cols = self.rng.integers(0, config.MAP_SIZE, size=(n, 2))
+        xs = cols[:, 0] + 0.5
+        zs = cols[:, 1] + 0.5
+        if top_grid is not None and config.BUBBLE_SPAWN_ON_SEABED:
+            ys = top_grid[cols[:, 0], cols[:, 1]] + 0.2
+        else:
+            ys = np.full(n, 0.2)
+        return self.spawn(xs, ys, zs)
+
+    def update(self, dt, ceiling, currents=None, t=None):
+        """Advance all live bubbles and recycle the ones that reached the ceiling."""
+        self.pos[:, 1] += self.speed * dt * self.alive
+        if currents is not None:
+            idx = np.flatnonzero(self.alive)
+            if len(idx):
+                self.pos[idx] += currents.sample(self.pos[idx], t) * (config.CURRENT_BUBBLE_GAIN * dt)
+        self.alive &= self.pos[:, 1] < ceiling
+
+    def snapshot(self):
+        """Copies of the live bubbles' positions and radii."""
+        idx = np.flatnonzero(self.alive)
+        return self.pos[idx], self.radius[idx]
+
+    def draw(self, eye, snap=None):
+        """Near bubbles are low-poly spheres (camera-facing hexagons in one
+        batch with USE_BATCHED_GEOMETRY), the rest are batched points
+        grouped by their projected pixel size. Draws snap when given."""
+        pos, radius = self.snapshot() if snap is None else snap
+        if len(pos) == 0:
+            return
+        dist = np.sqrt(((pos - np.asarray(eye, dtype=np.float32)) ** 2).sum(axis=1))
+        near = dist < config.BUBBLE_SPHERE_DIST
+        if config.USE_BATCHED_GEOMETRY:
+            draw_quads(sphere_quads(pos[near], radius[near], eye), self.COLOR)
+        else:
+            glColor3f(*self.COLOR)
+            for (x, y, z), r in zip(pos[near].tolist(), radius[near].tolist()):
+                glPushMatrix()
+                glTranslatef(x, y, z)
+                glutSolidSphere(r, 6, 6)
+                glPopMatrix()
+        far = ~near
+        if not far.any():
+            return
+        sizes = np.clip(np.rint(radius[far] * config.BUBBLE_POINT_SCALE / np.maximum(dist[far], 1e-3)),
+                        1, 8).astype(np.int32)
+        far_pos = pos[far]
+        for size in np.unique(sizes).tolist():
+            glPointSize(float(size))
+            glBegin(GL_POINTS)
+            for x, y, z in far_pos[sizes == size].tolist():
+                glVertex3f(x, y, z)
+            glEnd()
+        glPointSize(1.0)
+
+
+class MarineSnow:
+    """
+    Ambient drifting particles kept in a wrap-around box centred on the diver,
+    plus sediment puffs kicked up when the diver moves close to the seabed.
+    Everything is drawn in one GL_POINTS batch.
+    """
+
+    SNOW_COLOR = (0.85, 0.88, 0.85)
+    SEDIMENT_COLOR = (0.62, 0.55, 0.4)
+
+    def __init__(self, density=None):
+        self._update_ms = 0.0
+        self.draw_ms = 0.0  # cost of the last draw, written by the render thread
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        self.density = -1
+        self.active = 0
+        self.sediment = SedimentPool(config.SEDIMENT_MAX, self.rng)
+        self._last_eye = None
+        self._allocate(config.MARINE_SNOW_DENSITY if density is None else density)
+
+    def _allocate(self, density):
+        self.density = int(density)
+        self.active = self.density
+        half = config.MARINE_SNOW_RANGE
+        self.pos = self.rng.uniform(-half, half, (self.density, 3)).astype(np.float32)
+        self.sink = self.rng.uniform(0.03, 0.12, self.density).astype(np.float32)
+        self.phase = self.rng.uniform(0.0, 6.28318, self.density).astype(np.float32)
+        self._centered = False
+
+    def update(self, dt, t, eye, top_grid=None):
+        start = time.perf_counter()
+        if self.density != config.MARINE_SNOW_DENSITY:
+            self._allocate(config.MARINE_SNOW_DENSITY)
+        # The drawn share is simulation state: adapted here, from the cost
+        # the last draw reported, so drawing never writes it
+        self._adapt_budget(self._update_ms + self.draw_ms)
+        eye = np.asarray(eye, dtype=np.float32)
+        if not self._centered:
+            self.pos += eye
+            self._centered = True
+        n = self.active
+        if n:
+            p = self.pos[:n]
+            ph = self.phase[:n]
+            p[:, 0] += np.sin(t * 0.3 + ph) * (0.05 * dt)
+            p[:, 1] -= self.sink[:n] * dt
+            p[:, 2] += np.cos(t * 0.25 + ph) * (0.05 * dt)
+            # Wrap into the box around the eye so the layer follows the diver
+            half = config.MARINE_SNOW_RANGE
+            p -= eye
+            p += half
+            np.mod(p, 2.0 * half, out=p)
+            p -= half
+            p += eye
+        self._stir_sediment(dt, eye, top_grid)
+        self.sediment.update(dt)
+        self._last_eye = eye
+        self._update_ms = (time.perf_counter() - start) * 1000.0
+
+    def _stir_sediment(self, dt, eye, top_grid):
+        if top_grid is None or self._last_eye is None or dt <= 0.0:
+            return
+        moved = float(np.linalg.norm(eye - self._last_eye))
+        if moved < 1e-4:
+            return
+        x = min(config.MAP_SIZE - 1, max(0, int(eye[0])))
+        z = min(config.MAP_SIZE - 1, max(0, int(eye[2])))
+        floor = float(top_grid[x, z])
+        if eye[1] - floor > config.SEDIMENT_STIR_HEIGHT:
+            return
+        n = int(config.SEDIMENT_PER_BLOCK * moved)
+        if n:
+            self.sediment.spawn(n, eye[0], floor, eye[2])
+
+    def snapshot(self):
+        """Copies of the drawn snow and live sediment positions."""
+        return self.pos[:self.active].copy(), self.sediment.live_positions()
+
+    def draw(self, snap=None):
+        """Draw snap (the current state when None). Only the time it took is
+        written back, to draw_ms, for the next update to budget with."""
+        start = time.perf_counter()
+        snow, sediment = self.snapshot() if snap is None else snap
+        glPointSize(config.MARINE_SNOW_POINT_SIZE)
+        glBegin(GL_POINTS)
+        glColor3f(*self.SNOW_COLOR)
+        for x, y, z in snow.tolist():
+            glVertex3f(x, y, z)
+        glColor3f(*self.SEDIMENT_COLOR)
+        for x, y, z in sediment.tolist():
+            glVertex3f(x, y, z)
+        glEnd()
+        glPointSize(1.0)
+        self.draw_ms = (time.perf_counter() - start) * 1000.0
+
+    def _adapt_budget(self, cost_ms):
+        # Shrink the drawn share when over budget, grow back slowly when well under
+        budget = config.MARINE_SNOW_BUDGET_MS
+        active = min(self.active, self.density)
+        if cost_ms > budget and active > 0:
+            active = int(active * 0.9)
+        elif cost_ms < budget * 0.5 and active < self.density:
+            active = min(self.density, active + max(16, self.density // 50))
+        self.active = active
+
+
+class SedimentPool:
+    """Short-lived sand particles that puff outward from the seabed and settle."""
+
+    def __init__(self, capacity, rng):
+        self.capacity = int(capacity)
+        self.rng = rng
+        self.pos = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.vel = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.life = np.zeros(self.capacity, dtype=np.float32)
+        self.floor = np.zeros(self.capacity, dtype=np.float32)
+
+    def spawn(self, n, x, floor, z):
+        free = np.flatnonzero(self.life <= 0.0)[:n]
+        n = len(free)
+        if n == 0:
+            return 0
+        self.pos[free] = (x, floor + 0.05, z)
+        self.pos[free, 0] += self.rng.uniform(-0.5, 0.5, n)
+        self.pos[free, 2] += self.rng.uniform(-0.5, 0.5, n)
+        self.vel[free, 0] = self.rng.uniform(-0.4, 0.4, n)
+        self.vel[free, 1] = self.rng.uniform(0.2, 0.7, n)
+        self.vel[free, 2] = self.rng.uniform(-0.4, 0.4, n)
+        self.life[free] = self.rng.uniform(1.5, 3.0, n)
+        self.floor[free] = floor
+        return n
+
+    def update(self, dt):
+        live = self.life > 0.0
+        if not live.any():
+            return
+        self.vel[live] *= max(0.0, 1.0 - 1.5 * dt)
+        self.vel[live, 1] -= 0.25 * dt
+        self.pos[live] += self.vel[live] * dt
+        np.maximum(self.pos[:, 1], self.floor, out=self.pos[:, 1])
+        self.life -= dt
+
+    def live_positions(self):
+        return self.pos[self.life > 0.0]
@@ -0,0 +1,109 @@
+import math
+import time
+import numpy as np
+import config
+from fish_tiers import FULL
+from sonar import raycast_voxels
+
+
+def view_basis(yaw, pitch):
+    """Forward, right and up unit vectors for a camera yaw/pitch in degrees."""
+    ry = math.radians(yaw)
+    rp = math.radians(pitch)
+    forward = np.array([math.cos(ry) * math.cos(rp), math.sin(rp), math.sin(ry) * math.cos(rp)])
+    right = np.cross(forward, (0.0, 1.0, 0.0))
+    right /= max(1e-9, np.linalg.norm(right))
+    up = np.cross(right, forward)
+    return forward, right, up
+
+
+def project_points(points, eye, yaw, pitch, fov_y=45.0, aspect=None, near=0.1, far=None):
+    """
+    Project world points into the view of a camera.
+
+    Returns:
+        ndc: (N, 2) normalised screen coordinates, [-1, 1] inside the frame
+        depth: (N,) distance along the view direction
+        inside: (N,) bool mask of points inside the view frustum
+    """
+    aspect = config.WINDOW_WIDTH / config.WINDOW_HEIGHT if aspect is None else aspect
+    far = config.PHOTO_MAX_DISTANCE if far is None else far
+    forward, right, up = view_basis(yaw, pitch)
+    rel = np.asarray(points, dtype=np.float64).reshape(-1, 3) - np.asarray(eye, dtype=np.float64)
+    depth = rel @ forward
+    tan_y = math.tan(math.radians(fov_y) * 0.5)
+    tan_x = tan_y * aspect
+    safe = np.maximum(depth, 1e-6)
+    ndc = np.stack([(rel @ right) / (safe * tan_x), (rel @ up) / (safe * tan_y)], axis=1)
+    inside = (depth > near) & (depth < far) & (np.abs(ndc) <= 1.0).all(axis=1)
+    return ndc, depth, inside
+
+
+class PhotoLog:
+    """
+    Photo mode: works out which fish are in the camera-model frame, how big
+    and how centred they are, and keeps a log of scored photos.
+    """
+
+    def __init__(self):
+        self.photos = []
+        self.last_snap_time = 0.0
+
+    def total_score(self):
+        return sum(p["score"] for p in self.photos)
+
+    def snap(self, world, eye, yaw, pitch, fov_y=45.0):
+        """Take a photo from eye/yaw/pitch and append it to the log."""
+        positions = []
+        sizes = []
+        species = []
+        for school in world.fish_schools:
+            # Shoal and statistical fish are not drawn one by one, so their
+            # draw_pos is stale; only full-tier fish can be in the picture
+            drawn = np.flatnonzero(school.tier == FULL)
+            if len(drawn) == 0:
+                continue
+            positions.append(school.draw_pos[drawn])
+            sizes.append(school.size[drawn])
+            species.append(np.full(len(drawn), school.species, dtype=object))
+        photo = {"time": time.time(), "species": {}, "fish": 0, "score": 0.0, "best": None}
+        if positions:
+            positions = np.concatenate(positions)
+            sizes = np.concatenate(sizes)
+            species = np.concatenate(species)
+            ndc, depth, inside = project_points(positions, eye, yaw, pitch, fov_y)
+            idx = np.flatnonzero(inside)
+            if len(idx):
+                idx = idx[self._unoccluded(world, eye, positions[idx], depth[idx])]
+            if len(idx):
+                tan_y = math.tan(math.radians(fov_y) * 0.5)
+                # Fish bodies are about 3.6 * size long; frame fraction of that length
+                frame = (sizes[idx] * 3.6) / (2.0 * depth[idx] * tan_y)
+                centred = 1.0 - np.minimum(1.0, np.sqrt((ndc[idx] ** 2).sum(axis=1)) / math.sqrt(2.0))
+                fill = np.minimum(frame, config.PHOTO_IDEAL_FILL) / config.PHOTO_IDEAL_FILL
+                subject = 100.0 * fill * (0.5 + 0.5 * centred)
+                names, counts = np.unique(species[idx], return_counts=True)
+                photo["species"] = dict(zip(names.tolist(), counts.tolist()))
+                photo["fish"] = int(len(idx))
+                photo["score"] = float(subject.sum() + config.PHOTO_SPECIES_BONUS * (len(names) - 1))
+                best = int(np.argmax(subject))
+                photo["best"] = {"species": species[idx][best], "fill": float(frame[best]),
+                                 "centred": float(centred[best])}
+        self.photos.append(photo)
+        self.last_snap_time = photo["time"]
+        return photo
+
+    def _unoccluded(self, world, eye, targets, depth):
+        """Mask of targets with no solid voxel between the eye and them."""
+        rel = targets - np.asarray(eye, dtype=np.float64)
+        dist = np.sqrt((rel ** 2).sum(axis=1))
+        dirs = rel / np.maximum(dist, 1e-6)[:, None]
+        origins = np.broadcast_to(np.asarray(eye, dtype=np.float64), dirs.shape)
+        hit, _, _ = raycast_voxels(world.voxel_grid, origins, dirs, float(dist.max()))
+        return hit >= dist
+
+    def summary(self, photo):
+        if photo["fish"] == 0:
+            return "No fish in frame"
+        counts = ", ".join(f"{n} x{c}" for n, c in sorted(photo["species"].items()))
+        return f"{photo['fish']} fish ({counts}) score {int(photo['score'])}"
@@ -1,10 +1,12 @@
-from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
 import math
 import random
+from render_commands import CUBE, SPHERE
+from water_fog import fog_color
 
 class PinkFish:
+    SWIM_AMP = 2.0  # Side-to-side swim offset
+    BOB_AMP = 1.5  # Vertical bobbing amplitude
+
     def __init__(self, x, z, y):
         self.base_x = x
         self.base_z = z
@@ -27,162 +29,74 @@ class PinkFish:
         self.x = x
         self.y = y
         self.z = z
-        self.prev_x = x
-        self.prev_z = z
-
-    def update(self, t):
-        # Store previous position
-        self.prev_x = self.x
-        self.prev_z = self.z
-        
-        circle_x = math.cos(t * self.speed * 0.3 + self.phase) * self.wander_radius
-        circle_z = math.sin(t * self.speed * 0.3 + self.phase) * self.wander_radius
-        swim_offset_x = math.sin(t * self.speed + self.phase) * 2.0
-        swim_offset_z = math.cos(t * self.speed * 0.7 + self.phase) * 2.0
-        self.x = self.base_x + circle_x + swim_offset_x
-        self.z = self.base_z + circle_z + swim_offset_z
-        self.y = self.base_y + math.sin(t * self.vertical_speed + self.phase) * 1.5
-        
-        # Calculate direction from actual movement
-        dx = self.x - self.prev_x
-        dz = self.z - self.prev_z
-        
-        # Only update angle if fish is actually moving
-        if abs(dx) > 0.001 or abs(dz) > 0.001:
-            self.angle = math.atan2(dz, dx)
 
-    def draw(self):
+    def draw(self, out, fog=0.0):
+        """Append this fish's parts to RenderList out, blended toward the
+        water colour by fog weight fog."""
         import time
         t = time.time()
         flow_wave = math.sin(t * 2.5 + self.phase) * 8
         
+        pos = (self.x, self.y, self.z)
+        yaw = math.degrees(self.angle)
+
         # Main body (elongated and elegant)
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glColor3f(*self.body_color)
-        glScalef(self.size * 1.3, self.size * 0.7, self.size * 0.6)
-        glutSolidSphere(1.0, 14, 14)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color(self.body_color, fog),
+                  scale=(self.size * 1.3, self.size * 0.7, self.size * 0.6), yaw=yaw, detail=14)
         
         # Tail connector
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(-self.size * 1.0, 0, 0)
-        glColor3f(*self.body_color)
-        glScalef(self.size * 0.5, self.size * 0.5, self.size * 0.4)
-        glutSolidSphere(1.0, 12, 12)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color(self.body_color, fog),
+                  scale=(self.size * 0.5, self.size * 0.5, self.size * 0.4), yaw=yaw,
+                  offset=(-self.size * 1.0, 0, 0), detail=12)
         
         # Long flowing tail - upper section
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(-self.size * 1.6, self.size * 0.2, 0)
-        glRotatef(flow_wave, 0, 0, 1)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 1.8, self.size * 0.8, self.size * 0.05)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 1.8, self.size * 0.8, self.size * 0.05), yaw=yaw,
+                  offset=(-self.size * 1.6, self.size * 0.2, 0), rot=(flow_wave, 0, 0))
         
         # Long flowing tail - lower section
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(-self.size * 1.6, -self.size * 0.2, 0)
-        glRotatef(-flow_wave, 0, 0, 1)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 1.8, self.size * 0.8, self.size * 0.05)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 1.8, self.size * 0.8, self.size * 0.05), yaw=yaw,
+                  offset=(-self.size * 1.6, -self.size * 0.2, 0), rot=(-flow_wave, 0, 0))
         
         # Flowing tail end - upper ribbon
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(-self.size * 2.8, self.size * 0.4, 0)
-        glRotatef(flow_wave * 1.5, 0, 0, 1)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 1.2, self.size * 0.6, self.size * 0.03)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 1.2, self.size * 0.6, self.size * 0.03), yaw=yaw,
+                  offset=(-self.size * 2.8, self.size * 0.4, 0), rot=(flow_wave * 1.5, 0, 0))
         
         # Flowing tail end - lower ribbon
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(-self.size * 2.8, -self.size * 0.4, 0)
-        glRotatef(-flow_wave * 1.5, 0, 0, 1)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 1.2, self.size * 0.6, self.size * 0.03)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 1.2, self.size * 0.6, self.size * 0.03), yaw=yaw,
+                  offset=(-self.size * 2.8, -self.size * 0.4, 0), rot=(-flow_wave * 1.5, 0, 0))
         
         # Upper dorsal fin (large and flowing)
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.1, self.size * 0.8, 0)
-        glRotatef(flow_wave * 0.5, 1, 0, 0)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 1.0, self.size * 1.2, self.size * 0.04)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 1.0, self.size * 1.2, self.size * 0.04), yaw=yaw,
+                  offset=(self.size * 0.1, self.size * 0.8, 0), rot=(0, flow_wave * 0.5, 0))
         
         # Flowing side fins (like ribbons)
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.4, 0, self.size * 0.5)
-        glRotatef(30 + flow_wave * 0.7, 1, 0, 0)
-        glRotatef(20, 0, 1, 0)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 0.12, self.size * 1.5, self.size * 0.04)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 0.12, self.size * 1.5, self.size * 0.04), yaw=yaw,
+                  offset=(self.size * 0.4, 0, self.size * 0.5), rot=(0, 30 + flow_wave * 0.7, 20))
         
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.4, 0, -self.size * 0.5)
-        glRotatef(-30 - flow_wave * 0.7, 1, 0, 0)
-        glRotatef(-20, 0, 1, 0)
-        glColor3f(*self.accent_color)
-        glScalef(self.size * 0.12, self.size * 1.5, self.size * 0.04)
-        glutSolidCube(1.0)
-        glPopMatrix()
+        out.solid(CUBE, pos, fog_color(self.accent_color, fog),
+                  scale=(self.size * 0.12, self.size * 1.5, self.size * 0.04), yaw=yaw,
+                  offset=(self.size * 0.4, 0, -self.size * 0.5), rot=(0, -30 - flow_wave * 0.7, -20))
         
         # Eyes with sparkle
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.9, self.size * 0.3, self.size * 0.35)
-        glColor3f(0.2, 0.1, 0.3)
-        glutSolidSphere(self.size * 0.15, 10, 10)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color((0.2, 0.1, 0.3), fog),
+                  yaw=yaw, offset=(self.size * 0.9, self.size * 0.3, self.size * 0.35),
+                  size=self.size * 0.15, detail=10)
         
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.9, self.size * 0.3, -self.size * 0.35)
-        glColor3f(0.2, 0.1, 0.3)
-        glutSolidSphere(self.size * 0.15, 10, 10)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color((0.2, 0.1, 0.3), fog),
+                  yaw=yaw, offset=(self.size * 0.9, self.size * 0.3, -self.size * 0.35),
+                  size=self.size * 0.15, detail=10)
         
         # Eye highlights
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.95, self.size * 0.35, self.size * 0.35)
-        glColor3f(1.0, 1.0, 1.0)
-        glutSolidSphere(self.size * 0.06, 8, 8)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color((1.0, 1.0, 1.0), fog),
+                  yaw=yaw, offset=(self.size * 0.95, self.size * 0.35, self.size * 0.35),
+                  size=self.size * 0.06, detail=8)
         
-        glPushMatrix()
-        glTranslatef(self.x, self.y, self.z)
-        glRotatef(math.degrees(self.angle), 0, 1, 0)
-        glTranslatef(self.size * 0.95, self.size * 0.35, -self.size * 0.35)
-        glColor3f(1.0, 1.0, 1.0)
-        glutSolidSphere(self.size * 0.06, 8, 8)
-        glPopMatrix()
+        out.solid(SPHERE, pos, fog_color((1.0, 1.0, 1.0), fog),
+                  yaw=yaw, offset=(self.size * 0.95, self.size * 0.35, -self.size * 0.35),
+                  size=self.size * 0.06, detail=8)
@@ -0,0 +1,78 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+import time
+
+
+class FrameProfiler:
+    """
+    Lightweight per-frame timing and counters.
+    Section times are smoothed with an exponential moving average; counters
+    hold the value reported during the last frame.
+    """
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.sections = {}
+        self.counters = {}
+        self.frame_ms = 0.0
+        self._starts = {}
+        self._frame_start = None
+
+    def begin(self, name):
+        self._starts[name] = time.perf_counter()
+
+    def end(self, name):
+        start = self._starts.pop(name, None)
+        if start is None:
+            return
+        ms = (time.perf_counter() - start) * 1000.0
+        prev = self.sections.get(name, ms)
+        self.sections[name] = prev + (ms - prev) * self.smoothing
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def frame(self):
+        """Mark a frame boundary; updates the smoothed frame time."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            ms = (now - self._frame_start) * 1000.0
+            self.frame_ms = self.frame_ms + (ms - self.frame_ms) * self.smoothing if self.frame_ms else ms
+        self._frame_start = now
+
+    def lines(self):
+        fps = 1000.0 / self.frame_ms if self.frame_ms > 0 else 0.0
+        out = [f"frame {self.frame_ms:6.2f} ms  ({fps:5.1f} fps)"]
+        for name, ms in self.sections.items():
+            out.append(f"{name:<14s} {ms:6.2f} ms")
+        for name, value in self.counters.items():
+            out.append(f"{name:<14s} {value}")
+        return out
+
+    def draw(self, window_width, window_height):
+        """Draw the readout in the bottom-right corner."""
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, window_width, 0, window_height)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        lines = self.lines()
+        x = window_width - 260
+        y = 20 + 15 * (len(lines) - 1)
+        for line in lines:
+            glColor3f(0, 0, 0)
+            glRasterPos2f(x + 1, y - 1)
+            for char in line:
+                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
+            glColor3f(1.0, 1.0, 0.6)
+            glRasterPos2f(x, y)
+            for char in line:
+                glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
+            y -= 15
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
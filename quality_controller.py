@@ -0,0 +1,113 @@
+import config
+from water_fog import view_distance
+
+
+class AdaptiveQualityController:
+    """
+    Holds a target frame rate by stepping quality settings in config up or
+    down. Frame work time is smoothed; nothing changes while it stays within
+    QUALITY_HYSTERESIS of the target, and after each change the controller
+    waits QUALITY_ADJUST_FRAMES frames to see its effect.
+
+    Each knob moves between the value it had when the controller was switched
+    on (the best quality it will restore) and a floor, one step at a time.
+    Knobs are cut in list order (cheapest visual loss first) and restored in
+    reverse order.
+    """
+
+    # (config name, label, worst value, step toward worst, type)
+    KNOBS = [
+        ("MARINE_SNOW_DENSITY", "Marine snow", 500, -1500, int),
+        ("BUBBLE_MAX", "Bubble cap", 32, -32, int),
+        ("MINIMAP_REFRESH_FRAMES", "Minimap every", 8, 1, int),
+        ("FISH_LOD_FAR", "Fish LOD", 0.3, -0.1, float),
+        ("SEAWEED_LOD_MID", "Weed LOD mid", 0.25, -0.1, float),
+        ("SEAWEED_LOD_NEAR", "Weed LOD near", 0.1, -0.05, float),
+        ("DRAW_RADIUS", "Draw distance", 20, -5, int),
+    ]
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.enabled = False
+        self.best = {}
+        self.frame_ms = None
+        self.cooldown = 0
+        self.last_change = ""
+
+    def set_enabled(self, on):
+        """Switching on records the current settings as the quality ceiling;
+        switching off restores them."""
+        if on and not self.enabled:
+            self.capture()
+        elif not on and self.enabled:
+            for name, value in self.best.items():
+                setattr(config, name, value)
+            self.last_change = "restored"
+        self.enabled = on
+        config.AUTO_QUALITY = on
+
+    def capture(self):
+        """Take the current config values as the best quality to return to."""
+        self.best = {name: getattr(config, name) for name, *_ in self.KNOBS}
+        self.cooldown = config.QUALITY_ADJUST_FRAMES
+
+    def update(self, work_ms):
+        """Feed one frame's work time; may change one knob."""
+        if self.frame_ms is None:
+            self.frame_ms = work_ms
+        else:
+            self.frame_ms += (work_ms - self.frame_ms) * self.smoothing
+        if not self.enabled:
+            return
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        target = 1000.0 / config.QUALITY_TARGET_FPS
+        band = config.QUALITY_HYSTERESIS
+        if self.frame_ms > target * (1.0 + band):
+            changed = self._step(self.KNOBS, worse=True)
+        elif self.frame_ms < target * (1.0 - band):
+            changed = self._step(reversed(self.KNOBS), worse=False)
+        else:
+            changed = False
+        if changed:
+            self.cooldown = config.QUALITY_ADJUST_FRAMES
+
+    def _step(self, knobs, worse):
+        for name, label, worst, step, kind in knobs:
+            current = value = getattr(config, name)
+            if name == "DRAW_RADIUS":
+                # With fog on only min(DRAW_RADIUS, FOG_END) is drawn, so step
+                # the distance that is seen; a cut above it would change nothing
+                value = kind(min(value, view_distance()))
+            if worse:
+                limit = worst
+            else:
+                limit = self.best[name]
+                step = -step
+            new = value + step
+            new = min(new, limit) if step > 0 else max(new, limit)
+            if name == "DRAW_RADIUS" and config.FOG_ON and new >= config.FOG_END:
+                # Restoring past the fog limit looks the same: go straight to the best
+                new = max(new, limit)
+            # Never step away from the limit (settings already past the floor stay put)
+            if (new - value) * step <= 0:
+                continue
+            if kind is float:
+                new = round(new, 3)
+            new = kind(new)
+            if new != current:
+                setattr(config, name, new)
+                self.last_change = f"{label} {current} -> {new}"
+                return True
+        return False
+
+    def lines(self):
+        target = config.QUALITY_TARGET_FPS
+        ms = self.frame_ms or 0.0
+        out = [f"Auto quality {'ON' if self.enabled else 'OFF'}  target {target} fps, work {ms:5.1f} ms"]
+        for name, label, *_ in self.KNOBS:
+            out.append(f"{label}: {getattr(config, name)}")
+        if self.last_change:
+            out.append(f"Last: {self.last_change}")
+        return out
@@ -0,0 +1,343 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+import numpy as np
+
+# Primitive ids
+CUBE = 0  # glutSolidCube(size)
+SPHERE = 1  # glutSolidSphere(size, detail, detail)
+POINTS = 2
+LINES = 3
+LINE_LOOP = 4
+QUADS = 5
+TRIANGLES = 6
+TEXT = 7
+
+SOLIDS = (CUBE, SPHERE)
+# Vertex primitives that can share one glBegin/glEnd with their neighbours
+MERGEABLE = (POINTS, LINES, QUADS, TRIANGLES)
+
+_FIELDS = ("kind", "detail", "pos", "yaw", "offset", "rot", "scale",
+           "size", "color", "first", "count", "width")
+_ZERO3 = (0.0, 0.0, 0.0)
+_ONE3 = (1.0, 1.0, 1.0)
+
+
+class RenderList:
+    """
+    Draw calls recorded as data instead of issued to GL.
+
+    Every command is one row of typed arrays: a primitive id and, for
+    solids, the transform
+        translate(pos) rotY(yaw) translate(offset) rotZ/X/Y(rot) scale(scale)
+    with a colour. Vertex primitives (points, lines, quads, triangles)
+    are a run of `verts` offset by pos, with either the row colour or one
+    colour per vertex in `vert_colors` (None where the row colour applies).
+    Those two stay plain Python lists, since they are only ever walked one
+    by one to emit glVertex calls. Text rows point into `texts`.
+
+    Nothing here touches GL, so a list can be built and inspected (see
+    `arrays` and `counts`) without a context; `GLExecutor` submits it.
+
+    Commands are drawn in the order they are recorded: there is no depth
+    test, so that painter's order decides which overlapping surface ends
+    up on screen.
+    With ortho=(width, height) the list is a 2D overlay: vertices are x, y
+    and the executor draws it under one orthographic projection.
+    """
+
+    def __init__(self, ortho=None):
+        self.ortho = ortho
+        self.texts = []
+        self.verts = []
+        self.vert_colors = []
+        self._segments = []
+        self._rows = {name: [] for name in _FIELDS}
+        self._arrays = None
+
+    def solid(self, kind, pos, color, scale=_ONE3, yaw=0.0, offset=_ZERO3, rot=_ZERO3, size=1.0, detail=0):
+        """One cube or sphere. yaw and rot are in degrees."""
+        self._row(kind, detail, pos, yaw, offset, rot, scale, size, color, 0, 0, 1.0)
+
+    def solids(self, kind, pos, color, scale=None, size=1.0, detail=0):
+        """Many translated (and optionally scaled) solids from (n, 3) arrays."""
+        n = len(pos)
+        if not n:
+            return
+        self._flush()
+        self._segments.append({
+            "kind": np.full(n, kind, dtype=np.uint8),
+            "detail": np.full(n, detail, dtype=np.uint8),
+            "pos": np.asarray(pos, dtype=np.float32).reshape(n, 3),
+            "yaw": np.zeros(n, dtype=np.float32),
+            "offset": np.zeros((n, 3), dtype=np.float32),
+            "rot": np.zeros((n, 3), dtype=np.float32),
+            "scale": (np.ones((n, 3), dtype=np.float32) if scale is None
+                      else np.asarray(scale, dtype=np.float32).reshape(n, 3)),
+            "size": np.full(n, size, dtype=np.float32),
+            "color": np.asarray(color, dtype=np.float32).reshape(n, 3),
+            "first": np.zeros(n, dtype=np.int32),
+            "count": np.zeros(n, dtype=np.int32),
+            "width": np.ones(n, dtype=np.float32),
+        })
+        self._arrays = None
+
+    def vertices(self, kind, verts, colors, width=1.0, origin=None):
+        """
+        One vertex primitive. verts is a list of (x, y, z), or (x, y) in an
+        ortho list; colors is one (r, g, b) for all of them or one per
+        vertex. width is the point size or line width. With origin, verts
+        are relative to it, so a shared shape list can be placed without
+        copying it.
+        """
+        n = len(verts)
+        if not n:
+            return
+        first = len(self.verts)
+        self.verts.extend(verts)
+        if len(colors) == n and isinstance(colors[0], (tuple, list, np.ndarray)):
+            self.vert_colors.extend(map(tuple, colors))
+            color = _ZERO3
+        else:
+            # One colour for the row: kept on the row, None per vertex
+            self.vert_colors.extend([None] * n)
+            color = colors
+        self._row(kind, 0, origin or _ZERO3, 0.0, _ZERO3, _ZERO3, _ONE3, 1.0, color, first, n, width)
+
+    def text(self, x, y, text, color, font):
+        """Bitmap text with its raster position at (x, y)."""
+        self.texts.append((text, font))
+        self._row(TEXT, 0, (x, y, 0.0), 0.0, _ZERO3, _ZERO3, _ONE3, 1.0, color,
+                  len(self.texts) - 1, 0, 1.0)
+
+    def __len__(self):
+        return len(self.arrays()["kind"])
+
+    def arrays(self):
+        """All commands as a dict of arrays, one row per command."""
+        if self._arrays is None:
+            self._flush()
+            if self._segments:
+                arrays = {name: np.concatenate([s[name] for s in self._segments]) for name in _FIELDS}
+            else:
+                arrays = {name: np.zeros((0, 3) if name in ("pos", "offset", "rot", "scale", "color") else 0,
+                                         dtype=np.float32) for name in _FIELDS}
+            self._arrays = arrays
+        return self._arrays
+
+    def counts(self):
+        """Commands per primitive id, e.g. for tests and profiling."""
+        kinds = self.arrays()["kind"]
+        return {int(k): int(n) for k, n in zip(*np.unique(kinds, return_counts=True))}
+
+    def _row(self, kind, detail, pos, yaw, offset, rot, scale, size, color, first, count, width):
+        rows = self._rows
+        rows["kind"].append(kind)
+        rows["detail"].append(detail)
+        rows["pos"].append(pos)
+        rows["yaw"].append(yaw)
+        rows["offset"].append(offset)
+        rows["rot"].append(rot)
+        rows["scale"].append(scale)
+        rows["size"].append(size)
+        rows["color"].append(color)
+        rows["first"].append(first)
+        rows["count"].append(count)
+        rows["width"].append(width)
+        self._arrays = None
+
+    def _flush(self):
+        rows = self._rows
+        if not rows["kind"]:
+            return
+        n = len(rows["kind"])
+        self._segments.append({
+            "kind": np.array(rows["kind"], dtype=np.uint8),
+            "detail": np.array(rows["detail"], dtype=np.uint8),
+            "pos": np.array(rows["pos"], dtype=np.float32).reshape(n, 3),
+            "yaw": np.array(rows["yaw"], dtype=np.float32),
+            "offset": np.array(rows["offset"], dtype=np.float32).reshape(n, 3),
+            "rot": np.array(rows["rot"], dtype=np.float32).reshape(n, 3),
+            "scale": np.array(rows["scale"], dtype=np.float32).reshape(n, 3),
+            "size": np.array(rows["size"], dtype=np.float32),
+            "color": np.array(rows["color"], dtype=np.float32).reshape(n, 3),
+            "first": np.array(rows["first"], dtype=np.int32),
+            "count": np.array(rows["count"], dtype=np.int32),
+            "width": np.array(rows["width"], dtype=np.float32),
+        })
+        self._rows = {name: [] for name in _FIELDS}
+
+
+class GLExecutor:
+    """
+    Submits RenderLists to GL.
+
+    Commands are drawn in recording order, since regrouping them by state
+    would change which of two overlapping surfaces is painted last.
+    Consecutive vertex primitives of one kind and width share a single
+    glBegin/glEnd, and colour, point size and line width are only set when
+    they change. `calls` counts the GL calls of the last submit (the
+    profiler shows it as "gl calls"); `commands` the rows it drew.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.commands = 0
+
+    def submit(self, render_list):
+        cmds = render_list.arrays()
+        calls = 0
+        if render_list.ortho:
+            w, h = render_list.ortho
+            glMatrixMode(GL_PROJECTION)
+            glPushMatrix()
+            glLoadIdentity()
+            gluOrtho2D(0, w, 0, h)
+            glMatrixMode(GL_MODELVIEW)
+            glPushMatrix()
+            glLoadIdentity()
+            calls += 7
+        calls += self._draw(cmds, render_list, bool(render_list.ortho))
+        if render_list.ortho:
+            glPopMatrix()
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+            glMatrixMode(GL_MODELVIEW)
+            calls += 4
+        self.calls = calls
+        self.commands = len(cmds["kind"])
+
+    def _draw(self, cmds, render_list, flat):
+        kinds = cmds["kind"].tolist()
+        details = cmds["detail"].tolist()
+        pos = cmds["pos"].tolist()
+        yaw = cmds["yaw"].tolist()
+        offset = cmds["offset"].tolist()
+        rot = cmds["rot"].tolist()
+        scale = cmds["scale"].tolist()
+        size = cmds["size"].tolist()
+        color = list(map(tuple, cmds["color"].tolist()))
+        first = cmds["first"].tolist()
+        count = cmds["count"].tolist()
+        width = cmds["width"].tolist()
+        texts = render_list.texts
+        verts = render_list.verts
+        vert_colors = render_list.vert_colors
+        vertex = glVertex2f if flat else glVertex3f
+        calls = 0
+        current = None  # colour last set
+        point_size = line_width = None  # unknown until set here
+        open_kind = None  # primitive of the glBegin still open
+        n = len(kinds)
+        for i in range(n):
+            kind = kinds[i]
+            if kind in SOLIDS:
+                if open_kind is not None:
+                    glEnd()
+                    calls += 1
+                    open_kind = None
+                glPushMatrix()
+                x, y, z = pos[i]
+                glTranslatef(x, y, z)
+                calls += 2
+                if yaw[i]:
+                    glRotatef(yaw[i], 0, 1, 0)
+                    calls += 1
+                ox, oy, oz = offset[i]
+                if ox or oy or oz:
+                    glTranslatef(ox, oy, oz)
+                    calls += 1
+                rz, rx, ry = rot[i]
+                if rz:
+                    glRotatef(rz, 0, 0, 1)
+                    calls += 1
+                if rx:
+                    glRotatef(rx, 1, 0, 0)
+                    calls += 1
+                if ry:
+                    glRotatef(ry, 0, 1, 0)
+                    calls += 1
+                if color[i] != current:
+                    current = color[i]
+                    glColor3f(*current)
+                    calls += 1
+                sx, sy, sz = scale[i]
+                if sx != 1.0 or sy != 1.0 or sz != 1.0:
+                    glScalef(sx, sy, sz)
+                    calls += 1
+                if kind == CUBE:
+                    glutSolidCube(size[i])
+                else:
+                    glutSolidSphere(size[i], details[i], details[i])
+                glPopMatrix()
+                calls += 2
+            elif kind == TEXT:
+                if open_kind is not None:
+                    glEnd()
+                    calls += 1
+                    open_kind = None
+                if color[i] != current:
+                    current = color[i]
+                    glColor3f(*current)
+                    calls += 1
+                text, font = texts[first[i]]
+                glRasterPos2f(pos[i][0], pos[i][1])
+                for char in text:
+                    glutBitmapCharacter(font, ord(char))
+                calls += 1 + len(text)
+            else:
+                w = width[i]
+                if open_kind is not None and (open_kind != kind or kind not in MERGEABLE
+                                              or (kind == POINTS and w != point_size)
+                                              or (kind == LINES and w != line_width)):
+                    glEnd()
+                    calls += 1
+                    open_kind = None
+                if open_kind is None:
+                    if kind == POINTS and w != point_size:
+                        point_size = w
+                        glPointSize(w)
+                        calls += 1
+                    elif kind in (LINES, LINE_LOOP) and w != line_width:
+                        line_width = w
+                        glLineWidth(w)
+                        calls += 1
+                    glBegin(_GL_MODES[kind])
+                    calls += 1
+                    open_kind = kind
+                start = first[i]
+                end = start + count[i]
+                ox, oy, oz = pos[i]
+                if vert_colors[start] is None:
+                    if color[i] != current:
+                        current = color[i]
+                        glColor3f(*current)
+                        calls += 1
+                    if ox or oy or oz:
+                        for x, y, z in verts[start:end]:
+                            vertex(x + ox, y + oy, z + oz)
+                    else:
+                        for v in verts[start:end]:
+                            vertex(*v)
+                else:
+                    for v, c in zip(verts[start:end], vert_colors[start:end]):
+                        if c is not current and c != current:
+                            current = c
+                            glColor3f(*c)
+                            calls += 1
+                        vertex(*v)
+                calls += end - start
+        if open_kind is not None:
+            glEnd()
+            calls += 1
+        if point_size not in (None, 1.0):
+            glPointSize(1.0)
+            calls += 1
+        if line_width not in (None, 1.0):
+            glLineWidth(1.0)
+            calls += 1
+        return calls
+
+
+_GL_MODES = {POINTS: GL_POINTS, LINES: GL_LINES, LINE_LOOP: GL_LINE_LOOP,
+             QUADS: GL_QUADS, TRIANGLES: GL_TRIANGLES}
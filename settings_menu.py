@@ -1,16 +1,17 @@
-from OpenGL.GL import *
-from OpenGL.GLU import *
 from OpenGL.GLUT import *
 import config
+from hud import rect, outline
+from render_commands import QUADS
 
 class SettingsMenu:
-    def __init__(self, background=None):
+    def __init__(self, background=None, quality=None):
         self.is_open = False
         self.selected_option = 0
         self.selected_preset = 0
         self.editing_variable = None
         self.edit_value = ""
         self.background = background  # Reference to background for regeneration
+        self.quality = quality  # AdaptiveQualityController toggled from the menu
         
         # Graphics presets
         self.presets = [
@@ -18,27 +19,42 @@ class SettingsMenu:
                 "name": "Low",
                 "DRAW_RADIUS": 30,
                 "USE_VIEW_CULLING": True,
+                "MARINE_SNOW_DENSITY": 2000,
+                "FOG_START": 10.0,
+                "FOG_END": 30.0,
             },
             {
                 "name": "Medium",
                 "DRAW_RADIUS": 50,
                 "USE_VIEW_CULLING": True,
+                "MARINE_SNOW_DENSITY": 5000,
+                "FOG_START": 15.0,
+                "FOG_END": 45.0,
             },
             {
                 "name": "High",
                 "DRAW_RADIUS": 70,
                 "USE_VIEW_CULLING": True,
+                "MARINE_SNOW_DENSITY": 10000,
+                "FOG_START": 20.0,
+                "FOG_END": 65.0,
             },
             {
                 "name": "Ultra",
                 "DRAW_RADIUS": 100,
                 "USE_VIEW_CULLING": False,
+                "MARINE_SNOW_DENSITY": 20000,
+                "FOG_START": 30.0,
+                "FOG_END": 95.0,
             }
         ]
         
         # Graphics variables that can be adjusted
         self.adjustable_vars = [
             ("DRAW_RADIUS", "Draw Distance", 10, 150, int),
+            ("MARINE_SNOW_DENSITY", "Marine Snow", 0, 50000, int),
+            ("FOG_END", "Water Clarity", 10, 150, float),
+            ("TARGET_FPS", "FPS Cap (0 = off)", 0, 240, int),
         ]
     
     def toggle(self):
@@ -74,7 +90,7 @@ class SettingsMenu:
                 self.selected_option = max(0, self.selected_option - 1)
                 return True
             elif key == b's' or key == b'S':
-                self.selected_option = min(len(self.adjustable_vars) + len(self.presets) + 1, self.selected_option + 1)
+                self.selected_option = min(self._close_index(), self.selected_option + 1)
                 return True
             elif key == b'\r' or key == b'\n':  # Enter to select
                 self._handle_select()
@@ -89,8 +105,6 @@ class SettingsMenu:
     
     def _handle_select(self):
         """Handle menu option selection."""
-        total_options = len(self.presets) + len(self.adjustable_vars) + 1
-        
         if self.selected_option < len(self.presets):
             # Select preset
             self._apply_preset(self.selected_option)
@@ -101,6 +115,8 @@ class SettingsMenu:
             current_value = getattr(config, var_name, 0)
             self.editing_variable = var_name
             self.edit_value = str(current_value)
+        elif self.selected_option == self._auto_quality_index() and self.quality is not None:
+            self.quality.set_enabled(not self.quality.enabled)
         # Last option is "Close" which is handled by ESC
     
     def _apply_preset(self, preset_idx):
@@ -110,6 +126,7 @@ class SettingsMenu:
             if key != "name" and hasattr(config, key):
                 setattr(config, key, value)
         self.selected_preset = preset_idx
+        self._recapture_quality()
         print(f"Applied {preset['name']} graphics preset")
     
     def _apply_edit(self):
@@ -126,6 +143,7 @@ class SettingsMenu:
                 new_value = var_type(self.edit_value)
                 new_value = max(min_val, min(max_val, new_value))
                 setattr(config, var_name, new_value)
+                self._recapture_quality()
                 print(f"Set {var_name} to {new_value}")
             except ValueError:
                 print(f"Invalid value for {var_name}")
@@ -133,29 +151,25 @@ class SettingsMenu:
         self.editing_variable = None
         self.edit_value = ""
     
-    def draw(self):
-        """Draw the settings menu."""
+    def _auto_quality_index(self):
+        return len(self.presets) + len(self.adjustable_vars)
+
+    def _close_index(self):
+        return self._auto_quality_index() + 1
+
+    def _recapture_quality(self):
+        # Settings picked by hand become the new ceiling for the controller
+        if self.quality is not None and self.quality.enabled:
+            self.quality.capture()
+
+    def draw(self, hud):
+        """Record the settings menu into the frame's HUD layer."""
         if not self.is_open:
             return
         
-        # Switch to 2D rendering
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        gluOrtho2D(0, config.WINDOW_WIDTH, 0, config.WINDOW_HEIGHT)
-        
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
-        
         # Draw background
-        glColor3f(0.0, 0.0, 0.0)  # Black background
-        glBegin(GL_QUADS)
-        glVertex2f(0, 0)
-        glVertex2f(config.WINDOW_WIDTH, 0)
-        glVertex2f(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
-        glVertex2f(0, config.WINDOW_HEIGHT)
-        glEnd()
+        w, h = config.WINDOW_WIDTH, config.WINDOW_HEIGHT
+        hud.shape(QUADS, hud.static(("menu back", w, h), lambda: rect(0, 0, w, h)), (0.0, 0.0, 0.0))
         
         # Draw menu box
         menu_x = config.WINDOW_WIDTH // 2 - 200
@@ -163,40 +177,31 @@ class SettingsMenu:
         menu_w = 400
         menu_h = 500
         
-        glColor3f(0.2, 0.3, 0.4)
-        glBegin(GL_QUADS)
-        glVertex2f(menu_x, menu_y)
-        glVertex2f(menu_x + menu_w, menu_y)
-        glVertex2f(menu_x + menu_w, menu_y + menu_h)
-        glVertex2f(menu_x, menu_y + menu_h)
-        glEnd()
+        box = hud.static(("menu box", menu_x, menu_y),
+                         lambda: rect(menu_x, menu_y, menu_x + menu_w, menu_y + menu_h))
+        hud.shape(QUADS, box, (0.2, 0.3, 0.4))
         
         # Draw border
-        glColor3f(0.5, 0.7, 0.9)
-        glLineWidth(2.0)
-        glBegin(GL_LINE_LOOP)
-        glVertex2f(menu_x, menu_y)
-        glVertex2f(menu_x + menu_w, menu_y)
-        glVertex2f(menu_x + menu_w, menu_y + menu_h)
-        glVertex2f(menu_x, menu_y + menu_h)
-        glEnd()
+        border = hud.static(("menu border", menu_x, menu_y),
+                            lambda: outline(menu_x, menu_y, menu_x + menu_w, menu_y + menu_h))
+        hud.lines(border, (0.5, 0.7, 0.9), 2.0)
         
         # Draw title
-        self._draw_text(menu_x + 150, menu_y + 450, "GRAPHICS SETTINGS", 1.0, 1.0, 1.0)
+        self._draw_text(hud, menu_x + 150, menu_y + 450, "GRAPHICS SETTINGS", 1.0, 1.0, 1.0)
         
         # Draw presets section
         y_offset = 400
-        self._draw_text(menu_x + 20, menu_y + y_offset, "PRESETS (Press 1-4):", 0.8, 0.9, 1.0)
+        self._draw_text(hud, menu_x + 20, menu_y + y_offset, "PRESETS (Press 1-4):", 0.8, 0.9, 1.0)
         y_offset -= 30
         
         for i, preset in enumerate(self.presets):
             color = (0.9, 0.9, 0.9) if i == self.selected_option else (0.7, 0.7, 0.7)
             marker = "> " if i == self.selected_option else "  "
-            self._draw_text(menu_x + 30, menu_y + y_offset, f"{marker}{i+1}. {preset['name']}", *color)
+            self._draw_text(hud, menu_x + 30, menu_y + y_offset, f"{marker}{i+1}. {preset['name']}", *color)
             y_offset -= 25
         
         y_offset -= 10
-        self._draw_text(menu_x + 20, menu_y + y_offset, "ADJUSTABLE VARIABLES:", 0.8, 0.9, 1.0)
+        self._draw_text(hud, menu_x + 20, menu_y + y_offset, "ADJUSTABLE VARIABLES:", 0.8, 0.9, 1.0)
         y_offset -= 30
         
         # Draw adjustable variables
@@ -213,30 +218,35 @@ class SettingsMenu:
             else:
                 display_text = f"{marker}{display_name}: {current_value}"
             
-            self._draw_text(menu_x + 30, menu_y + y_offset, display_text, *color)
+            self._draw_text(hud, menu_x + 30, menu_y + y_offset, display_text, *color)
+            y_offset -= 25
+        
+        # Adaptive quality toggle, with its live readout beside the menu
+        if self.quality is not None:
+            aq_idx = self._auto_quality_index()
+            color = (0.9, 0.9, 0.9) if aq_idx == self.selected_option else (0.7, 0.7, 0.7)
+            marker = "> " if aq_idx == self.selected_option else "  "
+            state = "ON" if self.quality.enabled else "OFF"
+            self._draw_text(hud, menu_x + 30, menu_y + y_offset, f"{marker}Auto Quality: {state}", *color)
             y_offset -= 25
+            readout_y = menu_y + 450
+            for line in self.quality.lines():
+                self._draw_text(hud, menu_x + menu_w + 20, readout_y, line, 0.7, 0.9, 0.7)
+                readout_y -= 18
         
         # Draw close option
         y_offset -= 10
-        close_idx = len(self.presets) + len(self.adjustable_vars)
+        close_idx = self._close_index()
         color = (0.9, 0.3, 0.3) if close_idx == self.selected_option else (0.7, 0.3, 0.3)
         marker = "> " if close_idx == self.selected_option else "  "
-        self._draw_text(menu_x + 30, menu_y + y_offset, f"{marker}Close (ESC)", *color)
+        self._draw_text(hud, menu_x + 30, menu_y + y_offset, f"{marker}Close (ESC)", *color)
         
         # Draw instructions
         y_offset = 50
-        self._draw_text(menu_x + 20, menu_y + y_offset, "W/S: Navigate  Enter: Select", 0.6, 0.6, 0.6)
+        self._draw_text(hud, menu_x + 20, menu_y + y_offset, "W/S: Navigate  Enter: Select", 0.6, 0.6, 0.6)
         y_offset -= 20
-        self._draw_text(menu_x + 20, menu_y + y_offset, "1-4: Quick Preset  ESC: Close", 0.6, 0.6, 0.6)
-        
-        glPopMatrix()
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix()
-        glMatrixMode(GL_MODELVIEW)
+        self._draw_text(hud, menu_x + 20, menu_y + y_offset, "1-4: Quick Preset  ESC: Close", 0.6, 0.6, 0.6)
     
-    def _draw_text(self, x, y, text, r, g, b):
-        """Draw text using bitmap characters."""
-        glColor3f(r, g, b)
-        glRasterPos2f(x, y)
-        for char in text:
-            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(char))
+    def _draw_text(self, hud, x, y, text, r, g, b):
+        """Record text in bitmap characters."""
+        hud.text(x, y, text, (r, g, b), GLUT_BITMAP_HELVETICA_12)
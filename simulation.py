@@ -0,0 +1,182 @@
+import threading
+import time
+import config
+
+MOVE_KEYS = (b'w', b's', b'a', b'd', b'q', b'e')
+LOOK_KEYS = (b'i', b'j', b'k', b'l')
+
+
+class SimSnapshot:
+    """
+    State captured at the end of one tick: what rendering reads. Everything
+    is copied out of the simulation, and a snapshot is never changed after
+    it is published, so the render thread can read it without locking.
+    """
+
+    def __init__(self, tick, t, cam, world, oxygen, health):
+        self.tick = tick  # Simulation.ticks when captured
+        self.t = t
+        self.cam_pos = tuple(cam.pos)
+        self.yaw = cam.yaw
+        self.pitch = cam.pitch
+        self.fish = [school.snapshot() for school in world.fish_schools]
+        self.bubbles = world.bubbles.snapshot()
+        self.snow = world.marine_snow.snapshot()
+        self.oxygen = oxygen.level
+        self.health = health.level
+
+
+class Simulation:
+    """
+    Fixed-rate game simulation, separate from rendering.
+
+    Input handlers only record which keys are held; every tick of 1/SIM_HZ
+    seconds moves the diver, fish and particles and drains oxygen and health.
+    Each tick publishes (previous, latest, due time) as one tuple, replaced by
+    a single reference assignment, and frames show the state `alpha` of the
+    way from the previous tick to the latest, so motion stays smooth at any
+    display rate.
+
+    With USE_MULTITHREADING the ticks run on a `SimulationThread`; otherwise
+    `advance` runs the ticks that are due before each frame. `lock` only
+    serializes ticks against resets from the input thread; drawing never
+    takes it.
+    """
+
+    def __init__(self, world, cam, oxygen, health, start_time=None):
+        self.world = world
+        self.cam = cam
+        self.oxygen = oxygen
+        self.health = health
+        self.held = set()
+        self.ticks = 0
+        self.lock = threading.RLock()
+        self.thread = None
+        self.alpha = 1.0
+        self.reset(start_time)
+
+    def reset(self, start_time=None):
+        """Drop held keys and interpolation history (restart, teleports).
+        Simulated time restarts at start_time, or the wall clock."""
+        with self.lock:
+            self.held.clear()
+            self.oxygen.stop_depletion()
+            self.time = time.time() if start_time is None else start_time
+            self.accumulator = 0.0
+            self._last_real = None
+            snap = SimSnapshot(self.ticks, self.time, self.cam, self.world, self.oxygen, self.health)
+            self.published = (snap, snap, time.perf_counter())
+            self.shown = (snap, snap)
+
+    def start_thread(self):
+        if self.thread is None:
+            self.thread = SimulationThread(self)
+            self.thread.start()
+
+    def stop_thread(self):
+        if self.thread is not None:
+            self.thread.stop()
+            self.thread = None
+
+    def press(self, key):
+        if key in MOVE_KEYS or key in LOOK_KEYS:
+            self.held.add(key)
+
+    def release(self, key):
+        self.held.discard(key)
+
+    def advance(self, now=None):
+        """Run the ticks due by real time now (perf_counter seconds) unless a
+        worker thread runs them, then pick the frame state for now. Returns
+        the interpolation factor."""
+        now = time.perf_counter() if now is None else now
+        if self.thread is None:
+            step = 1.0 / config.SIM_HZ
+            if self._last_real is not None:
+                # Clamped so a pause does not turn into a burst of catch-up ticks
+                self.accumulator += min(now - self._last_real, config.MAX_FRAME_DT)
+            self._last_real = now
+            while self.accumulator >= step:
+                self.accumulator -= step
+                self.tick(step, now - self.accumulator)
+        return self.present(now)
+
+    def tick(self, dt, due=None):
+        """One simulation step of dt seconds; due is the real time the new
+        state belongs to, from which frames interpolate."""
+        with self.lock:
+            cam = self.cam
+            moving = any(key in self.held for key in MOVE_KEYS)
+            if not self.health.is_dead:
+                cam.look(self.held, dt)
+                if moving:
+                    cam.swim(self.held, self.world, dt)
+            if moving and not self.health.is_dead:
+                self.oxygen.start_depletion()
+            else:
+                self.oxygen.stop_depletion()
+            self.time += dt
+            self.world.tick(cam, self.time, dt)
+            if not self.health.is_dead:
+                self.oxygen.update(dt)
+                self.health.update(dt, self.oxygen.is_critical())
+                self.health.is_depleted()
+            self.ticks += 1
+            snap = SimSnapshot(self.ticks, self.time, cam, self.world, self.oxygen, self.health)
+            latest = self.published[1]
+            self.published = (latest, snap, time.perf_counter() if due is None else due)
+
+    def present(self, now):
+        """Render thread: take the latest published pair and fill the fish
+        draw arrays for time now."""
+        prev, curr, due = self.published
+        step = 1.0 / config.SIM_HZ
+        self.alpha = max(0.0, min(1.0, (now - due) / step))
+        self.shown = (prev, curr)
+        for school, p, c in zip(self.world.fish_schools, prev.fish, curr.fish):
+            school.blend(p, c, self.alpha)
+        return self.alpha
+
+    def view_pose(self):
+        """Diver position, yaw and pitch interpolated for the current frame."""
+        a = self.alpha
+        prev, curr = self.shown
+        pos = [p + (c - p) * a for p, c in zip(prev.cam_pos, curr.cam_pos)]
+        return pos, prev.yaw + (curr.yaw - prev.yaw) * a, prev.pitch + (curr.pitch - prev.pitch) * a
+
+    def render_time(self):
+        prev, curr = self.shown
+        return prev.t + (curr.t - prev.t) * self.alpha
+
+    def particles(self):
+        """Bubble and marine snow snapshots of the frame's latest tick."""
+        curr = self.shown[1]
+        return curr.bubbles, curr.snow
+
+
+class SimulationThread(threading.Thread):
+    """Worker that runs `Simulation.tick` at SIM_HZ until stopped."""
+
+    def __init__(self, sim):
+        super().__init__(name="simulation", daemon=True)
+        self.sim = sim
+        self._stop_event = threading.Event()
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            step = 1.0 / config.SIM_HZ
+            wait = next_tick - time.perf_counter()
+            if wait > 0:
+                self._stop_event.wait(wait)
+                continue
+            due = next_tick
+            next_tick += step
+            self.sim.tick(step, due)
+            # After a stall, skip the missed ticks rather than racing through them
+            if time.perf_counter() - next_tick > config.MAX_FRAME_DT:
+                next_tick = time.perf_counter()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
@@ -0,0 +1,204 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+import math
+import time
+import numpy as np
+import config
+
+CAVE_ECHO = -1  # block id reported for hits inside a carved cave pocket
+
+
+def raycast_voxels(grid, origins, dirs, max_dist):
+    """
+    Amanatides-Woo voxel traversal for many rays at once.
+
+    All live rays advance one voxel boundary per iteration. Rays that hit a
+    solid voxel, leave the grid, climb above the highest solid layer or pass
+    max_dist are retired; the working set is compacted once enough of them
+    have finished.
+
+    Args:
+        grid: (X, Y, Z) uint8 array of block ids, 0 for water
+        origins: (N, 3) ray origins
+        dirs: (N, 3) unit ray directions
+        max_dist: maximum travel distance
+
+    Returns:
+        dist: (N,) float32 distance to the hit, inf for misses
+        block: (N,) int32 block id of the hit, 0 for misses
+        prev: (N, 3) int32 water voxel the ray was in just before the hit
+    """
+    dirs = np.asarray(dirs, dtype=np.float64).reshape(-1, 3)
+    n = len(dirs)
+    flat = grid.reshape(-1)
+    shape = np.array(grid.shape, dtype=np.int64)
+    # The diver is clamped to the closed range [0, MAP_SIZE]; an origin on
+    # the far face would start outside the grid and miss everything
+    origins = np.clip(np.asarray(origins, dtype=np.float64).reshape(-1, 3), 0.0, shape - 1e-6)
+    strides = np.array([grid.shape[1] * grid.shape[2], grid.shape[2], 1], dtype=np.int64)
+    solid_layers = np.flatnonzero(grid.any(axis=(0, 2)))
+    top_layer = int(solid_layers[-1]) if len(solid_layers) else -1
+
+    dist = np.full(n, np.inf, dtype=np.float32)
+    block = np.zeros(n, dtype=np.int32)
+    prev = np.zeros((n, 3), dtype=np.int32)
+
+    voxel = np.floor(origins).astype(np.int64)
+    step = np.where(dirs >= 0.0, 1, -1).astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_delta = np.where(dirs != 0.0, 1.0 / np.abs(dirs), np.inf)
+        t_max = np.where(dirs != 0.0, (voxel + (step > 0) - origins) / dirs, np.inf)
+    t_max[t_max > max_dist] = np.inf
+    # Stepping along an axis moves the flat index by a fixed amount
+    flat_step = step * strides
+    t_now = np.zeros(n)
+    ids = np.arange(n)
+    live = np.all((voxel >= 0) & (voxel < shape), axis=1)
+    idx = np.where(live, voxel @ strides, 0)
+    last = voxel.copy()
+
+    max_steps = int(math.ceil(max_dist * math.sqrt(3.0))) + 3
+    for _ in range(max_steps):
+        hit_id = flat[idx]
+        hit = live & (hit_id != 0)
+        if hit.any():
+            h = ids[hit]
+            dist[h] = t_now[hit]
+            block[h] = hit_id[hit]
+            prev[h] = last[hit]
+            live &= ~hit
+        # Retire rays that rose above every solid voxel and keep rising
+        live &= (voxel[:, 1] <= top_layer) | (step[:, 1] < 0)
+        count = int(np.count_nonzero(live))
+        if count == 0:
+            break
+        if count < len(ids) * 0.75:
+            ids, voxel, t_max, t_delta, step, flat_step, t_now, idx, last = (
+                a[live] for a in (ids, voxel, t_max, t_delta, step, flat_step, t_now, idx, last))
+            live = np.ones(count, dtype=bool)
+        rows = np.arange(len(ids))
+        axis = np.argmin(t_max, axis=1)
+        t_now = t_max[rows, axis]
+        live &= t_now <= max_dist
+        last[:] = voxel
+        voxel[rows, axis] += step[rows, axis]
+        idx += flat_step[rows, axis]
+        t_max[rows, axis] += t_delta[rows, axis]
+        moved = voxel[rows, axis]
+        live &= (moved >= 0) & (moved < shape[axis])
+        idx[~live] = 0
+    return dist, block, prev
+
+
+class Sonar:
+    """
+    Diver sonar: casts a fan of rays from the camera through the voxel world
+    and shows the echoes as a sweep display next to the minimap.
+    """
+
+    def __init__(self):
+        self.dist = None
+        self.block = None
+        self.yaw = 0.0
+        self.scan_ms = 0.0
+
+    def fan_directions(self, yaw, pitch):
+        rays = config.SONAR_RAYS
+        rows = config.SONAR_ROWS
+        half = math.radians(config.SONAR_FOV) * 0.5
+        yaws = math.radians(yaw) + np.linspace(-half, half, rays)
+        pitches = math.radians(pitch) + np.linspace(-math.radians(config.SONAR_TILT), 0.0, rows)
+        py, pp = np.meshgrid(yaws, pitches)
+        cp = np.cos(pp)
+        return np.stack([np.cos(py) * cp, np.sin(pp), np.sin(py) * cp], axis=-1).reshape(-1, 3)
+
+    def scan(self, world, pos, yaw, pitch=0.0):
+        """Cast the fan and keep the nearest echo per bearing."""
+        start = time.perf_counter()
+        dirs = self.fan_directions(yaw, pitch)
+        origins = np.broadcast_to(np.asarray(pos, dtype=np.float64), dirs.shape)
+        dist, block, prev = raycast_voxels(world.voxel_grid, origins, dirs, config.SONAR_RANGE)
+        # Echoes from under an overhang come back from inside a cave
+        px = np.clip(prev[:, 0], 0, config.MAP_SIZE - 1)
+        pz = np.clip(prev[:, 2], 0, config.MAP_SIZE - 1)
+        in_cave = (block != 0) & (prev[:, 1] + 1 < world.top_grid[px, pz])
+        block = np.where(in_cave, CAVE_ECHO, block)
+        rows = config.SONAR_ROWS
+        dist = dist.reshape(rows, -1)
+        block = block.reshape(rows, -1)
+        nearest = np.argmin(dist, axis=0)
+        cols = np.arange(dist.shape[1])
+        self.dist = dist[nearest, cols]
+        self.block = block[nearest, cols]
+        self.yaw = yaw
+        self.scan_ms = (time.perf_counter() - start) * 1000.0
+
+    def _echo_color(self, block_id):
+        if block_id == CAVE_ECHO:
+            return (0.9, 0.2, 0.9)
+        if block_id in (12, 13, 14, 15):
+            return (1.0, 0.55, 0.2)
+        if block_id == 11:
+            return (0.7, 0.7, 0.75)
+        return (0.2, 0.9, 0.4)
+
+    def draw(self, window_width, window_height):
+        """Draw the sweep display to the left of the minimap."""
+        if self.dist is None:
+            return
+        size = config.MINIMAP_VIEW_SIZE * config.MINIMAP_CELL
+        margin = config.MINIMAP_MARGIN
+        radius = size * 0.5
+        cx = window_width - size - margin * 2 - radius
+        cy = window_height - margin - size + radius * 0.25
+        half = math.radians(config.SONAR_FOV) * 0.5
+
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluOrtho2D(0, window_width, 0, window_height)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        # Fan background, pointing up the screen
+        segments = 24
+        glColor3f(0.02, 0.12, 0.08)
+        glBegin(GL_TRIANGLES)
+        for i in range(segments):
+            a0 = math.pi * 0.5 - half + (2 * half) * i / segments
+            a1 = math.pi * 0.5 - half + (2 * half) * (i + 1) / segments
+            glVertex2f(cx, cy)
+            glVertex2f(cx + math.cos(a0) * radius, cy + math.sin(a0) * radius)
+            glVertex2f(cx + math.cos(a1) * radius, cy + math.sin(a1) * radius)
+        glEnd()
+
+        # Sweep line bouncing across the fan
+        sweep = math.sin(time.time() * 2.0) * half
+        glColor3f(0.3, 1.0, 0.5)
+        glBegin(GL_LINES)
+        glVertex2f(cx, cy)
+        glVertex2f(cx + math.cos(math.pi * 0.5 - sweep) * radius,
+                   cy + math.sin(math.pi * 0.5 - sweep) * radius)
+        glEnd()
+
+        # Echoes
+        n = len(self.dist)
+        angles = math.pi * 0.5 - np.linspace(-half, half, n)
+        hit = np.isfinite(self.dist)
+        r = np.where(hit, self.dist, 0.0) / config.SONAR_RANGE * radius
+        xs = cx + np.cos(angles) * r
+        ys = cy + np.sin(angles) * r
+        glPointSize(3.0)
+        glBegin(GL_POINTS)
+        for i in np.flatnonzero(hit).tolist():
+            glColor3f(*self._echo_color(int(self.block[i])))
+            glVertex2f(float(xs[i]), float(ys[i]))
+        glEnd()
+        glPointSize(1.0)
+
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
@@ -0,0 +1,31 @@
+import math
+
+
+class SpatialHash:
+    """Uniform grid over the XZ plane mapping each cell to the items whose
+    footprint overlaps it, so point queries only touch one bucket."""
+
+    def __init__(self, cell_size=2.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+
+    def _cell(self, x, z):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(z / self.cell_size)))
+
+    def insert(self, item, x0, z0, x1, z1):
+        """Register item in every cell overlapped by the rectangle [x0, x1] x [z0, z1]."""
+        cx0, cz0 = self._cell(x0, z0)
+        cx1, cz1 = self._cell(x1, z1)
+        for cx in range(cx0, cx1 + 1):
+            for cz in range(cz0, cz1 + 1):
+                self.cells.setdefault((cx, cz), []).append(item)
+
+    def query_point(self, x, z):
+        """Return the items whose footprint may contain (x, z)."""
+        return self.cells.get(self._cell(x, z), ())
+
+    def clear(self):
+        self.cells.clear()
+
+    def __len__(self):
+        return len(self.cells)
@@ -0,0 +1,147 @@
+import numpy as np
+import config
+
+
+class TerrainChunk:
+    """
+    Square column of the map (CHUNK_SIZE x CHUNK_SIZE blocks) holding its
+    blocks, coral rods and seaweed, with block colours lit once up front
+    and downsampled column boxes for distant LOD levels.
+    """
+
+    def __init__(self, cx, cz, size):
+        self.cx = cx
+        self.cz = cz
+        self.x0 = cx * size
+        self.z0 = cz * size
+        self.x1 = self.x0 + size
+        self.z1 = self.z0 + size
+        self.keys = []
+        self.coral_rects = []
+        self.seaweeds = []
+        self.xyz = np.zeros((0, 3), dtype=np.int32)
+        self.base_color = np.zeros((0, 3), dtype=np.float32)
+        self.lod = 0  # current terrain LOD level, kept between refreshes for hysteresis
+        self.top_height = 0.0
+        self._lod_boxes = {}
+
+    def rebuild(self, world):
+        """Recompute block arrays and static lighting from the world's blocks."""
+        n = len(self.keys)
+        self.xyz = np.array(self.keys, dtype=np.int32).reshape(n, 3)
+        base = np.zeros((n, 3), dtype=np.float32)
+        for i, (x, y, z) in enumerate(self.keys):
+            color, _ = config.BLOCK_TYPES[world.blocks[(x, y, z)]]
+            lx = world._lighting_factor(x, y, z)
+            if config.PHONG_ON and y == world.height_map.get((x, z), y):
+                lx *= world._phong_factor(x, y, z, None)
+            base[i] = (color[0] * lx, color[1] * lx, color[2] * lx)
+        self.base_color = base
+        self._lod_boxes = {}
+        self._measure_heights(world)
+
+    def _measure_heights(self, world):
+        """top_height: highest point of anything drawn from the chunk, used by
+        occlusion culling when testing whether the chunk is hidden."""
+        top = float(self.xyz[:, 1].max() + 1) if len(self.xyz) else 0.0
+        for cx, cy, cz, w, h, col in self.coral_rects:
+            top = max(top, cy + h)
+        for sw in self.seaweeds:
+            top = max(top, sw.base_y + sw.seg_len * 2.0 + 0.5)
+        self.top_height = top
+
+    def lod_boxes(self, level):
+        """
+        Downsampled columns for LOD level 1 (2x2 merge) or 2 (4x4 merge):
+        (centers, sizes, colors) arrays with one box per merged cell, reaching
+        from the seabed floor to the tallest column and tinted with the mean
+        colour of the column tops.
+        """
+        boxes = self._lod_boxes.get(level)
+        if boxes is None:
+            boxes = self._lod_boxes[level] = self._merge_columns(2 ** level)
+        return boxes
+
+    def _merge_columns(self, f):
+        empty = (np.zeros((0, 3), dtype=np.float32),) * 3
+        if not len(self.xyz):
+            return empty
+        size = self.x1 - self.x0
+        lx = self.xyz[:, 0] - self.x0
+        lz = self.xyz[:, 2] - self.z0
+        col = lx * size + lz
+        # Topmost block of each column: last after sorting by column then y
+        order = np.lexsort((self.xyz[:, 1], col))
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = col[order][1:] != col[order][:-1]
+        top = order[last]
+        cell = (lx[top] // f) * (size // f) + lz[top] // f
+        n_cells = (size // f) ** 2
+        count = np.bincount(cell, minlength=n_cells)
+        height = np.zeros(n_cells, dtype=np.float32)
+        np.maximum.at(height, cell, self.xyz[top, 1] + 1.0)
+        color = np.zeros((n_cells, 3), dtype=np.float32)
+        for c in range(3):
+            color[:, c] = np.bincount(cell, weights=self.base_color[top, c], minlength=n_cells)
+        used = np.flatnonzero(count)
+        color = np.clip(color[used] / count[used, None], 0.0, 1.0)
+        h = height[used]
+        centers = np.stack([self.x0 + (used // (size // f)) * f + f * 0.5,
+                            h * 0.5,
+                            self.z0 + (used % (size // f)) * f + f * 0.5], axis=1).astype(np.float32)
+        sizes = np.stack([np.full(len(used), f, dtype=np.float32), h,
+                          np.full(len(used), f, dtype=np.float32)], axis=1)
+        return centers, sizes, color
+
+    def pick_lod(self, dist):
+        """Update and return the LOD level for a chunk centre dist away, with
+        TERRAIN_LOD_HYSTERESIS around each threshold so chunks do not flicker."""
+        if not config.TERRAIN_LOD_ON:
+            self.lod = 0
+            return 0
+        h = config.TERRAIN_LOD_HYSTERESIS
+        thresholds = (config.TERRAIN_LOD_NEAR, config.TERRAIN_LOD_FAR)
+        level = self.lod
+        while level < 2 and dist > thresholds[level] + h:
+            level += 1
+        while level > 0 and dist < thresholds[level - 1] - h:
+            level -= 1
+        self.lod = level
+        return level
+
+    def center_distance(self, px, pz):
+        cx = (self.x0 + self.x1) * 0.5
+        cz = (self.z0 + self.z1) * 0.5
+        return ((cx - px) ** 2 + (cz - pz) ** 2) ** 0.5
+
+    def distance_range(self, px, pz):
+        """Nearest and farthest XZ distance from (px, pz) to this chunk's footprint."""
+        nx = min(max(px, self.x0), self.x1)
+        nz = min(max(pz, self.z0), self.z1)
+        near = ((nx - px) ** 2 + (nz - pz) ** 2) ** 0.5
+        fx = self.x0 if abs(px - self.x0) > abs(px - self.x1) else self.x1
+        fz = self.z0 if abs(pz - self.z0) > abs(pz - self.z1) else self.z1
+        far = ((fx - px) ** 2 + (fz - pz) ** 2) ** 0.5
+        return near, far
+
+
+def build_chunks(world, size):
+    """Bucket world blocks, coral rods and seaweed into TerrainChunks keyed by (cx, cz)."""
+    chunks = {}
+
+    def chunk_at(x, z):
+        key = (int(x) // size, int(z) // size)
+        chunk = chunks.get(key)
+        if chunk is None:
+            chunk = chunks[key] = TerrainChunk(key[0], key[1], size)
+        return chunk
+
+    for key in world.blocks:
+        chunk_at(key[0], key[2]).keys.append(key)
+    for rect in world.coral_rects:
+        chunk_at(rect[0], rect[2]).coral_rects.append(rect)
+    for sw in world.seaweeds:
+        chunk_at(sw.x, sw.z).seaweeds.append(sw)
+    for chunk in chunks.values():
+        chunk.rebuild(world)
+    return chunks
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from headless import NullGL, seed_all
+
+# Installed once, before any test imports a module that draws
+_GL = NullGL()
+_GL.install()
+
+
+@pytest.fixture
+def gl():
+    """The null GL backend, with its call counts cleared."""
+    _GL.reset()
+    return _GL
+
+
+@pytest.fixture
+def world(gl):
+    """A generated world with the diver at the spawn point, seeded."""
+    from camera import Camera
+    from health_system import HealthSystem
+    from map_manager import MapManager
+    from oxygen_system import OxygenSystem
+
+    seed_all(1)
+    world = MapManager()
+    cam = Camera()
+    cam.pos = world.get_spawn_position()
+    return world, cam, OxygenSystem(), HealthSystem()
@@ -0,0 +1,53 @@
+import numpy as np
+
+import config
+from batching import cube_quads
+from headless import run
+
+MATRIX_OPS = ("glPushMatrix", "glPopMatrix", "glTranslatef", "glRotatef", "glScalef")
+
+
+def test_cube_quads_back_to_front():
+    rng = np.random.default_rng(1)
+    centers = rng.uniform(0, 20, (50, 3))
+    colors = rng.uniform(0, 1, (50, 3))
+    eye = np.array([10.0, 25.0, -5.0])
+    verts, rgb = cube_quads(centers, colors, eye=eye)
+    assert len(verts) == len(rgb) and len(verts) % 4 == 0
+    # No depth test: every face must be drawn before any nearer one
+    mid = verts.reshape(-1, 4, 3).mean(axis=1)
+    dist = np.linalg.norm(mid - eye, axis=1)
+    assert np.all(np.diff(dist) <= 1e-4)
+    # Only faces turned towards the eye are kept
+    normals = np.cross(verts[1::4] - verts[0::4], verts[2::4] - verts[1::4])
+    assert np.all(((eye - mid) * normals).sum(axis=1) > 0)
+
+
+def test_cube_quads_without_eye_keeps_box_order():
+    centers = np.array([(0.0, 0.0, 0.0), (5.0, 0.0, 0.0)])
+    colors = np.array([(1.0, 0.0, 0.0), (0.0, 0.0, 1.0)])
+    verts, rgb = cube_quads(centers, colors)
+    assert len(verts) == 2 * 6 * 4
+    assert np.allclose(rgb[:24], (1.0, 0.0, 0.0)) and np.allclose(rgb[24:], (0.0, 0.0, 1.0))
+    assert np.allclose(verts[:24].mean(axis=0), centers[0])
+
+
+def _frame_counts(gl, monkeypatch, batched, frames=10):
+    monkeypatch.setattr(config, "USE_BATCHED_GEOMETRY", batched)
+    result = run(frames, 1, b"wj", render=True, gl=gl)
+    counts = result["gl_counts"]
+    return {
+        "calls": result["gl_calls"] / frames,
+        "matrix": sum(counts.get(name, 0) for name in MATRIX_OPS) / frames,
+        "cubes": counts.get("glutSolidCube", 0) / frames,
+    }
+
+
+def test_batched_geometry_cuts_gl_calls(gl, monkeypatch):
+    per_cube = _frame_counts(gl, monkeypatch, False)
+    batched = _frame_counts(gl, monkeypatch, True)
+    # Terrain and coral go out as quads in one glBegin/glEnd: fewer GL calls
+    # per frame, and most cubes with their matrix ops are gone
+    assert batched["calls"] < per_cube["calls"]
+    assert batched["matrix"] < 0.5 * per_cube["matrix"]
+    assert batched["cubes"] < 0.5 * per_cube["cubes"]
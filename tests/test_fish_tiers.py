@@ -0,0 +1,21 @@
+import numpy as np
+
+from fish_tiers import FULL, SHOAL
+
+
+def test_queued_far_fish_job_skips_demoted_fish(world):
+    world, cam, _, _ = world
+    world.tick(cam, 1.0, 1.0 / 30)
+    school = world.fish_schools[0]
+    jobs = world._far_fish_jobs()
+    assert jobs
+    # Demote every fish after the jobs were queued, as FishTiers.update can
+    # while jobs wait for budget
+    idx = np.flatnonzero(school.tier == FULL)
+    school.set_tier(idx, SHOAL, 1.0)
+    pos, drift, stepped = school.pos.copy(), school.drift.copy(), school.stepped.copy()
+    for job in jobs:
+        job(2.0, 1.0)
+    assert np.array_equal(school.pos, pos)
+    assert np.array_equal(school.drift, drift)
+    assert np.array_equal(school.stepped, stepped)
@@ -0,0 +1,81 @@
+import time
+
+import numpy as np
+import pytest
+
+import config
+from simulation import Simulation
+
+
+def _state(snap):
+    """Copy of everything a frame reads from a snapshot."""
+    return {
+        "tick": snap.tick,
+        "t": snap.t,
+        "cam": (snap.cam_pos, snap.yaw, snap.pitch),
+        "fish": [(pos.copy(), angle.copy()) for pos, angle in snap.fish],
+        "vitals": (snap.oxygen, snap.health),
+    }
+
+
+def _same(a, b):
+    if a.keys() != b.keys():
+        return False
+    for key in a:
+        if key == "fish":
+            if len(a[key]) != len(b[key]):
+                return False
+            for (pa, aa), (pb, ab) in zip(a[key], b[key]):
+                if not (np.array_equal(pa, pb) and np.array_equal(aa, ab)):
+                    return False
+        elif a[key] != b[key]:
+            return False
+    return True
+
+
+@pytest.fixture
+def sim(world):
+    world, cam, oxygen, health = world
+    sim = Simulation(world, cam, oxygen, health, start_time=0.0)
+    # Swim and turn so the diver, oxygen and fish all change every tick
+    sim.press(b"w")
+    sim.press(b"j")
+    yield sim
+    sim.stop_thread()
+
+
+def test_thread_snapshots_are_consistent(sim):
+    sim.start_thread()
+    start = time.perf_counter()
+    seen = {}  # id -> (snapshot, state when first seen); keeps snapshots alive
+    last_tick = -1
+    while time.perf_counter() - start < 1.0:
+        sim.present(time.perf_counter())
+        prev, latest = sim.shown
+        for snap in (prev, latest):
+            if id(snap) not in seen:
+                seen[id(snap)] = (snap, _state(snap))
+
+        # Ticks are published in order, one at a time
+        assert latest.tick >= last_tick
+        if latest is not prev:
+            assert latest.tick == prev.tick + 1
+            assert latest.t > prev.t
+        last_tick = latest.tick
+
+        # The frame's time lies between the two ticks it interpolates
+        assert prev.t <= sim.render_time() <= latest.t
+        time.sleep(0.002)
+
+    sim.stop_thread()
+    # Fixed rate: no more ticks than SIM_HZ allows, and the thread kept up
+    elapsed = time.perf_counter() - start
+    assert 5 <= sim.ticks <= elapsed * config.SIM_HZ + 1
+    ticks = sorted(state["tick"] for _, state in seen.values())
+    assert len(ticks) > 2
+    assert ticks == sorted(set(ticks))
+
+    # Nothing a frame reads changed after the snapshot was published
+    for snap, state in seen.values():
+        assert _same(_state(snap), state)
+
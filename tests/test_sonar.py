@@ -0,0 +1,14 @@
+import numpy as np
+
+from sonar import raycast_voxels
+
+
+def test_rays_from_the_far_map_edge_hit():
+    # The diver can stand at exactly x == MAP_SIZE or z == MAP_SIZE
+    grid = np.zeros((16, 8, 16), dtype=np.uint8)
+    grid[:, :2, :] = 1
+    dirs = np.array([(0.0, -1.0, 0.0), (-0.6, -0.8, 0.0), (0.0, -0.8, -0.6)])
+    for origin in ((16.0, 5.0, 8.0), (8.0, 5.0, 16.0), (16.0, 5.0, 16.0)):
+        dist, block, _ = raycast_voxels(grid, np.tile(origin, (3, 1)), dirs, 20.0)
+        assert np.all(np.isfinite(dist))
+        assert np.all(block == 1)
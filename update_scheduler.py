@@ -0,0 +1,86 @@
+import time
+from collections import deque
+import config
+
+
+class UpdateGroup:
+    """
+    One kind of entity update. When the group comes due, `make_jobs()`
+    returns the callables that make up its work; each is called as
+    job(t, dt) with dt the time since the group last finished.
+    """
+
+    def __init__(self, name, priority, every, make_jobs):
+        self.name = name
+        self.priority = priority
+        self.every = every  # ticks between runs, or a callable returning it
+        self.make_jobs = make_jobs
+        self.jobs = deque()
+        self.active = False  # jobs were queued and not all have run
+        self.queued_tick = 0
+        self.due_tick = 0
+        self.last_t = None
+        self.runs = 0
+
+    def interval(self):
+        every = self.every() if callable(self.every) else self.every
+        return max(1, int(every))
+
+
+class UpdateScheduler:
+    """
+    Runs entity update groups under a per-tick time budget.
+
+    Groups run in priority order (0 first). A group becomes due every
+    `every` ticks and queues its jobs; jobs run until ENTITY_UPDATE_BUDGET_MS
+    is spent, and whatever is left stays queued for the next tick. Priority
+    0 groups are never deferred, and the longest-waiting other group gets at
+    least one job every tick so a backlog always drains. A group does not
+    queue new work while old work is still waiting, so a spike delays
+    updates instead of piling them up.
+    """
+
+    def __init__(self):
+        self.groups = []
+        self.ticks = 0
+        self.deferred = 0  # jobs left over after the last tick
+        self.last_ms = 0.0
+
+    def add(self, name, priority, every, make_jobs):
+        group = UpdateGroup(name, priority, every, make_jobs)
+        self.groups.append(group)
+        self.groups.sort(key=lambda g: g.priority)
+        return group
+
+    def run(self, t, dt):
+        """One tick at time t; dt is the tick length, used for a group's first run."""
+        self.ticks += 1
+        for group in self.groups:
+            if not group.active and self.ticks >= group.due_tick:
+                group.jobs.extend(group.make_jobs())
+                group.active = True
+                group.queued_tick = self.ticks
+                group.due_tick = self.ticks + group.interval()
+        start = time.perf_counter()
+        budget = config.ENTITY_UPDATE_BUDGET_MS / 1000.0
+        # The longest-waiting deferrable group always gets one job, so no
+        # group starves behind higher priorities when the budget is tight
+        waiting = [g for g in self.groups if g.active and g.priority > 0]
+        if waiting:
+            self._run_job(min(waiting, key=lambda g: g.queued_tick), t, dt)
+        for group in self.groups:
+            while group.active:
+                if group.priority > 0 and time.perf_counter() - start >= budget:
+                    break
+                self._run_job(group, t, dt)
+        self.last_ms = (time.perf_counter() - start) * 1000.0
+        self.deferred = sum(len(g.jobs) for g in self.groups)
+
+    def _run_job(self, group, t, dt):
+        step = dt if group.last_t is None else min(t - group.last_t, config.MAX_FRAME_DT)
+        if group.jobs:
+            group.jobs.popleft()(t, step)
+        if not group.jobs:
+            group.active = False
+            group.last_t = t
+            group.runs += 1
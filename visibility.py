@@ -0,0 +1,122 @@
+import math
+import config
+from camera import look_at
+
+
+class Viewpoint:
+    """Eye position and orientation of one rendered view."""
+
+    def __init__(self, pos, yaw, pitch):
+        self.pos = list(pos)
+        self.yaw = yaw
+        self.pitch = pitch
+
+    @staticmethod
+    def from_camera(cam):
+        return Viewpoint(cam.pos, cam.yaw, cam.pitch)
+
+    def apply(self):
+        look_at(self.pos, self.yaw, self.pitch)
+
+    def distance_xz(self, other):
+        return math.hypot(self.pos[0] - other.pos[0], self.pos[2] - other.pos[2])
+
+
+class VisibleSet:
+    """
+    Result of one visibility pass: everything in range of any active
+    viewpoint, with block colours already lit and seaweed LOD chosen.
+    Every view rendered this frame draws from the same set.
+    """
+
+    def __init__(self, viewpoints, t):
+        self.viewpoints = list(viewpoints)
+        self.time = t
+        self.block_xyz = None  # (N, 3) int block coordinates
+        self.block_rgb = None  # (N, 3) lit colours, caustics applied
+        self.block_faces = None  # (N, 6) faces not covered by a neighbouring block
+        self.lod_boxes = None  # (centers, sizes, colors) merged far terrain columns
+        self.coral_rects = []  # (cx, cy, cz, w, h, color)
+        self.seaweeds = []  # (seaweed, lod, fog) drawn with stalks and leaves
+        self.far_weeds = []  # seaweed drawn as crossed billboards
+        self.far_weed_fog = []  # fog weight per far weed
+        self.fish = []  # (school, indices) drawn as full models
+        self.far_fish = []  # (school, index array) drawn as points
+        self.occluded_fish = 0
+        self.bubbles = None  # particle snapshots from the simulation;
+        self.snow = None  # None draws the live pools
+
+    def counts(self):
+        return {
+            "blocks": 0 if self.block_xyz is None else len(self.block_xyz),
+            "lod_boxes": 0 if self.lod_boxes is None else len(self.lod_boxes[0]),
+            "coral_rects": len(self.coral_rects),
+            "seaweeds": len(self.seaweeds) + len(self.far_weeds),
+            "fish": sum(len(idx) for _, idx in self.fish) + sum(len(idx) for _, idx in self.far_fish),
+        }
+
+
+def _angle_delta(a, b):
+    d = (a - b) % 360.0
+    return min(d, 360.0 - d)
+
+
+class VisibilityCache:
+    """
+    Culling result carried across frames. It stays valid while every view
+    keeps within move_limit (VIS_MOVE_THRESHOLD, or less while occlusion
+    hides something) and VIS_ANGLE_THRESHOLD of where it was at the last
+    refresh; on refresh, chunks whose classification did not change
+    keep their previous entry.
+    """
+
+    def __init__(self):
+        self.anchor = None  # [(x, y, z, yaw, pitch)] of each view at the last refresh
+        self.signature = None  # settings the cached set was built with
+        self.move_limit = 0.0  # distance a view may move before the set goes stale
+        self.entries = {}  # chunk key -> (state, block_idx, lod_boxes, coral_rects, seaweeds, far_weeds)
+        self.refreshes = 0
+        self.chunks_rebuilt = 0
+        # Concatenated terrain for the whole cached set
+        self.xyz = None
+        self.base = None  # unclamped lit colours
+        self.lit = None  # clamped lit colours, caustics not applied
+        self.caustic_idx = None
+        self.faces = None  # (N, 6) exposed faces of xyz, for batched geometry
+        self.lod_boxes = None
+        # Occlusion: per-chunk height below which everything is hidden (-inf if visible)
+        self.hidden_ceiling = None
+        self.occluded_chunks = 0
+        self.occluded_blocks = 0
+        self.coral_rects = []
+        self.seaweeds = []
+        self.far_weeds = []
+        self.far_weed_fog = []
+        self.fog = None  # per-block fog weight toward BG_COLOR
+
+    def is_valid(self, viewpoints, signature):
+        if self.anchor is None or signature != self.signature or len(viewpoints) != len(self.anchor):
+            return False
+        move = self.move_limit
+        turn = config.VIS_ANGLE_THRESHOLD
+        for view, (x, y, z, yaw, pitch) in zip(viewpoints, self.anchor):
+            p = view.pos
+            if (p[0] - x) ** 2 + (p[1] - y) ** 2 + (p[2] - z) ** 2 > move * move:
+                return False
+            if _angle_delta(view.yaw, yaw) > turn or abs(view.pitch - pitch) > turn:
+                return False
+        return True
+
+    def mark(self, viewpoints, signature, move_limit=None):
+        self.move_limit = config.VIS_MOVE_THRESHOLD if move_limit is None else move_limit
+        self.anchor = [(v.pos[0], v.pos[1], v.pos[2], v.yaw, v.pitch) for v in viewpoints]
+        self.signature = signature
+        self.refreshes += 1
+
+    def invalidate(self, chunk_key=None):
+        """Force a refresh; with chunk_key, also drop that chunk's entry."""
+        self.anchor = None
+        if chunk_key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(chunk_key, None)
@@ -0,0 +1,52 @@
+import math
+import numpy as np
+import config
+
+
+def view_distance():
+    """How far geometry is drawn: DRAW_RADIUS, cut to where the fog reaches
+    BG_COLOR when fog is on."""
+    if config.FOG_ON:
+        return min(config.DRAW_RADIUS, config.FOG_END)
+    return config.DRAW_RADIUS
+
+
+def far_plane():
+    """Projection far plane covering everything within view_distance, from
+    the seabed to MAX_HEIGHT."""
+    return math.hypot(view_distance(), config.MAX_HEIGHT) + 1.0
+
+
+def fog_factors(dist):
+    """Blend weights toward BG_COLOR for an array of eye distances, rounded to
+    FOG_STEPS levels so fogged colours can be shared."""
+    dist = np.asarray(dist, dtype=np.float32)
+    if not config.FOG_ON:
+        return np.zeros(dist.shape, dtype=np.float32)
+    span = max(1e-6, config.FOG_END - config.FOG_START)
+    f = np.clip((dist - config.FOG_START) / span, 0.0, 1.0)
+    return np.round(f * config.FOG_STEPS) / config.FOG_STEPS
+
+
+def apply_fog(colors, f):
+    """Blend an (N, 3) colour array toward BG_COLOR by per-row weights f."""
+    f = f[:, None]
+    return colors * (1.0 - f) + np.asarray(config.BG_COLOR, dtype=np.float32) * f
+
+
+_fogged = {}
+
+
+def fog_color(color, f):
+    """Single colour blended toward BG_COLOR; results for quantized f are cached."""
+    if f <= 0.0:
+        return color
+    key = (tuple(color), f)
+    out = _fogged.get(key)
+    if out is None:
+        bg = config.BG_COLOR
+        out = tuple(c * (1.0 - f) + b * f for c, b in zip(color, bg))
+        if len(_fogged) > 4096:
+            _fogged.clear()
+        _fogged[key] = out
+    return out